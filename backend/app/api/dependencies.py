@@ -0,0 +1,49 @@
+from fastapi import Depends, Request
+
+from ..services.github_service import GitHubService
+from ..services.github_graphql_service import GitHubGraphQLService
+from ..services.analyzer_service import AnalyzerService
+from ..services.portfolio_service import PortfolioService
+from ..services.job_service import JobManager
+from ..config import Config
+
+def get_github_service(request: Request) -> GitHubService:
+    """Provide the configured GitHub backend bound to the shared client pool"""
+    state = request.app.state
+    service_class = GitHubGraphQLService if Config.GITHUB_BACKEND == "graphql" else GitHubService
+    return service_class(
+        client=state.github_client,
+        cache=state.response_cache,
+        scheduler=state.rate_limiter,
+        token_pool=state.token_pool,
+        resilience=state.resilience
+    )
+
+def get_analyzer_service(
+    request: Request,
+    github_service: GitHubService = Depends(get_github_service)
+) -> AnalyzerService:
+    """Provide an AnalyzerService sharing the request's GitHubService"""
+    return AnalyzerService(
+        github_service,
+        planner=request.app.state.fetch_planner,
+        cache=request.app.state.repo_analysis_cache
+    )
+
+def get_job_manager(request: Request) -> JobManager:
+    """Provide the app's background analysis job pool"""
+    return request.app.state.job_manager
+
+def get_portfolio_service(
+    request: Request,
+    github_service: GitHubService = Depends(get_github_service),
+    analyzer: AnalyzerService = Depends(get_analyzer_service)
+) -> PortfolioService:
+    """Provide the analysis pipeline over the request's services"""
+    return PortfolioService(
+        github_service,
+        analyzer,
+        cache=request.app.state.profile_cache,
+        flights=request.app.state.analysis_flights,
+        admission=request.app.state.admission
+    )
@@ -1,86 +1,290 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import Dict, Any
-import asyncio
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response, StreamingResponse
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple, Union
+from pydantic import ValidationError
+import json
+import logging
+import re
 
 from ..services.github_service import GitHubService
-from ..services.analyzer_service import AnalyzerService
-from ..services.score_calculator import ScoreCalculator
-from ..services.recruiter_simulator import RecruiterSimulator
-from ..services.roadmap_generator import RoadmapGenerator
-from ..models.user_profile import UserProfile
-from ..utils.helpers import validate_github_username
+from ..services.portfolio_service import PortfolioService
+from ..services.job_service import JobManager
+from ..services.batch_service import BatchAnalysis
+from ..services.exceptions import (
+    CircuitOpen, DeadlineExceeded, GitHubAPIError, RateLimitExceeded, JobQueueFull, ServerOverloaded,
+    client_error
+)
+from ..models.job import AnalysisJobRequest
+from ..models.batch import BatchAnalysisRequest
+from ..utils.helpers import validate_github_username, normalize_usernames
+from ..utils.deadline import Deadline
+from ..utils.disconnect import ClientDisconnected, cancel_on_disconnect
 from ..config import Config
+from .dependencies import get_github_service, get_portfolio_service, get_job_manager
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Failures a client should retry later rather than treat as final
+RETRYABLE_ERRORS = (RateLimitExceeded, ServerOverloaded, CircuitOpen)
+
+def _rate_limit_error(
+    error: Union[RateLimitExceeded, JobQueueFull, ServerOverloaded, CircuitOpen]
+) -> HTTPException:
+    """Translate an exhausted GitHub budget, a full queue, shed load or a degraded GitHub into a retryable 503"""
+    return HTTPException(
+        status_code=503,
+        detail=str(error),
+        headers={"Retry-After": str(max(int(error.retry_after), 1))}
+    )
+
+def _github_error(error: GitHubAPIError) -> HTTPException:
+    """Translate a GitHub failure, passing an unknown user through as 404"""
+    status_code, detail = client_error(error)
+    if status_code != 503:
+        return HTTPException(status_code=status_code, detail=detail)
+    
+    logger.error("GitHub rejected the service's credentials: %s", error)
+    # Rejected tokens are probed again after the reprobe interval
+    return HTTPException(
+        status_code=503,
+        detail=detail,
+        headers={"Retry-After": str(max(int(Config.GITHUB_TOKEN_REPROBE_INTERVAL), 1))}
+    )
 
 @router.get("/analyze/{username}")
-async def analyze_github_profile(username: str):
+async def analyze_github_profile(
+    request: Request,
+    username: str,
+    max_age: Optional[int] = Query(None, ge=0, description="Oldest cached result accepted, in seconds"),
+    force_refresh: bool = Query(False, description="Ignore cached results"),
+    deadline: Optional[float] = Query(
+        None, gt=0, le=Config.REQUEST_DEADLINE_MAX, description="Time budget in seconds"
+    ),
+    portfolio: PortfolioService = Depends(get_portfolio_service)
+):
     """
     Analyze a GitHub profile and return comprehensive portfolio analysis
+    
+    Recent cached results are served immediately; `stale` marks one served
+    while a background refresh runs. Repositories whose fetches the
+    deadline cut short are listed in `incomplete_repositories`. If the
+    client disconnects, GitHub work nobody else is waiting on is cancelled.
+    Under overload, analyses that would miss the cache are shed with 503.
     """
+    # The budget covers the whole request, validation and cache lookups included
+    budget = Deadline(deadline or Config.REQUEST_DEADLINE)
     try:
         # Validate username
         if not validate_github_username(username):
             raise HTTPException(status_code=400, detail="Invalid GitHub username")
         
-        # Initialize services
-        github_service = GitHubService()
-        analyzer = AnalyzerService()
-        score_calculator = ScoreCalculator()
-        recruiter_sim = RecruiterSimulator()
-        roadmap_gen = RoadmapGenerator()
-        
-        # Fetch GitHub data
-        user_data = await github_service.get_user_profile(username)
-        repositories = await github_service.get_repositories(username)
-        
-        # Limit repositories for performance
-        repositories = repositories[:Config.MAX_REPOS_TO_ANALYZE]
-        
-        # Analyze each repository
-        analyzed_repos = []
-        for repo in repositories:
-            repo_analysis = await analyzer.analyze_repository(repo)
-            analyzed_repos.append(repo_analysis)
-        
-        # Calculate scores
-        portfolio_score = score_calculator.calculate_portfolio_score(
-            user_data, analyzed_repos
-        )
-        
-        # Generate recruiter feedback
-        recruiter_feedback = recruiter_sim.simulate_review(
-            user_data, analyzed_repos, portfolio_score
-        )
-        
-        # Generate improvement roadmap
-        roadmap = roadmap_gen.generate_roadmap(
-            portfolio_score, analyzed_repos
-        )
-        
-        # Create user profile
-        profile = UserProfile(
-            username=username,
-            user_data=user_data,
-            repositories=analyzed_repos,
-            score=portfolio_score,
-            recruiter_feedback=recruiter_feedback,
-            roadmap=roadmap
-        )
-        
-        return profile.dict()
+        return await cancel_on_disconnect(request, portfolio.analyze(
+            username, max_age=max_age, force_refresh=force_refresh, deadline=budget
+        ))
         
+    except ClientDisconnected:
+        logger.info("Client disconnected during analysis of %s", username)
+        # Nobody receives this; 499 marks it in access logs as nginx does
+        return Response(status_code=499)
+    except HTTPException:
+        raise
+    except RETRYABLE_ERRORS as e:
+        raise _rate_limit_error(e)
+    except DeadlineExceeded as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except GitHubAPIError as e:
+        raise _github_error(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _sse_event(event: str, payload: Any) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(payload))}\n\n"
+
+async def _sse_stream(events: AsyncIterator[Tuple[str, Any]]) -> AsyncIterator[str]:
+    """Encode pipeline events as SSE, ending with an error event if the analysis fails"""
+    try:
+        async for event, payload in events:
+            yield _sse_event(event, payload)
+    except RETRYABLE_ERRORS as e:
+        yield _sse_event("error", {
+            "detail": str(e),
+            "status_code": 503,
+            "retry_after": max(int(e.retry_after), 1)
+        })
+    except GitHubAPIError as e:
+        error = _github_error(e)
+        payload = {"detail": error.detail, "status_code": error.status_code}
+        if error.headers and "Retry-After" in error.headers:
+            payload["retry_after"] = int(error.headers["Retry-After"])
+        yield _sse_event("error", payload)
+    except Exception as e:
+        logger.warning("Streaming analysis failed: %s", e)
+        yield _sse_event("error", {"detail": str(e), "status_code": 500})
+
+@router.get("/analyze/{username}/stream")
+async def stream_github_profile(
+    username: str,
+    max_age: Optional[int] = Query(None, ge=0, description="Oldest cached result accepted, in seconds"),
+    force_refresh: bool = Query(False, description="Ignore cached results"),
+    portfolio: PortfolioService = Depends(get_portfolio_service)
+):
+    """
+    Stream a portfolio analysis as Server-Sent Events
+    
+    Emits profile, one repository event per analyzed repository, score,
+    recruiter_feedback and roadmap as each stage completes, then done
+    (or error).
+    """
+    if not validate_github_username(username):
+        raise HTTPException(status_code=400, detail="Invalid GitHub username")
+    
+    events = portfolio.stream(username, max_age=max_age, force_refresh=force_refresh)
+    return StreamingResponse(
+        _sse_stream(events),
+        media_type="text/event-stream",
+        # Keep proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# Header cells a cohort spreadsheet export may start with
+BATCH_FILE_HEADERS = {"username", "usernames", "login", "github", "url", "profile"}
+
+async def _read_batch_entries(request: Request) -> List[str]:
+    """Read raw usernames / profile URLs from a JSON body, an uploaded file or plain text"""
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or isinstance(upload, str):
+            raise HTTPException(status_code=400, detail="Upload the usernames as a 'file' field")
+        text = (await upload.read()).decode("utf-8-sig", errors="replace")
+    elif content_type.startswith("application/json"):
+        try:
+            return BatchAnalysisRequest.model_validate_json(await request.body()).usernames
+        except ValidationError:
+            raise HTTPException(status_code=400, detail='Expected a JSON body like {"usernames": [...]}')
+    else:
+        text = (await request.body()).decode("utf-8-sig", errors="replace")
+    
+    # One entry per line, cell or word
+    entries = [entry for entry in re.split(r"[\s,;]+", text) if entry]
+    if entries and entries[0].lower() in BATCH_FILE_HEADERS:
+        entries = entries[1:]
+    return entries
+
+def _ndjson_line(payload: Dict[str, Any]) -> str:
+    """Encode one NDJSON line"""
+    return json.dumps(jsonable_encoder(payload)) + "\n"
+
+async def _ndjson_batch(batch: BatchAnalysis, usernames: List[str],
+                        invalid: List[str], duplicates: int) -> AsyncIterator[str]:
+    """Stream invalid entries, then each profile as it completes, then a summary"""
+    for entry in invalid:
+        yield _ndjson_line({"input": entry, "status": "invalid", "error": "Invalid GitHub username"})
+    
+    succeeded = failed = 0
+    async for line in batch.run(usernames):
+        if line["status"] == "ok":
+            succeeded += 1
+        else:
+            failed += 1
+        yield _ndjson_line(line)
+    
+    yield _ndjson_line({
+        "status": "summary",
+        "requested": len(usernames),
+        "succeeded": succeeded,
+        "failed": failed,
+        "invalid": len(invalid),
+        "duplicates": duplicates
+    })
+
+@router.post("/analyze/batch")
+async def analyze_batch(
+    request: Request,
+    portfolio: PortfolioService = Depends(get_portfolio_service)
+):
+    """
+    Analyze many GitHub profiles and stream the results as NDJSON
+    
+    Accepts {"usernames": [...]}, a multipart upload in a `file` field, or a
+    plain-text body. Entries may be usernames or profile URLs; they are
+    normalized and deduplicated. Lines arrive in completion order, with
+    per-user errors inline, followed by a summary line.
+    """
+    entries = await _read_batch_entries(request)
+    usernames, invalid, duplicates = normalize_usernames(entries)
+    if not usernames and not invalid:
+        raise HTTPException(status_code=400, detail="No usernames provided")
+    if len(usernames) > Config.BATCH_MAX_USERNAMES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {Config.BATCH_MAX_USERNAMES} usernames per batch"
+        )
+    
+    batch = BatchAnalysis(portfolio, request.app.state.batch_limiter)
+    return StreamingResponse(
+        _ndjson_batch(batch, usernames, invalid, duplicates),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/jobs/analyze", status_code=202)
+async def submit_analysis_job(
+    job_request: AnalysisJobRequest,
+    portfolio: PortfolioService = Depends(get_portfolio_service),
+    jobs: JobManager = Depends(get_job_manager)
+):
+    """
+    Queue a profile analysis and return its job id immediately
+    """
+    username = job_request.username
+    if not validate_github_username(username):
+        raise HTTPException(status_code=400, detail="Invalid GitHub username")
+    
+    # Identical pending submissions share one job
+    key = portfolio.flight_key(username) + (job_request.max_age, job_request.force_refresh)
+    try:
+        job = jobs.submit(key, username, lambda job: portfolio.analyze(
+            username,
+            max_age=job_request.max_age,
+            force_refresh=job_request.force_refresh,
+            progress=job.report_progress
+        ))
+    except JobQueueFull as e:
+        raise _rate_limit_error(e)
+    return job.to_dict()
+
+@router.get("/jobs/{job_id}")
+async def get_analysis_job(
+    job_id: str,
+    jobs: JobManager = Depends(get_job_manager)
+):
+    """
+    Report a job's status and progress, with the UserProfile once completed
+    """
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job.to_dict()
+
 @router.get("/user/{username}/basic")
-async def get_basic_profile(username: str):
+async def get_basic_profile(
+    username: str,
+    github_service: GitHubService = Depends(get_github_service)
+):
     """
     Get basic GitHub profile information
     """
     try:
-        github_service = GitHubService()
         user_data = await github_service.get_user_profile(username)
         return user_data
+    except (RateLimitExceeded, CircuitOpen) as e:
+        raise _rate_limit_error(e)
+    except GitHubAPIError as e:
+        raise _github_error(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -0,0 +1,343 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from .config import Config
+from .github_simulator import LATENCY_PROFILES, SimulatorSettings, create_simulator
+from .services.http_client import create_github_client
+
+# Portfolio shapes: repositories, README size and commits per repository
+SHAPES = {
+    "small": {"repos": 8, "readme_kb": 2, "commits": 40},
+    "medium": {"repos": 40, "readme_kb": 16, "commits": 400},
+    "large": {"repos": 200, "readme_kb": 256, "commits": 3000},
+    "whale": {"repos": 1000, "readme_kb": 5 * 1024, "commits": 10000},
+}
+
+# Metrics compared against a baseline, and whether a higher value is worse
+COMPARED_METRICS = {
+    "latency_p50": True,
+    "latency_p95": True,
+    "latency_p99": True,
+    "throughput": False,
+    "github_calls_per_analysis": True,
+    "github_bytes_per_analysis": True,
+}
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of unsorted values"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+def _rss_bytes() -> int:
+    """Current resident set size, or the peak so far where /proc is unavailable"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KB, macOS bytes
+        return peak if sys.platform == "darwin" else peak * 1024
+
+# Body bytes handed to the client at a time, roughly what a socket read returns
+NETWORK_CHUNK_SIZE = 64 * 1024
+
+# Caveat recorded with every result file
+MEASUREMENT_NOTE = (
+    "The GitHub stand-in runs in-process on its own thread and event loop, so its latency and work "
+    "stay off the measured loop's lag, but it shares the CPU and the GIL with the service under "
+    "test. Each stand-in response is buffered in full. github_bytes_per_analysis counts only the "
+    "bytes the client read, in network-sized chunks, so capped README reads stop early as they "
+    "would on the wire; peak_rss_bytes still includes the fully buffered bodies."
+)
+
+class _CountingStream(httpx.AsyncByteStream):
+    """Counts the body bytes of a GitHub response as the client reads them
+    
+    httpx's ASGITransport delivers the whole body as one chunk; it is
+    re-split into network-sized chunks so a client that stops reading
+    early, like the capped README stream, is not charged for the rest.
+    """
+    
+    def __init__(self, stream: httpx.AsyncByteStream, counter: "CountingTransport"):
+        self._stream = stream
+        self._counter = counter
+    
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            for start in range(0, len(chunk), NETWORK_CHUNK_SIZE):
+                piece = chunk[start:start + NETWORK_CHUNK_SIZE]
+                self._counter.bytes += len(piece)
+                yield piece
+    
+    async def aclose(self) -> None:
+        await self._stream.aclose()
+
+class ThreadedTransport(httpx.AsyncBaseTransport):
+    """Serves requests from a transport running on its own thread and event loop
+    
+    The stand-in's latency sleeps and response building then never take
+    turns on the loop being measured. Bodies are read in full on the
+    stand-in's side and handed over as bytes.
+    """
+    
+    def __init__(self, inner: httpx.AsyncBaseTransport):
+        self.inner = inner
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="github-stand-in", daemon=True)
+        self._thread.start()
+    
+    async def _forward(self, request: httpx.Request) -> tuple:
+        """Run one request on the stand-in's loop"""
+        response = await self.inner.handle_async_request(request)
+        try:
+            body = b"".join([chunk async for chunk in response.aiter_raw()])
+        finally:
+            await response.aclose()
+        return response.status_code, response.headers.multi_items(), body
+    
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        # Cancelling the caller cancels the request on the stand-in's loop too
+        status, headers, body = await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(self._forward(request), self._loop)
+        )
+        return httpx.Response(status, headers=headers, content=body)
+    
+    async def aclose(self) -> None:
+        await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self.inner.aclose(), self._loop))
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+class CountingTransport(httpx.AsyncBaseTransport):
+    """Wraps the transport to the GitHub stand-in, counting calls, bytes and statuses"""
+    
+    def __init__(self, inner: httpx.AsyncBaseTransport):
+        self.inner = inner
+        self.calls = 0
+        self.bytes = 0
+        self.statuses: Counter = Counter()
+    
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        response = await self.inner.handle_async_request(request)
+        self.statuses[response.status_code] += 1
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=_CountingStream(response.stream, self),
+            extensions=response.extensions
+        )
+    
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+class LoopMonitor:
+    """Samples event-loop lag and peak RSS while a scenario runs"""
+    
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.lags: List[float] = []
+        self.peak_rss = _rss_bytes()
+        self._task: Optional[asyncio.Task] = None
+    
+    async def _run(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            # Any overshoot is time the loop spent busy with something else
+            self.lags.append(max(time.perf_counter() - started - self.interval, 0.0))
+            self.peak_rss = max(self.peak_rss, _rss_bytes())
+    
+    def start(self) -> None:
+        self._task = asyncio.ensure_future(self._run())
+    
+    async def stop(self) -> None:
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+def _simulator_settings(shape: Dict[str, Any], args: argparse.Namespace) -> SimulatorSettings:
+    """A stand-in where every account has exactly the shape's sizes"""
+    return SimulatorSettings(
+        seed=args.seed,
+        repos_max=shape["repos"], readme_max_kb=shape["readme_kb"], commits_max=shape["commits"],
+        whale_prefix="",  # every login gets the maximum of every size
+        latency=args.latency, error_rate=args.error_rate, accepted_rate=args.accepted_rate,
+        # The benchmark measures the analyzer, not GitHub's quota
+        rate_limit=10 ** 9, anonymous_rate_limit=10 ** 9
+    )
+
+async def run_scenario(shape_name: str, concurrency: int, args: argparse.Namespace) -> Dict[str, Any]:
+    """Run cold analyses of one portfolio shape at one concurrency level"""
+    from .main import app, lifespan
+    
+    simulator = create_simulator(_simulator_settings(SHAPES[shape_name], args))
+    counter = CountingTransport(ThreadedTransport(httpx.ASGITransport(app=simulator)))
+    latencies: List[float] = []
+    outcomes: Counter = Counter()
+    limiter = asyncio.Semaphore(concurrency)
+    
+    async with lifespan(app):
+        await app.state.github_client.aclose()
+        app.state.github_client = create_github_client(transport=counter)
+        if not args.paced:
+            # Lift client-side pacing; the stand-in never runs out of quota
+            app.state.rate_limiter.rate = app.state.rate_limiter.burst = 10 ** 9
+        
+        params = {"deadline": args.deadline} if args.deadline else {}
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench",
+                                     timeout=None) as client:
+            async def analyze(index: int) -> None:
+                # A fresh login per analysis, so every one is a cache miss
+                username = f"bench-{shape_name}-{concurrency}-{index}"
+                async with limiter:
+                    started = time.perf_counter()
+                    response = await client.get(f"/api/v1/analyze/{username}", params=params)
+                    latencies.append(time.perf_counter() - started)
+                if response.status_code == 200:
+                    outcomes[response.json().get("status", "complete")] += 1
+                else:
+                    outcomes[f"http_{response.status_code}"] += 1
+            
+            monitor = LoopMonitor()
+            monitor.start()
+            started = time.perf_counter()
+            try:
+                await asyncio.gather(*(analyze(i) for i in range(args.analyses)))
+            finally:
+                elapsed = time.perf_counter() - started
+                await monitor.stop()
+    
+    return {
+        "shape": shape_name,
+        **SHAPES[shape_name],
+        "concurrency": concurrency,
+        "analyses": args.analyses,
+        "outcomes": dict(outcomes),
+        "elapsed_seconds": round(elapsed, 3),
+        "latency_p50": percentile(latencies, 0.50),
+        "latency_p95": percentile(latencies, 0.95),
+        "latency_p99": percentile(latencies, 0.99),
+        "latency_max": max(latencies) if latencies else None,
+        "throughput": round(len(latencies) / elapsed, 3) if elapsed else None,
+        "peak_rss_bytes": monitor.peak_rss,
+        "loop_lag_p99": percentile(monitor.lags, 0.99),
+        "loop_lag_max": max(monitor.lags) if monitor.lags else None,
+        "github_calls_per_analysis": round(counter.calls / args.analyses, 2),
+        "github_bytes_per_analysis": round(counter.bytes / args.analyses),
+        "github_statuses": {str(status): count for status, count in sorted(counter.statuses.items())},
+    }
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """List metrics that got worse than the baseline by more than `tolerance`"""
+    previous = {(s["shape"], s["concurrency"]): s for s in baseline.get("scenarios", [])}
+    regressions = []
+    for scenario in results["scenarios"]:
+        before = previous.get((scenario["shape"], scenario["concurrency"]))
+        if before is None:
+            continue
+        for metric, higher_is_worse in COMPARED_METRICS.items():
+            old, new = before.get(metric), scenario.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (change if higher_is_worse else -change) > tolerance:
+                regressions.append(
+                    f"{scenario['shape']} x{scenario['concurrency']}: {metric} {old:.4g} -> {new:.4g} ({change:+.1%})"
+                )
+    return regressions
+
+def _format_row(scenario: Dict[str, Any]) -> str:
+    """One human-readable line per scenario"""
+    def ms(value: Optional[float]) -> str:
+        return "-" if value is None else f"{value * 1000:.0f}ms"
+    return (
+        f"{scenario['shape']:<7} x{scenario['concurrency']:<3} "
+        f"p50 {ms(scenario['latency_p50']):>8} p95 {ms(scenario['latency_p95']):>8} "
+        f"p99 {ms(scenario['latency_p99']):>8} {scenario['throughput'] or 0:>7.2f}/s "
+        f"rss {scenario['peak_rss_bytes'] / 2 ** 20:>6.0f}MB lag99 {ms(scenario['loop_lag_p99']):>6} "
+        f"calls {scenario['github_calls_per_analysis']:>7} "
+        f"KB {scenario['github_bytes_per_analysis'] / 1024:>8.0f} {scenario['outcomes']}"
+    )
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run every shape at every concurrency level"""
+    # Nothing may be served from an earlier run's disk cache
+    Config.CACHE_SQLITE_PATH = ""
+    scenarios = []
+    for shape in args.shapes:
+        for concurrency in args.concurrency:
+            scenario = await run_scenario(shape, concurrency, args)
+            print(_format_row(scenario), flush=True)
+            scenarios.append(scenario)
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "note": MEASUREMENT_NOTE,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "settings": {
+                "analyses": args.analyses,
+                "latency": args.latency,
+                "error_rate": args.error_rate,
+                "accepted_rate": args.accepted_rate,
+                "seed": args.seed,
+                "paced": args.paced,
+                "deadline": args.deadline or Config.REQUEST_DEADLINE,
+                "github_backend": Config.GITHUB_BACKEND,
+                "admission_max_active": Config.ADMISSION_MAX_ACTIVE,
+            },
+        },
+        "scenarios": scenarios,
+    }
+
+def main() -> None:
+    """Benchmark the analysis endpoint: python -m app.bench --shapes small medium --concurrency 1 8"""
+    parser = argparse.ArgumentParser(description="End-to-end benchmark against the synthetic GitHub")
+    parser.add_argument("--shapes", nargs="+", choices=sorted(SHAPES), default=["small", "medium", "large"])
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 8])
+    parser.add_argument("--analyses", type=int, default=16, help="analyses per scenario")
+    parser.add_argument("--latency", choices=sorted(LATENCY_PROFILES), default="fast")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--accepted-rate", type=float, default=0.0,
+                        help="fraction of languages/commits calls answered 202")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--deadline", type=float, default=None, help="per-request deadline in seconds")
+    parser.add_argument("--paced", action="store_true", help="keep the client-side GitHub rate pacing")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", default=None, help="earlier results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed regression, as a fraction")
+    args = parser.parse_args()
+    
+    results = asyncio.run(run(args))
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Note: {MEASUREMENT_NOTE}")
+    print(f"Results written to {args.output}")
+    
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+
+if __name__ == "__main__":
+    main()
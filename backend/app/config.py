@@ -7,7 +7,93 @@ load_dotenv()
 class Config:
     # GitHub API Configuration
     GITHUB_TOKEN = os.getenv('GITHUB_TOKEN')
-    GITHUB_API_BASE_URL = "https://api.github.com"
+    # Token pool: comma-separated GITHUB_TOKENS, falling back to the single GITHUB_TOKEN
+    GITHUB_TOKENS = [
+        token.strip() for token in os.getenv('GITHUB_TOKENS', '').split(',') if token.strip()
+    ] or ([GITHUB_TOKEN] if GITHUB_TOKEN else [])
+    GITHUB_DEFAULT_RATE_LIMIT = 5000  # requests per hour assumed for a token not yet seen
+    GITHUB_TOKEN_REPROBE_INTERVAL = float(os.getenv('GITHUB_TOKEN_REPROBE_INTERVAL', 600))  # seconds before a rejected token is tried again
+    GITHUB_API_BASE_URL = os.getenv('GITHUB_API_BASE_URL', "https://api.github.com")  # e.g. the local simulator
+    GITHUB_GRAPHQL_URL = os.getenv('GITHUB_GRAPHQL_URL', "https://api.github.com/graphql")
+    
+    # Fetch backend: "rest" (one call per endpoint) or "graphql" (batched queries)
+    GITHUB_BACKEND = os.getenv('GITHUB_BACKEND', 'rest').lower()
+    GRAPHQL_PAGE_SIZE = int(os.getenv('GRAPHQL_PAGE_SIZE', 25))  # repositories per query
+    
+    # Shared HTTP client pool
+    GITHUB_HTTP2 = os.getenv('GITHUB_HTTP2', 'True').lower() == 'true'
+    GITHUB_MAX_CONNECTIONS = int(os.getenv('GITHUB_MAX_CONNECTIONS', 20))  # per host
+    GITHUB_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv('GITHUB_MAX_KEEPALIVE_CONNECTIONS', 10))
+    GITHUB_KEEPALIVE_EXPIRY = float(os.getenv('GITHUB_KEEPALIVE_EXPIRY', 30.0))  # seconds
+    GITHUB_TIMEOUT = float(os.getenv('GITHUB_TIMEOUT', 30.0))  # seconds
+    
+    # Record/replay of GitHub traffic for offline benchmarks: "record", "replay" or empty for live
+    GITHUB_CASSETTE_MODE = os.getenv('GITHUB_CASSETTE_MODE', '').lower()
+    GITHUB_CASSETTE_PATH = os.getenv('GITHUB_CASSETTE_PATH', 'cassettes/github.json.gz')
+    REPLAY_LATENCY = float(os.getenv('REPLAY_LATENCY', 0))  # seconds added to every replayed response
+    REPLAY_JITTER = float(os.getenv('REPLAY_JITTER', 0))  # +/- seconds around REPLAY_LATENCY
+    REPLAY_ERROR_RATE = float(os.getenv('REPLAY_ERROR_RATE', 0))  # fraction answered with a 502
+    REPLAY_SEED = int(os.getenv('REPLAY_SEED', 0))
+    
+    # Two-tier cache: per-process memory LRU in front of a SQLite file shared by all workers
+    CACHE_SQLITE_PATH = os.getenv('CACHE_SQLITE_PATH', 'portfolio_cache.sqlite3')  # empty: memory only
+    CACHE_MEMORY_MAX_ENTRIES = int(os.getenv('CACHE_MEMORY_MAX_ENTRIES', 5000))  # per namespace
+    CACHE_MEMORY_MAX_BYTES = int(os.getenv('CACHE_MEMORY_MAX_BYTES', 64 * 1024 * 1024))  # per namespace
+    CACHE_SQLITE_MAX_PENDING_WRITES = int(os.getenv('CACHE_SQLITE_MAX_PENDING_WRITES', 10000))  # queued disk writes before dropping
+    
+    # Conditional request cache (ETag / Last-Modified)
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', 5000))
+    RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', 7 * 24 * 3600))  # seconds; validators keep entries fresh
+    FETCH_PLANNER_MAX_REPOS = int(os.getenv('FETCH_PLANNER_MAX_REPOS', 10000))  # repos whose pushed_at is remembered
+    
+    # Finished per-repository analyses
+    REPO_ANALYSIS_CACHE_MAX_ENTRIES = int(os.getenv('REPO_ANALYSIS_CACHE_MAX_ENTRIES', 5000))
+    REPO_ANALYSIS_CACHE_TTL = int(os.getenv('REPO_ANALYSIS_CACHE_TTL', 3600))  # seconds
+    
+    # Finished profile analyses
+    PROFILE_CACHE_MAX_ENTRIES = int(os.getenv('PROFILE_CACHE_MAX_ENTRIES', 1000))
+    PROFILE_CACHE_TTL = int(os.getenv('PROFILE_CACHE_TTL', 900))  # seconds a result is served as fresh
+    PROFILE_STALE_TTL = int(os.getenv('PROFILE_STALE_TTL', 24 * 3600))  # further seconds served stale while refreshing
+    
+    # Time budget for synchronous analyses
+    REQUEST_DEADLINE = float(os.getenv('REQUEST_DEADLINE', 25))  # seconds, below common proxy timeouts
+    REQUEST_DEADLINE_MAX = float(os.getenv('REQUEST_DEADLINE_MAX', 120))  # largest ?deadline= accepted
+    DEADLINE_SCORING_RESERVE = float(os.getenv('DEADLINE_SCORING_RESERVE', 0.5))  # seconds kept for scoring
+    DEADLINE_FLIGHT_BUCKET = float(os.getenv('DEADLINE_FLIGHT_BUCKET', 1))  # seconds of deadlines sharing a run
+    
+    # Admission control for cold analyses; cached results are always served
+    ADMISSION_MAX_ACTIVE = int(os.getenv('ADMISSION_MAX_ACTIVE', 16))  # analyses running at once
+    ADMISSION_QUEUE_MAX = int(os.getenv('ADMISSION_QUEUE_MAX', 32))  # analyses waiting for a slot
+    ADMISSION_QUEUE_TIMEOUT = float(os.getenv('ADMISSION_QUEUE_TIMEOUT', 10))  # seconds waited before shedding
+    
+    # Background analysis jobs
+    JOB_WORKERS = int(os.getenv('JOB_WORKERS', 4))  # analyses run at once
+    JOB_QUEUE_MAX = int(os.getenv('JOB_QUEUE_MAX', 100))  # jobs waiting for a worker
+    JOB_RETENTION_SECONDS = int(os.getenv('JOB_RETENTION_SECONDS', 3600))  # finished jobs kept for polling
+    JOB_MAX_RETAINED = int(os.getenv('JOB_MAX_RETAINED', 1000))
+    
+    # Batch analysis
+    BATCH_MAX_USERNAMES = int(os.getenv('BATCH_MAX_USERNAMES', 2000))  # per request, after dedup
+    BATCH_CONCURRENCY = int(os.getenv('BATCH_CONCURRENCY', 4))  # profiles analyzed at once per batch
+    BATCH_GLOBAL_CONCURRENCY = int(os.getenv('BATCH_GLOBAL_CONCURRENCY', 8))  # across all batches
+    
+    # Rate-limit scheduler
+    RATE_LIMIT_REQUESTS_PER_SECOND = float(os.getenv('RATE_LIMIT_REQUESTS_PER_SECOND', 15))  # per token
+    RATE_LIMIT_BURST = int(os.getenv('RATE_LIMIT_BURST', 100))  # requests sent without pacing
+    RATE_LIMIT_RESERVE = int(os.getenv('RATE_LIMIT_RESERVE', 10))  # requests kept back per window
+    RATE_LIMIT_PACING_THRESHOLD = 0.1  # spread the remaining budget below this fraction
+    RATE_LIMIT_MAX_WAIT = float(os.getenv('RATE_LIMIT_MAX_WAIT', 60))  # seconds queued before failing
+    RATE_LIMIT_MAX_RETRIES = 2  # retries after a rate-limited response
+    SECONDARY_RATE_LIMIT_BACKOFF = 60  # seconds, when GitHub sends no Retry-After
+    
+    # Retries of transient GitHub failures (connection errors, 5xx)
+    GITHUB_RETRY_MAX_RETRIES = int(os.getenv('GITHUB_RETRY_MAX_RETRIES', 3))  # per request
+    GITHUB_RETRY_BASE_DELAY = float(os.getenv('GITHUB_RETRY_BASE_DELAY', 0.5))  # seconds, doubled per retry
+    GITHUB_RETRY_MAX_DELAY = float(os.getenv('GITHUB_RETRY_MAX_DELAY', 8))  # seconds
+    GITHUB_RETRY_BUDGET_RATIO = float(os.getenv('GITHUB_RETRY_BUDGET_RATIO', 0.1))  # retries per request, sustained
+    GITHUB_RETRY_BUDGET_RESERVE = int(os.getenv('GITHUB_RETRY_BUDGET_RESERVE', 20))  # retries available in a burst
+    CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', 5))  # consecutive failures per endpoint
+    CIRCUIT_RESET_TIMEOUT = float(os.getenv('CIRCUIT_RESET_TIMEOUT', 30))  # seconds before probing again
     
     # Debug: Print token info (first 10 chars for security)
     print(f"Token loaded: {GITHUB_TOKEN[:10] if GITHUB_TOKEN else 'None'}...")
@@ -31,4 +117,24 @@ class Config:
     ACTIVE_DAYS_THRESHOLD = 30  # days
     
     # Rate Limiting
-    MAX_REPOS_TO_ANALYZE = 20
\ No newline at end of file
+    MAX_REPOS_TO_ANALYZE = 20
+    README_MAX_BYTES = int(os.getenv('README_MAX_BYTES', 256 * 1024))  # README bytes read per repo
+    MAX_REPOS_TO_LIST = int(os.getenv('MAX_REPOS_TO_LIST', 1000))  # listing pages stop here
+    REPOS_PER_PAGE = 100  # GitHub's maximum page size
+    
+    # Repository triage (listing metadata only, before deep analysis)
+    TRIAGE_WEIGHTS = {
+        'stars': 30,
+        'forks': 15,
+        'size': 15,
+        'description': 10,
+        'recency': 30
+    }
+    TRIAGE_FORK_PENALTY = 40
+    TRIAGE_ARCHIVED_PENALTY = 20
+    TRIAGE_EMPTY_PENALTY = 50
+    TRIAGE_RECENCY_DAYS = 180  # recency decay constant
+    
+    # Concurrency
+    ANALYSIS_CONCURRENCY = int(os.getenv('ANALYSIS_CONCURRENCY', 5))  # repos analyzed in parallel per request
+    GITHUB_MAX_IN_FLIGHT = int(os.getenv('GITHUB_MAX_IN_FLIGHT', 50))  # GitHub requests in flight per process
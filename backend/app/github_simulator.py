@@ -0,0 +1,510 @@
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import math
+import random
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from fastapi import FastAPI, Request
+from fastapi.responses import Response
+
+LANGUAGES = ["Python", "JavaScript", "TypeScript", "Go", "Rust", "Java", "C++", "Ruby", "Shell", "HTML", "CSS"]
+
+# Base seconds, +/- jitter seconds, seconds per KB of body
+LATENCY_PROFILES = {
+    "none": (0.0, 0.0, 0.0),
+    "fast": (0.01, 0.005, 0.0),
+    "github": (0.08, 0.04, 0.00002),
+    "slow": (0.4, 0.2, 0.0001),
+}
+
+README_BLOCKS = [
+    "## Installation\n\nInstall with `pip install project` or clone the repository and run the setup script.\n\n",
+    "## Usage\n\nRun the example below to get started. See the docs folder for the API reference.\n\n",
+    "```python\nfrom project import Client\nclient = Client()\nprint(client.run())\n```\n\n",
+    "![build](https://img.shields.io/badge/build-passing-green) ![license](https://img.shields.io/badge/license-MIT-blue)\n\n",
+    "This paragraph describes the design, the trade-offs that were made and the roadmap for the next release.\n\n",
+]
+
+class SimulatorSettings:
+    """Shape of the synthetic GitHub: data sizes, latency, rate limits and failure rates"""
+    
+    def __init__(self, seed: int = 0, repos_median: int = 20, repos_max: int = 1000,
+                 readme_median_kb: float = 4, readme_max_kb: float = 5 * 1024,
+                 commits_median: int = 150, commits_max: int = 10000,
+                 whale_prefix: str = "whale", latency: str = "none",
+                 error_rate: float = 0.0, accepted_rate: float = 0.0,
+                 rate_limit: int = 5000, anonymous_rate_limit: int = 60,
+                 rate_limit_window: int = 3600, anchor: Optional[datetime] = None):
+        if latency not in LATENCY_PROFILES:
+            raise ValueError(f"Unknown latency profile {latency!r}, expected one of {sorted(LATENCY_PROFILES)}")
+        self.seed = seed
+        self.repos_median = repos_median
+        self.repos_max = repos_max
+        self.readme_median_bytes = int(readme_median_kb * 1024)
+        self.readme_max_bytes = int(readme_max_kb * 1024)
+        self.commits_median = commits_median
+        self.commits_max = commits_max
+        # Accounts whose login starts with this get the maximum of every size
+        self.whale_prefix = whale_prefix
+        self.latency = latency
+        self.error_rate = error_rate  # fraction answered with a 502/503
+        # Fraction of languages/commits answered 202 "still computing". GitHub itself only does this
+        # for /stats endpoints; injecting it here checks the client degrades instead of scoring zero
+        self.accepted_rate = accepted_rate
+        self.rate_limit = rate_limit
+        self.anonymous_rate_limit = anonymous_rate_limit
+        self.rate_limit_window = rate_limit_window
+        # Dates are generated relative to this day, so the same seed yields the same data all day
+        self.anchor = anchor or datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+
+def _timestamp(moment: datetime) -> str:
+    """Format a time the way the GitHub API does"""
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def _sized(rng: random.Random, median: int, maximum: int, whale: bool) -> int:
+    """Draw a long-tailed size around `median`, capped at `maximum`"""
+    if whale:
+        return maximum
+    return min(int(rng.lognormvariate(math.log(max(median, 1)), 1.0)), maximum)
+
+class SyntheticGitHub:
+    """Deterministic synthetic users and repositories derived from a seed"""
+    
+    def __init__(self, settings: SimulatorSettings):
+        self.settings = settings
+    
+    def _rng(self, *parts: Any) -> random.Random:
+        """Random generator determined by the seed and `parts` alone"""
+        return random.Random(":".join(str(part) for part in (self.settings.seed,) + parts))
+    
+    def exists(self, login: str) -> bool:
+        """Logins starting with "ghost" do not exist"""
+        return not login.lower().startswith("ghost")
+    
+    def is_whale(self, login: str) -> bool:
+        """Whether a login gets the largest account the settings allow"""
+        return login.lower().startswith(self.settings.whale_prefix)
+    
+    def repo_count(self, login: str) -> int:
+        """Number of public repositories a user owns"""
+        rng = self._rng("repos", login.lower())
+        return _sized(rng, self.settings.repos_median, self.settings.repos_max, self.is_whale(login))
+    
+    def user(self, login: str) -> Dict[str, Any]:
+        """The /users/{login} payload"""
+        rng = self._rng("user", login.lower())
+        created = self.settings.anchor - timedelta(days=rng.randint(200, 4000))
+        return {
+            "login": login,
+            "id": rng.randint(1, 10 ** 8),
+            "name": f"Synthetic {login}",
+            "bio": rng.choice([None, "Software engineer", "Open source enthusiast"]),
+            "public_repos": self.repo_count(login),
+            "followers": int(rng.paretovariate(1.2)) * 3,
+            "following": rng.randint(0, 200),
+            "created_at": _timestamp(created),
+            "updated_at": _timestamp(self.settings.anchor - timedelta(days=rng.randint(0, 30))),
+            "avatar_url": f"https://avatars.example.com/{login}",
+            "html_url": f"https://github.com/{login}"
+        }
+    
+    def repo(self, login: str, index: int) -> Dict[str, Any]:
+        """The index-th repository of a user, most recently updated first"""
+        rng = self._rng("repo", login.lower(), index)
+        whale = self.is_whale(login)
+        name = f"project-{index}"
+        # Strictly older with every index, so the listing is already sorted by update time
+        pushed = self.settings.anchor - timedelta(days=index * 3 + rng.uniform(0, 3))
+        empty = not whale and rng.random() < 0.03
+        language = None if empty else rng.choice(LANGUAGES)
+        created = pushed - timedelta(days=rng.randint(10, 1000))
+        return {
+            "id": rng.randint(1, 10 ** 9),
+            "name": name,
+            "full_name": f"{login}/{name}",
+            "owner": {"login": login},
+            "description": None if rng.random() < 0.3 else f"Synthetic project {index}",
+            "html_url": f"https://github.com/{login}/{name}",
+            "stargazers_count": int(rng.paretovariate(1.1)) - 1,
+            "forks_count": int(rng.paretovariate(1.5)) - 1,
+            "open_issues_count": rng.randint(0, 20),
+            "created_at": _timestamp(created),
+            "updated_at": _timestamp(pushed),
+            # Like GitHub, a repository nobody pushed to reports its creation time
+            "pushed_at": _timestamp(created if empty else pushed),
+            "language": language,
+            "size": 0 if empty else rng.randint(10, 50000),
+            "fork": rng.random() < 0.1,
+            "archived": rng.random() < 0.05,
+            "has_issues": True,
+            "has_projects": rng.random() < 0.5,
+            "has_wiki": rng.random() < 0.5,
+            # Internal fields, stripped before serving
+            "_empty": empty,
+            "_readme_bytes": 0 if empty or (not whale and rng.random() < 0.15) else _sized(
+                rng, self.settings.readme_median_bytes, self.settings.readme_max_bytes, whale
+            ),
+            "_commits": 0 if empty else _sized(rng, self.settings.commits_median, self.settings.commits_max, whale)
+        }
+    
+    def find_repo(self, login: str, name: str) -> Optional[Dict[str, Any]]:
+        """Look a repository up by name, or None if the user does not own it"""
+        if not self.exists(login) or not name.startswith("project-"):
+            return None
+        try:
+            index = int(name[len("project-"):])
+        except ValueError:
+            return None
+        return self.repo(login, index) if 0 <= index < self.repo_count(login) else None
+    
+    def languages(self, repo: Dict[str, Any]) -> Dict[str, int]:
+        """Bytes of code per language, primary language first"""
+        if repo["_empty"]:
+            return {}
+        rng = self._rng("languages", repo["full_name"])
+        others = rng.sample([language for language in LANGUAGES if language != repo["language"]], rng.randint(0, 4))
+        sizes = {repo["language"]: rng.randint(10000, 500000)}
+        sizes.update({language: rng.randint(100, 50000) for language in others})
+        return sizes
+    
+    def commits(self, repo: Dict[str, Any], start: int, count: int) -> List[Dict[str, Any]]:
+        """A slice of the commit history, newest first"""
+        pushed = datetime.strptime(repo["pushed_at"], "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+        commits = []
+        for i in range(start, min(start + count, repo["_commits"])):
+            sha = hashlib.sha1(f"{self.settings.seed}:{repo['full_name']}:{i}".encode()).hexdigest()
+            date = _timestamp(pushed - timedelta(hours=i * 7))
+            person = {"name": repo["owner"]["login"], "email": "dev@example.com", "date": date}
+            commits.append({
+                "sha": sha,
+                "html_url": f"{repo['html_url']}/commit/{sha}",
+                "commit": {"message": f"Change {repo['_commits'] - i}", "author": person, "committer": person}
+            })
+        return commits
+    
+    def readme(self, repo: Dict[str, Any]) -> bytes:
+        """Markdown README of exactly the repository's README size"""
+        size = repo["_readme_bytes"]
+        text = f"# {repo['name']}\n\n{repo['description'] or ''}\n\n"
+        blocks = "".join(README_BLOCKS)
+        text += blocks * (max(size - len(text), 0) // len(blocks) + 1)
+        return text.encode("utf-8")[:max(size, 1)]
+    
+    def events(self, login: str) -> List[Dict[str, Any]]:
+        """Recent public events of a user"""
+        rng = self._rng("events", login.lower())
+        return [
+            {
+                "id": str(rng.randint(1, 10 ** 10)),
+                "type": rng.choice(["PushEvent", "PullRequestEvent", "IssuesEvent", "CreateEvent"]),
+                "created_at": _timestamp(self.settings.anchor - timedelta(hours=i * rng.randint(1, 48)))
+            }
+            for i in range(rng.randint(0, 30))
+        ]
+
+class RateLimitWindows:
+    """GitHub-style hourly request budgets per credential and resource"""
+    
+    def __init__(self, settings: SimulatorSettings):
+        self.settings = settings
+        self._windows: Dict[Tuple[str, str], List[float]] = {}
+    
+    def spend(self, credential: Optional[str], resource: str, cost: int) -> Tuple[bool, Dict[str, str]]:
+        """Charge a request; return whether it is allowed and the headers describing the budget"""
+        limit = self.settings.rate_limit if credential else self.settings.anonymous_rate_limit
+        now = time.time()
+        window = self._windows.get((credential or "", resource))
+        if window is None or window[0] <= now:
+            window = self._windows[(credential or "", resource)] = [now + self.settings.rate_limit_window, 0]
+        allowed = window[1] + cost <= limit
+        if allowed:
+            window[1] += cost
+        return allowed, {
+            "x-ratelimit-limit": str(limit),
+            "x-ratelimit-remaining": str(limit - window[1]),
+            "x-ratelimit-used": str(window[1]),
+            "x-ratelimit-reset": str(int(window[0])),
+            "x-ratelimit-resource": resource
+        }
+
+def create_simulator(settings: Optional[SimulatorSettings] = None) -> FastAPI:
+    """Build the ASGI app serving the GitHub REST and GraphQL endpoints GitHubService uses"""
+    settings = settings or SimulatorSettings()
+    data = SyntheticGitHub(settings)
+    limits = RateLimitWindows(settings)
+    behaviour = random.Random(settings.seed)
+    counters: Counter = Counter()
+    app = FastAPI(title="Synthetic GitHub API")
+    
+    async def respond(request: Request, endpoint: str, build, resource: str = "core",
+                      may_accept: bool = False) -> Response:
+        """Apply rate limits, injected failures, conditional requests and latency around `build`"""
+        counters[endpoint] += 1
+        base, jitter, per_kb = LATENCY_PROFILES[settings.latency]
+        
+        # Content is a pure function of the seed and the request, so the validator is too
+        query = urlencode(sorted(request.query_params.multi_items()))
+        etag = '"%s"' % hashlib.sha1(
+            f"{settings.seed}:{settings.anchor}:{request.url.path}?{query}:{request.headers.get('accept')}".encode()
+        ).hexdigest()
+        credential = request.headers.get("authorization")
+        if request.method == "GET" and request.headers.get("if-none-match") == etag:
+            # Like GitHub, a 304 does not count against the rate limit
+            _, headers = limits.spend(credential, resource, 0)
+            await asyncio.sleep(max(base + behaviour.uniform(-jitter, jitter), 0))
+            counters["status_304"] += 1
+            return Response(status_code=304, headers={**headers, "etag": etag})
+        
+        allowed, headers = limits.spend(credential, resource, 1)
+        if not allowed:
+            counters["status_403"] += 1
+            return Response(
+                json.dumps({"message": "API rate limit exceeded"}), status_code=403,
+                headers=headers, media_type="application/json"
+            )
+        if settings.error_rate and behaviour.random() < settings.error_rate:
+            status = behaviour.choice([502, 503])
+            counters[f"status_{status}"] += 1
+            await asyncio.sleep(max(base + behaviour.uniform(-jitter, jitter), 0))
+            return Response(json.dumps({"message": "Server Error"}), status_code=status,
+                            headers=headers, media_type="application/json")
+        if may_accept and settings.accepted_rate and behaviour.random() < settings.accepted_rate:
+            counters["status_202"] += 1
+            return Response("{}", status_code=202, headers=headers, media_type="application/json")
+        
+        status, body, media_type, extra = build()
+        counters[f"status_{status}"] += 1
+        await asyncio.sleep(max(base + behaviour.uniform(-jitter, jitter) + per_kb * len(body) / 1024, 0))
+        if status == 200:
+            extra = {**extra, "etag": etag}
+        return Response(body, status_code=status, headers={**headers, **extra}, media_type=media_type)
+    
+    def as_json(payload: Any, status: int = 200, extra: Optional[Dict[str, str]] = None):
+        return status, json.dumps(payload).encode("utf-8"), "application/json", extra or {}
+    
+    def not_found():
+        return as_json({"message": "Not Found", "documentation_url": "https://docs.github.com/rest"}, 404)
+    
+    def public(repo: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: value for key, value in repo.items() if not key.startswith("_")}
+    
+    def page_links(request: Request, page: int, last: int) -> Dict[str, str]:
+        """Link header in GitHub's format, pointing back at this server"""
+        links = []
+        for rel, target in (("next", page + 1), ("last", last), ("first", 1), ("prev", page - 1)):
+            if 1 <= target <= last and target != page:
+                url = request.url.include_query_params(page=target)
+                links.append(f'<{url}>; rel="{rel}"')
+        return {"link": ", ".join(links)} if links else {}
+    
+    def paging(request: Request, default: int = 30) -> Tuple[int, int]:
+        per_page = min(max(int(request.query_params.get("per_page", default)), 1), 100)
+        page = max(int(request.query_params.get("page", 1)), 1)
+        return per_page, page
+    
+    @app.get("/users/{login}")
+    async def get_user(login: str, request: Request):
+        def build():
+            return as_json(data.user(login)) if data.exists(login) else not_found()
+        return await respond(request, "user", build)
+    
+    @app.get("/users/{login}/events")
+    async def get_events(login: str, request: Request):
+        def build():
+            if not data.exists(login):
+                return not_found()
+            per_page, page = paging(request)
+            events = data.events(login)
+            return as_json(events[(page - 1) * per_page:page * per_page])
+        return await respond(request, "events", build)
+    
+    @app.get("/users/{login}/repos")
+    async def list_repos(login: str, request: Request):
+        def build():
+            if not data.exists(login):
+                return not_found()
+            per_page, page = paging(request)
+            total = data.repo_count(login)
+            start = (page - 1) * per_page
+            repos = [public(data.repo(login, i)) for i in range(start, min(start + per_page, total))]
+            return as_json(repos, extra=page_links(request, page, max(math.ceil(total / per_page), 1)))
+        return await respond(request, "repos", build)
+    
+    @app.get("/repos/{login}/{name}")
+    async def get_repo(login: str, name: str, request: Request):
+        def build():
+            repo = data.find_repo(login, name)
+            return as_json(public(repo)) if repo else not_found()
+        return await respond(request, "repository", build)
+    
+    @app.get("/repos/{login}/{name}/languages")
+    async def get_languages(login: str, name: str, request: Request):
+        def build():
+            repo = data.find_repo(login, name)
+            return as_json(data.languages(repo)) if repo else not_found()
+        return await respond(request, "languages", build, may_accept=True)
+    
+    @app.get("/repos/{login}/{name}/commits")
+    async def get_commits(login: str, name: str, request: Request):
+        def build():
+            repo = data.find_repo(login, name)
+            if repo is None:
+                return not_found()
+            if repo["_empty"]:
+                return as_json({"message": "Git Repository is empty."}, 409)
+            per_page, page = paging(request)
+            commits = data.commits(repo, (page - 1) * per_page, per_page)
+            last = max(math.ceil(repo["_commits"] / per_page), 1)
+            return as_json(commits, extra=page_links(request, page, last))
+        return await respond(request, "commits", build, may_accept=True)
+    
+    @app.get("/repos/{login}/{name}/readme")
+    async def get_readme(login: str, name: str, request: Request):
+        def build():
+            repo = data.find_repo(login, name)
+            if repo is None or not repo["_readme_bytes"]:
+                return not_found()
+            content = data.readme(repo)
+            if "raw" in request.headers.get("accept", ""):
+                return 200, content, "text/plain; charset=utf-8", {}
+            return as_json({
+                "name": "README.md",
+                "path": "README.md",
+                "size": len(content),
+                "encoding": "base64",
+                "content": base64.b64encode(content).decode("ascii")
+            })
+        return await respond(request, "readme", build)
+    
+    @app.post("/graphql")
+    async def graphql(request: Request):
+        # Answers the profile query GitHubGraphQLService sends, whatever its exact text
+        variables = (await request.json()).get("variables") or {}
+        
+        def build():
+            login = variables.get("login", "")
+            if not data.exists(login):
+                return as_json({"data": {"user": None}, "errors": [{"message": f"Could not resolve to a User with the login of '{login}'."}]})
+            total = data.repo_count(login)
+            start = int(variables.get("cursor") or 0)
+            end = min(start + int(variables.get("pageSize", 25)), total)
+            user = data.user(login)
+            return as_json({"data": {"user": {
+                "login": login,
+                "name": user["name"],
+                "bio": user["bio"],
+                "avatarUrl": user["avatar_url"],
+                "url": user["html_url"],
+                "createdAt": user["created_at"],
+                "updatedAt": user["updated_at"],
+                "followers": {"totalCount": user["followers"]},
+                "following": {"totalCount": user["following"]},
+                "contributionsCollection": {
+                    "totalCommitContributions": len(data.events(login)) * 3,
+                    "totalIssueContributions": 2,
+                    "totalPullRequestContributions": 4,
+                    "totalPullRequestReviewContributions": 1,
+                    "totalRepositoryContributions": 1
+                },
+                "publicRepositories": {"totalCount": total},
+                "repositories": {
+                    "pageInfo": {"hasNextPage": end < total, "endCursor": str(end)},
+                    "nodes": [graphql_node(data.repo(login, i), int(variables.get("commitCount", 30)))
+                              for i in range(start, end)]
+                }
+            }}})
+        return await respond(request, "graphql", build, resource="graphql")
+    
+    def graphql_node(repo: Dict[str, Any], commit_count: int) -> Dict[str, Any]:
+        languages = data.languages(repo)
+        history = [
+            {
+                "oid": commit["sha"],
+                "message": commit["commit"]["message"],
+                "url": commit["html_url"],
+                "author": commit["commit"]["author"],
+                "committer": commit["commit"]["committer"],
+                "committedDate": commit["commit"]["committer"]["date"]
+            }
+            for commit in ([] if repo["_empty"] else data.commits(repo, 0, commit_count))
+        ]
+        readme = data.readme(repo) if repo["_readme_bytes"] else None
+        return {
+            "name": repo["name"],
+            "nameWithOwner": repo["full_name"],
+            "description": repo["description"],
+            "url": repo["html_url"],
+            "stargazerCount": repo["stargazers_count"],
+            "forkCount": repo["forks_count"],
+            "diskUsage": repo["size"],
+            "createdAt": repo["created_at"],
+            "updatedAt": repo["updated_at"],
+            "pushedAt": repo["pushed_at"],
+            "isFork": repo["fork"],
+            "isArchived": repo["archived"],
+            "hasIssuesEnabled": repo["has_issues"],
+            "hasProjectsEnabled": repo["has_projects"],
+            "hasWikiEnabled": repo["has_wiki"],
+            "owner": {"login": repo["owner"]["login"]},
+            "primaryLanguage": {"name": repo["language"]} if repo["language"] else None,
+            "openIssues": {"totalCount": repo["open_issues_count"]},
+            "languages": {"edges": [
+                {"size": size, "node": {"name": name}}
+                for name, size in sorted(languages.items(), key=lambda item: -item[1])
+            ]},
+            "readmeUpper": {
+                "byteSize": len(readme), "text": readme.decode("utf-8", errors="replace")
+            } if readme is not None else None,
+            "readmeLower": None,
+            "readmeTitle": None,
+            "readmePlain": None,
+            "readmeRst": None,
+            "defaultBranchRef": None if repo["_empty"] else {"target": {"history": {"nodes": history}}}
+        }
+    
+    @app.get("/_simulator/stats")
+    async def stats():
+        """Requests served per endpoint and per status"""
+        return dict(counters)
+    
+    return app
+
+def main() -> None:
+    """Serve the simulator: python -m app.github_simulator --port 9000"""
+    parser = argparse.ArgumentParser(description="Synthetic GitHub API for scale and load testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repos-median", type=int, default=20)
+    parser.add_argument("--repos-max", type=int, default=1000)
+    parser.add_argument("--readme-median-kb", type=float, default=4)
+    parser.add_argument("--readme-max-kb", type=float, default=5 * 1024)
+    parser.add_argument("--commits-median", type=int, default=150)
+    parser.add_argument("--commits-max", type=int, default=10000)
+    parser.add_argument("--latency", choices=sorted(LATENCY_PROFILES), default="none")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--accepted-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=int, default=5000)
+    args = parser.parse_args()
+    
+    import uvicorn
+    settings = SimulatorSettings(
+        seed=args.seed, repos_median=args.repos_median, repos_max=args.repos_max,
+        readme_median_kb=args.readme_median_kb, readme_max_kb=args.readme_max_kb,
+        commits_median=args.commits_median, commits_max=args.commits_max,
+        latency=args.latency, error_rate=args.error_rate, accepted_rate=args.accepted_rate,
+        rate_limit=args.rate_limit
+    )
+    print(f"Point the analyzer at it with GITHUB_API_BASE_URL=http://{args.host}:{args.port} "
+          f"GITHUB_GRAPHQL_URL=http://{args.host}:{args.port}/graphql")
+    uvicorn.run(create_simulator(settings), host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,57 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from .api.routes import router
 from .config import Config
+from .services.http_client import create_github_client
+from .services.cache_service import MemoryCache, TieredCache, create_cache_store
+from .services.response_cache import ResponseCache
+from .services.rate_limiter import RateLimitScheduler
+from .services.token_pool import TokenPool
+from .services.resilience import ResiliencePolicy
+from .services.fetch_planner import FetchPlanner
+from .services.analysis_cache import RepoAnalysisCache
+from .services.job_service import JobManager
+from .services.admission import AdmissionController
+from .utils.single_flight import SingleFlight
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Own the shared GitHub client pool, caches and schedulers for the lifetime of the app"""
+    app.state.github_client = create_github_client()
+    # Every cache namespace shares one on-disk store behind its own memory tier
+    store = app.state.cache_store = create_cache_store()
+    app.state.response_cache = ResponseCache(
+        TieredCache("response", MemoryCache(Config.RESPONSE_CACHE_MAX_ENTRIES), store)
+    )
+    app.state.repo_analysis_cache = RepoAnalysisCache(
+        TieredCache("repo", MemoryCache(Config.REPO_ANALYSIS_CACHE_MAX_ENTRIES), store)
+    )
+    app.state.profile_cache = TieredCache("profile", MemoryCache(Config.PROFILE_CACHE_MAX_ENTRIES), store)
+    app.state.rate_limiter = RateLimitScheduler()
+    app.state.token_pool = TokenPool(Config.GITHUB_TOKENS, app.state.rate_limiter)
+    app.state.resilience = ResiliencePolicy()
+    app.state.fetch_planner = FetchPlanner()
+    app.state.analysis_flights = SingleFlight()
+    app.state.admission = AdmissionController()
+    app.state.job_manager = JobManager()
+    app.state.batch_limiter = asyncio.Semaphore(max(1, Config.BATCH_GLOBAL_CONCURRENCY))
+    app.state.job_manager.start()
+    try:
+        yield
+    finally:
+        await app.state.job_manager.close()
+        await app.state.github_client.aclose()
+        if store is not None:
+            store.close()
 
 app = FastAPI(
     title="GitHub Portfolio Analyzer",
     description="Analyze GitHub profiles for recruiter-ready portfolios",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -29,10 +73,36 @@ async def root():
         "version": "1.0.0",
         "endpoints": [
             "/api/v1/analyze/{username}",
+            "/api/v1/analyze/{username}/stream",
+            "/api/v1/analyze/batch",
+            "/api/v1/jobs/analyze",
+            "/api/v1/jobs/{job_id}",
             "/api/v1/health"
         ]
     }
 
 @app.get("/api/v1/health")
 async def health_check():
-    return {"status": "healthy", "service": "GitHub Portfolio Analyzer"}
\ No newline at end of file
+    return {
+        "status": "healthy",
+        "service": "GitHub Portfolio Analyzer",
+        "github_rate_limit": app.state.rate_limiter.snapshot(),
+        "github_resilience": app.state.resilience.snapshot(),
+        "github_tokens": app.state.token_pool.snapshot(),
+        "fetch_planner": app.state.fetch_planner.stats(),
+        "github_calls_saved": {
+            # Endpoints the fetch planner knew the answer to and never requested
+            "skipped_by_plan": app.state.fetch_planner.calls_skipped,
+            # Endpoints of unchanged repositories answered from stored responses
+            "served_from_storage": app.state.response_cache.reused,
+            # Whole repository analyses reused without any call
+            "repositories_from_analysis_cache": app.state.repo_analysis_cache.hits
+        },
+        "response_cache": app.state.response_cache.stats(),
+        "repo_analysis_cache": app.state.repo_analysis_cache.stats(),
+        "profile_cache": app.state.profile_cache.stats(),
+        "cache_store": app.state.cache_store.stats() if app.state.cache_store else None,
+        "analysis_flights": app.state.analysis_flights.stats(),
+        "admission": app.state.admission.stats(),
+        "analysis_jobs": app.state.job_manager.stats()
+    }
\ No newline at end of file
@@ -0,0 +1,252 @@
+import argparse
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .github_simulator import SimulatorSettings, SyntheticGitHub
+from .services.analyzer_service import AnalyzerService
+from .services.recruiter_simulator import RecruiterSimulator
+from .services.roadmap_generator import RoadmapGenerator
+from .services.score_calculator import ScoreCalculator
+
+# Input sizes per benchmark: README KB, commits, or analyzed repositories
+SIZES = {
+    "analyze_documentation": [1, 8, 64, 512, 4096],
+    "analyze_activity": [10, 100, 1000, 10000],
+    "calculate_portfolio_score": [5, 20, 100, 500, 1000],
+    "simulate_review": [5, 20, 100, 500, 1000],
+    "generate_roadmap": [5, 20, 100, 500, 1000],
+}
+
+# Growth exponent each benchmark should not exceed: all of them are one pass over their input
+EXPECTED_EXPONENT = {name: 1.0 for name in SIZES}
+
+# Prepares the input of one size and returns the call to time
+Setup = Callable[[int], Callable[[], Any]]
+
+def _synthetic(readme_kb: float = 4, commits: int = 100, repos: int = 20) -> Tuple[SyntheticGitHub, str]:
+    """A synthetic account where every repository has exactly the given sizes"""
+    data = SyntheticGitHub(SimulatorSettings(
+        repos_max=repos, readme_max_kb=readme_kb, commits_max=commits, whale_prefix=""
+    ))
+    return data, "bench"
+
+def _analyzer() -> AnalyzerService:
+    # The pure analysis methods never touch GitHub
+    return AnalyzerService(github_service=None)
+
+def _analyzed_repositories(count: int) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """A user and `count` repositories analyzed by AnalyzerService from synthetic data"""
+    data, login = _synthetic(readme_kb=4, commits=50, repos=count)
+    analyzer = _analyzer()
+    repositories = []
+    for index in range(count):
+        repo_data = data.repo(login, index)
+        languages = data.languages(repo_data)
+        doc_analysis = analyzer._analyze_documentation(data.readme(repo_data).decode("utf-8"), repo_data)
+        repositories.append(analyzer.build_analysis(
+            repo_data, doc_analysis, languages, data.commits(repo_data, 0, 50), fetch_status={}
+        ))
+    return data.user(login), repositories
+
+def _setup_documentation(readme_kb: int) -> Callable[[], Any]:
+    data, login = _synthetic(readme_kb=readme_kb)
+    repo_data = data.repo(login, 0)
+    readme = data.readme(repo_data).decode("utf-8")
+    analyzer = _analyzer()
+    return lambda: analyzer._analyze_documentation(readme, repo_data)
+
+def _setup_activity(commits: int) -> Callable[[], Any]:
+    data, login = _synthetic(commits=commits)
+    repo_data = data.repo(login, 0)
+    history = data.commits(repo_data, 0, commits)
+    analyzer = _analyzer()
+    return lambda: analyzer._analyze_activity(history, repo_data)
+
+def _setup_portfolio_score(repos: int) -> Callable[[], Any]:
+    user_data, repositories = _analyzed_repositories(repos)
+    calculator = ScoreCalculator()
+    return lambda: calculator.calculate_portfolio_score(user_data, repositories)
+
+def _setup_review(repos: int) -> Callable[[], Any]:
+    user_data, repositories = _analyzed_repositories(repos)
+    portfolio_score = ScoreCalculator().calculate_portfolio_score(user_data, repositories)
+    simulator = RecruiterSimulator()
+    return lambda: simulator.simulate_review(user_data, repositories, portfolio_score)
+
+def _setup_roadmap(repos: int) -> Callable[[], Any]:
+    user_data, repositories = _analyzed_repositories(repos)
+    portfolio_score = ScoreCalculator().calculate_portfolio_score(user_data, repositories)
+    generator = RoadmapGenerator()
+    return lambda: generator.generate_roadmap(portfolio_score, repositories)
+
+BENCHMARKS: Dict[str, Tuple[str, Setup]] = {
+    "analyze_documentation": ("readme_kb", _setup_documentation),
+    "analyze_activity": ("commits", _setup_activity),
+    "calculate_portfolio_score": ("repos", _setup_portfolio_score),
+    "simulate_review": ("repos", _setup_review),
+    "generate_roadmap": ("repos", _setup_roadmap),
+}
+
+def time_call(call: Callable[[], Any], min_time: float, repeat: int) -> float:
+    """Best nanoseconds per call over `repeat` rounds of at least `min_time` seconds each"""
+    # Double the batch until one round is long enough to time reliably
+    loops = 1
+    while True:
+        started = time.perf_counter_ns()
+        for _ in range(loops):
+            call()
+        elapsed = time.perf_counter_ns() - started
+        if elapsed >= min_time * 1e9:
+            break
+        loops *= 2
+    
+    best = elapsed / loops
+    for _ in range(repeat - 1):
+        started = time.perf_counter_ns()
+        for _ in range(loops):
+            call()
+        best = min(best, (time.perf_counter_ns() - started) / loops)
+    return best
+
+def measure_allocations(call: Callable[[], Any], calls: int = 3) -> Dict[str, int]:
+    """Peak bytes allocated during one call and bytes it leaves allocated, both traced by tracemalloc"""
+    call()  # warm caches so they are not charged to the call
+    tracemalloc.start()
+    try:
+        peaks, retained = [], []
+        for _ in range(calls):
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            result = call()
+            after, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+            retained.append(after - before)
+            del result
+    finally:
+        tracemalloc.stop()
+    return {"alloc_peak_bytes": min(peaks), "alloc_result_bytes": min(retained)}
+
+def growth_exponent(points: List[Dict[str, Any]]) -> Optional[float]:
+    """Least-squares slope of log(ns/op) against log(size): 1 is linear, 2 quadratic
+    
+    Only the larger half of the sizes is fitted, where fixed per-call costs no
+    longer hide how the work grows.
+    """
+    points = sorted(points, key=lambda p: p["size"])[-max(3, len(points) // 2):]
+    pairs = [(math.log(p["size"]), math.log(p["ns_per_op"])) for p in points if p["size"] > 0 and p["ns_per_op"] > 0]
+    if len(pairs) < 2:
+        return None
+    mean_x = sum(x for x, _ in pairs) / len(pairs)
+    mean_y = sum(y for _, y in pairs) / len(pairs)
+    spread = sum((x - mean_x) ** 2 for x, _ in pairs)
+    if not spread:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in pairs) / spread
+
+def run_benchmark(name: str, sizes: List[int], args: argparse.Namespace) -> Dict[str, Any]:
+    """Time one function across input sizes and fit its growth"""
+    unit, setup = BENCHMARKS[name]
+    points = []
+    for size in sizes:
+        # Recruiter personalities are picked at random; keep every run the same
+        random.seed(args.seed)
+        call = setup(size)
+        points.append({
+            "size": size,
+            "ns_per_op": round(time_call(call, args.min_time, args.repeat)),
+            **measure_allocations(call)
+        })
+    
+    exponent = growth_exponent(points)
+    limit = EXPECTED_EXPONENT[name] + args.exponent_tolerance
+    return {
+        "name": name,
+        "unit": unit,
+        "points": points,
+        "growth_exponent": None if exponent is None else round(exponent, 3),
+        "expected_exponent": EXPECTED_EXPONENT[name],
+        "superlinear": exponent is not None and exponent > limit
+    }
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """List sizes whose ns/op or peak allocation grew beyond `tolerance` since the baseline"""
+    previous = {
+        (benchmark["name"], point["size"]): point
+        for benchmark in baseline.get("benchmarks", []) for point in benchmark["points"]
+    }
+    regressions = []
+    for benchmark in results["benchmarks"]:
+        for point in benchmark["points"]:
+            before = previous.get((benchmark["name"], point["size"]))
+            if before is None:
+                continue
+            for metric in ("ns_per_op", "alloc_peak_bytes"):
+                old, new = before.get(metric), point.get(metric)
+                if old and new is not None and (new - old) / old > tolerance:
+                    regressions.append(
+                        f"{benchmark['name']} {benchmark['unit']}={point['size']}: "
+                        f"{metric} {old} -> {new} ({(new - old) / old:+.1%})"
+                    )
+    return regressions
+
+def _report(benchmark: Dict[str, Any]) -> None:
+    """Print one benchmark as a small table"""
+    exponent = benchmark["growth_exponent"]
+    flag = "  SUPERLINEAR" if benchmark["superlinear"] else ""
+    print(f"{benchmark['name']} (growth n^{exponent if exponent is not None else '?'}){flag}")
+    for point in benchmark["points"]:
+        print(
+            f"  {benchmark['unit']}={point['size']:<6} {point['ns_per_op']:>14,} ns/op "
+            f"{point['alloc_peak_bytes']:>12,} B peak {point['alloc_result_bytes']:>10,} B result"
+        )
+
+def main() -> None:
+    """Micro-benchmark the scoring functions: python -m app.microbench --only analyze_documentation"""
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for the pure analysis and scoring functions")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), default=sorted(BENCHMARKS))
+    parser.add_argument("--min-time", type=float, default=0.1, help="seconds per timing round")
+    parser.add_argument("--repeat", type=int, default=5, help="timing rounds; the fastest counts")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--exponent-tolerance", type=float, default=0.25,
+                        help="growth above the expected exponent by more than this is flagged")
+    parser.add_argument("--output", default="microbench_results.json")
+    parser.add_argument("--baseline", default=None, help="earlier results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed regression, as a fraction")
+    args = parser.parse_args()
+    
+    benchmarks = []
+    for name in args.only:
+        benchmark = run_benchmark(name, SIZES[name], args)
+        _report(benchmark)
+        benchmarks.append(benchmark)
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "settings": {"min_time": args.min_time, "repeat": args.repeat, "seed": args.seed},
+        },
+        "benchmarks": benchmarks,
+    }
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+    
+    failures = [f"{b['name']} grows as n^{b['growth_exponent']}" for b in benchmarks if b["superlinear"]]
+    if args.baseline:
+        with open(args.baseline) as f:
+            failures += compare(results, json.load(f), args.tolerance)
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    if failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
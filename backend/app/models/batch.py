@@ -0,0 +1,6 @@
+from typing import List
+from pydantic import BaseModel
+
+class BatchAnalysisRequest(BaseModel):
+    """Request body for analyzing many profiles at once"""
+    usernames: List[str]
@@ -0,0 +1,8 @@
+from typing import Optional
+from pydantic import BaseModel, Field
+
+class AnalysisJobRequest(BaseModel):
+    """Request body for queueing a profile analysis"""
+    username: str
+    max_age: Optional[int] = Field(None, ge=0)
+    force_refresh: bool = False
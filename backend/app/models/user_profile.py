@@ -1,6 +1,6 @@
 from typing import Dict, List, Any, Optional
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 class UserProfile(BaseModel):
     """User profile model"""
@@ -10,7 +10,11 @@ class UserProfile(BaseModel):
     score: Dict[str, Any]
     recruiter_feedback: Dict[str, Any]
     roadmap: Dict[str, Any]
-    analyzed_at: datetime = datetime.now()
+    analyzed_at: datetime = Field(default_factory=datetime.now)
+    # False when the deadline cut fetches short or GitHub failed to answer some of them
+    complete: bool = True
+    status: str = "complete"  # or "degraded"
+    incomplete_repositories: List[str] = Field(default_factory=list)
     
     class Config:
         schema_extra = {
@@ -0,0 +1,84 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict
+
+from .exceptions import ServerOverloaded
+from ..config import Config
+from ..utils.deadline import current_deadline
+
+class AdmissionController:
+    """Bounds the analyses running at once, queueing a few more and shedding the rest"""
+    
+    # Weight of the latest run in the average run time
+    SMOOTHING = 0.2
+    
+    def __init__(self, max_active: int = None, queue_size: int = None, queue_timeout: float = None):
+        self.max_active = max(1, max_active or Config.ADMISSION_MAX_ACTIVE)
+        self.queue_size = queue_size if queue_size is not None else Config.ADMISSION_QUEUE_MAX
+        self.queue_timeout = queue_timeout or Config.ADMISSION_QUEUE_TIMEOUT
+        self._slots = asyncio.Semaphore(self.max_active)
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.shed = 0
+        self.timed_out = 0
+        # Smoothed seconds per analysis, for Retry-After estimates
+        self.average_run = 5.0
+    
+    def retry_after(self) -> int:
+        """Estimate when a slot should be free for a request shed now"""
+        return max(round(self.average_run * (self.waiting + 1) / self.max_active), 1)
+    
+    async def _queue(self) -> None:
+        """Wait for a slot to free up, or shed the request if the queue is full or it takes too long"""
+        if self.waiting >= self.queue_size:
+            self.shed += 1
+            raise ServerOverloaded("Too many analyses in progress, retry later", self.retry_after())
+        
+        # Queueing never outlasts the request's own deadline
+        timeout = self.queue_timeout
+        deadline = current_deadline()
+        if deadline is not None:
+            timeout = min(timeout, deadline.remaining())
+        
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise ServerOverloaded("No analysis slot freed up in time, retry later", self.retry_after())
+        finally:
+            self.waiting -= 1
+    
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one analysis slot, raising ServerOverloaded if none frees up in time"""
+        if self._slots.locked():
+            await self._queue()
+        else:
+            await self._slots.acquire()
+        
+        self.active += 1
+        self.admitted += 1
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started
+            self.average_run += self.SMOOTHING * (elapsed - self.average_run)
+            self.active -= 1
+            self._slots.release()
+    
+    def stats(self) -> Dict[str, float]:
+        """Return admission counters"""
+        return {
+            "active": self.active,
+            "max_active": self.max_active,
+            "queued": self.waiting,
+            "queue_size": self.queue_size,
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "timed_out": self.timed_out,
+            "average_run_seconds": round(self.average_run, 2)
+        }
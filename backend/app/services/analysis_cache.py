@@ -0,0 +1,52 @@
+import copy
+from typing import Dict, Any, Optional
+
+from .cache_service import CacheBackend, MemoryCache, TieredCache
+from ..config import Config
+
+class RepoAnalysisCache:
+    """Finished repository analyses, valid while the repository is unchanged"""
+    
+    def __init__(self, cache: Optional[CacheBackend] = None, ttl: int = None):
+        self.cache = cache or TieredCache("repo", MemoryCache(Config.REPO_ANALYSIS_CACHE_MAX_ENTRIES))
+        self.ttl = ttl if ttl is not None else Config.REPO_ANALYSIS_CACHE_TTL
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def make_key(repo_data: Dict[str, Any]) -> Optional[str]:
+        """Key an analysis on the listing fields that change whenever its inputs do"""
+        # pushed_at moves with the code; updated_at also moves with stars, forks and description
+        full_name = repo_data.get("full_name")
+        pushed_at = repo_data.get("pushed_at")
+        updated_at = repo_data.get("updated_at")
+        if not full_name or not (pushed_at or updated_at):
+            return None
+        return f"{full_name}|{pushed_at or ''}|{updated_at or ''}"
+    
+    def get(self, repo_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached analysis for an unchanged repository"""
+        key = self.make_key(repo_data)
+        # Entries expire after the TTL: activity fields such as
+        # days_since_last_commit age even without a push
+        analysis = self.cache.get(key) if key else None
+        if analysis is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return copy.deepcopy(analysis)
+    
+    def store(self, repo_data: Dict[str, Any], analysis: Dict[str, Any]) -> None:
+        """Remember a finished analysis for the repository's current state"""
+        key = self.make_key(repo_data)
+        if key is None:
+            return
+        self.cache.set(key, copy.deepcopy(analysis), ttl=self.ttl)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return cache counters"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "storage": self.cache.stats()
+        }
@@ -1,26 +1,107 @@
-from typing import Dict, List, Any
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
-import re
+import asyncio
+import logging
 
 from .github_service import GitHubService
+from .exceptions import DeadlineExceeded, GitHubAPIError, RateLimitExceeded
+from .readme_scanner import ReadmeScanner
+from .fetch_planner import FetchPlan, FetchPlanner
+from .analysis_cache import RepoAnalysisCache
 from ..config import Config
+from ..utils.deadline import current_deadline
+
+logger = logging.getLogger(__name__)
+
+# Called with (repositories analyzed, repositories to analyze) as work completes
+ProgressCallback = Callable[[int, int], None]
+# Called with each repository analysis as soon as it is ready
+ResultCallback = Callable[[Dict[str, Any]], None]
 
 class AnalyzerService:
-    def __init__(self):
-        self.github_service = GitHubService()
+    def __init__(self, github_service: GitHubService, planner: Optional[FetchPlanner] = None,
+                 cache: Optional[RepoAnalysisCache] = None):
+        self.github_service = github_service
+        self.planner = planner or FetchPlanner()
+        self.cache = cache or RepoAnalysisCache()
+    
+    async def analyze_repositories(
+        self, repositories: List[Dict[str, Any]],
+        progress: Optional[ProgressCallback] = None,
+        on_result: Optional[ResultCallback] = None
+    ) -> List[Dict[str, Any]]:
+        """Analyze repositories concurrently, preserving input order"""
+        semaphore = asyncio.Semaphore(max(1, Config.ANALYSIS_CONCURRENCY))
+        done = 0
+        
+        async def analyze(repo_data: Dict[str, Any]) -> Dict[str, Any]:
+            nonlocal done
+            try:
+                async with semaphore:
+                    result = await self.analyze_repository(repo_data)
+                if on_result:
+                    on_result(result)
+                return result
+            finally:
+                done += 1
+                if progress:
+                    progress(done, len(tasks))
+        
+        tasks = [asyncio.ensure_future(analyze(repo)) for repo in repositories]
+        if progress:
+            progress(0, len(tasks))
+        
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        # An exhausted rate limit fails the whole analysis rather than silently thinning it
+        for result in results:
+            if isinstance(result, RateLimitExceeded):
+                raise result
+        
+        # Any other failing repository is dropped without affecting the others
+        analyzed_repos = []
+        for repo, result in zip(repositories, results):
+            if isinstance(result, BaseException):
+                logger.warning("Skipping repository %s: %s", repo.get("full_name"), result)
+                continue
+            analyzed_repos.append(result)
+        return analyzed_repos
     
     async def analyze_repository(self, repo_data: Dict[str, Any]) -> Dict[str, Any]:
         """Perform comprehensive analysis on a single repository"""
+        # Repositories unchanged since their last analysis cost no GitHub calls at all
+        cached = self.cache.get(repo_data)
+        if cached is not None:
+            return cached
+        
+        analysis = await self._analyze_repository(repo_data)
+        # Partial and degraded analyses are retried next time, not remembered
+        if analysis["complete"]:
+            self.cache.store(repo_data, analysis)
+        return analysis
+    
+    async def _analyze_repository(self, repo_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch and analyze a single repository"""
         username = repo_data["owner"]["login"]
         repo_name = repo_data["name"]
         
-        # Fetch additional data
-        readme_content = await self.github_service.get_readme_content(username, repo_name)
-        languages = await self.github_service.get_languages(username, repo_name)
-        commits = await self.github_service.get_commits(username, repo_name)
+        # Fetch only the additional data the listing cannot answer, in parallel
+        plan = self.planner.plan(repo_data)
+        fetched, fetch_status = await self._fetch_planned(plan, username, repo_name)
+        languages, commits = fetched["languages"], fetched["commits"]
+        complete = all(status in ("complete", "skipped") for status in fetch_status.values())
+        if complete:
+            self.planner.record_fetched(repo_data)
         
-        # Analyze documentation
-        doc_analysis = self._analyze_documentation(readme_content, repo_data)
+        # Documentation is analyzed while the README streams in
+        doc_analysis = fetched["readme"] or self._analyze_documentation("", repo_data)
+        return self.build_analysis(repo_data, doc_analysis, languages, commits, fetch_status)
+    
+    def build_analysis(self, repo_data: Dict[str, Any], doc_analysis: Dict[str, Any],
+                       languages: Dict[str, int], commits: List[Dict[str, Any]],
+                       fetch_status: Dict[str, str]) -> Dict[str, Any]:
+        """Analyze a repository from data already fetched, returning its per-repository result"""
+        complete = all(status in ("complete", "skipped") for status in fetch_status.values())
         
         # Analyze code structure (simplified for now)
         code_analysis = self._analyze_code_structure(repo_data, languages)
@@ -34,7 +115,7 @@ class AnalyzerService:
         )
         
         return {
-            "name": repo_name,
+            "name": repo_data["name"],
             "full_name": repo_data["full_name"],
             "description": repo_data["description"],
             "url": repo_data["html_url"],
@@ -49,12 +130,98 @@ class AnalyzerService:
             "activity_analysis": activity_analysis,
             "score": repo_score,
             "strengths": self._identify_strengths(repo_data, doc_analysis, activity_analysis),
-            "weaknesses": self._identify_weaknesses(repo_data, doc_analysis, activity_analysis)
+            "weaknesses": self._identify_weaknesses(repo_data, doc_analysis, activity_analysis),
+            "fetch_status": fetch_status,
+            "complete": complete,
+            "status": "complete" if complete else "degraded"
         }
     
+    async def _fetch_planned(self, plan: FetchPlan, username: str,
+                             repo_name: str) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """Run the planned fetches in parallel, abandoning those the request deadline cuts off
+        
+        Returns the fetched values and, per endpoint, whether it is complete,
+        skipped by the plan, timed_out, or degraded because GitHub failed.
+        """
+        fetchers = {
+            "readme": self._fetch_documentation,
+            "languages": self.github_service.get_languages,
+            "commits": self.github_service.get_commits
+        }
+        revalidate = not plan.reuse_stored
+        
+        # Skipped endpoints take the value GitHub would have answered with
+        fetched = {"readme": None, "languages": {}, "commits": []}
+        fetch_status = {endpoint: "skipped" for endpoint in plan.skipped}
+        
+        # Scoring needs a moment after the fetches, so they stop a little early
+        deadline = current_deadline()
+        timeout = deadline.remaining(Config.DEADLINE_SCORING_RESERVE) if deadline else None
+        if timeout == 0:
+            fetch_status.update({endpoint: "timed_out" for endpoint in plan.fetch})
+            return fetched, fetch_status
+        
+        tasks = {
+            endpoint: asyncio.ensure_future(fetchers[endpoint](username, repo_name, revalidate=revalidate))
+            for endpoint in plan.fetch
+        }
+        try:
+            if tasks:
+                await asyncio.wait(tasks.values(), timeout=timeout)
+        finally:
+            for task in tasks.values():
+                task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        
+        for endpoint, task in tasks.items():
+            if task.cancelled() or isinstance(task.exception(), DeadlineExceeded):
+                fetch_status[endpoint] = "timed_out"
+                continue
+            error = task.exception()
+            if isinstance(error, GitHubAPIError) and not isinstance(error, RateLimitExceeded):
+                # Scored as an empty answer, but flagged instead of silently zeroing the repository
+                logger.warning("Fetching %s for %s/%s failed: %s", endpoint, username, repo_name, error)
+                fetch_status[endpoint] = "degraded"
+                continue
+            if error is not None:
+                raise error
+            fetched[endpoint] = task.result()
+            failed = endpoint == "readme" and task.result().get("readme_error")
+            fetch_status[endpoint] = "degraded" if failed else "complete"
+        return fetched, fetch_status
+    
+    async def _fetch_documentation(self, username: str, repo_name: str,
+                                   revalidate: bool = True) -> Dict:
+        """Stream the README through the documentation detectors"""
+        scanner = ReadmeScanner()
+        try:
+            readme = await self.github_service.stream_readme(
+                username, repo_name, scanner.feed, revalidate=revalidate
+            )
+        except (RateLimitExceeded, DeadlineExceeded):
+            raise
+        except GitHubAPIError as e:
+            doc_analysis = self._score_documentation(ReadmeScanner())
+            doc_analysis.update({"readme_truncated": False, "readme_error": str(e)})
+            return doc_analysis
+        
+        doc_analysis = self._score_documentation(scanner)
+        doc_analysis.update({
+            "readme_size_bytes": readme["size"],
+            "readme_truncated": readme["truncated"],
+            "readme_error": None
+        })
+        return doc_analysis
+    
     def _analyze_documentation(self, readme_content: str, repo_data: Dict) -> Dict:
         """Analyze README and documentation quality"""
-        if not readme_content:
+        scanner = ReadmeScanner()
+        scanner.feed(readme_content)
+        return self._score_documentation(scanner)
+    
+    def _score_documentation(self, scanner: ReadmeScanner) -> Dict:
+        """Score documentation quality from README detector results"""
+        if not scanner.length:
             return {
                 "has_readme": False,
                 "readme_length": 0,
@@ -65,16 +232,17 @@ class AnalyzerService:
             }
         
         # Check for key sections
-        has_setup = bool(re.search(r"(install|setup|getting started)", readme_content, re.I))
-        has_examples = bool(re.search(r"(example|usage|demo)", readme_content, re.I))
-        has_badges = bool(re.search(r"!\[.*\]\(.*\)", readme_content))
-        has_api_docs = bool(re.search(r"(api|endpoint|route)", readme_content, re.I))
+        flags = scanner.close()
+        has_setup = flags["has_setup_instructions"]
+        has_examples = flags["has_examples"]
+        has_badges = flags["has_badges"]
+        has_api_docs = flags["has_api_documentation"]
         
         # Calculate quality score
         quality_score = 0
-        if len(readme_content) > 500:
+        if scanner.length > 500:
             quality_score += 30
-        elif len(readme_content) > 200:
+        elif scanner.length > 200:
             quality_score += 15
         
         if has_setup:
@@ -88,7 +256,7 @@ class AnalyzerService:
         
         return {
             "has_readme": True,
-            "readme_length": len(readme_content),
+            "readme_length": scanner.length,
             "has_setup_instructions": has_setup,
             "has_examples": has_examples,
             "has_badges": has_badges,
@@ -0,0 +1,72 @@
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from .portfolio_service import PortfolioService
+from .exceptions import CircuitOpen, GitHubAPIError, RateLimitExceeded, ServerOverloaded, client_error
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+class BatchAnalysis:
+    """Analyzes many profiles under a concurrency limit shared by every batch in the process"""
+    
+    def __init__(self, portfolio: PortfolioService, limiter: asyncio.Semaphore):
+        self.portfolio = portfolio
+        self.limiter = limiter
+        self.workers = max(1, Config.BATCH_CONCURRENCY)
+        # While GitHub's budget is exhausted, the rest of the batch fails fast instead of queueing
+        self.blocked_until = 0.0
+    
+    async def run(self, usernames: List[str]) -> AsyncIterator[Dict[str, Any]]:
+        """Yield one result line per username, in completion order"""
+        pending = list(reversed(usernames))
+        results: asyncio.Queue = asyncio.Queue()
+        
+        async def work() -> None:
+            while pending:
+                username = pending.pop()
+                results.put_nowait(await self._analyze(username))
+        
+        workers = [asyncio.ensure_future(work()) for _ in range(min(self.workers, len(usernames)))]
+        try:
+            for _ in usernames:
+                yield await results.get()
+        finally:
+            # A client that disconnects takes the rest of the batch with it
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+    
+    async def _analyze(self, username: str) -> Dict[str, Any]:
+        """Analyze one profile, reporting failure as an error line"""
+        if time.monotonic() < self.blocked_until:
+            return self._error(username, "GitHub rate limit exhausted, retry later", 503)
+        try:
+            async with self.limiter:
+                profile = await self.portfolio.analyze(username)
+            return {"username": username, "status": "ok", "result": profile}
+        except RateLimitExceeded as e:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + e.retry_after)
+            return self._error(username, str(e), 503)
+        except (ServerOverloaded, CircuitOpen) as e:
+            return self._error(username, str(e), 503, retry_after=e.retry_after)
+        except GitHubAPIError as e:
+            status_code, detail = client_error(e, e.status_code or 502)
+            # Rejected tokens are probed again after the reprobe interval
+            retry_after = Config.GITHUB_TOKEN_REPROBE_INTERVAL if e.status_code in (401, 403) else None
+            return self._error(username, detail, status_code, retry_after=retry_after)
+        except Exception as e:
+            logger.warning("Batch analysis of %s failed: %s", username, e)
+            return self._error(username, str(e), 500)
+    
+    def _error(self, username: str, message: str, status_code: int,
+               retry_after: Optional[float] = None) -> Dict[str, Any]:
+        """Build an inline error line"""
+        line = {"username": username, "status": "error", "error": message, "status_code": status_code}
+        if status_code == 503:
+            if retry_after is None:
+                retry_after = self.blocked_until - time.monotonic()
+            line["retry_after"] = max(round(retry_after), 1)
+        return line
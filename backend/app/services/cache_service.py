@@ -0,0 +1,319 @@
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, Optional, Tuple
+
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+# A stored value and the epoch time it expires at (None: never)
+CacheEntry = Tuple[Any, Optional[float]]
+
+def _encode(value: Any) -> Any:
+    """Serialize the non-JSON types cached results contain"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot cache value of type {type(value).__name__}")
+
+def serialize(value: Any) -> str:
+    """Encode a cache value as compact JSON"""
+    return json.dumps(value, default=_encode, separators=(",", ":"))
+
+def _expires_at(ttl: Optional[float]) -> Optional[float]:
+    """Turn a TTL in seconds into an absolute expiry time"""
+    return time.time() + ttl if ttl is not None else None
+
+class CacheBackend:
+    """Interface implemented by every cache tier"""
+    
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        """Return the live value and expiry for a key, or None"""
+        raise NotImplementedError
+    
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a JSON-serializable value, optionally expiring after `ttl` seconds"""
+        raise NotImplementedError
+    
+    def delete(self, key: str) -> None:
+        """Remove a key if present"""
+        raise NotImplementedError
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return tier counters"""
+        raise NotImplementedError
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return the live value for a key, or None"""
+        entry = self.get_entry(key)
+        return entry[0] if entry else None
+
+class MemoryCache(CacheBackend):
+    """In-process LRU bounded by entry count and serialized size"""
+    
+    def __init__(self, max_entries: int = None, max_bytes: int = None):
+        self.max_entries = max_entries or Config.CACHE_MEMORY_MAX_ENTRIES
+        self.max_bytes = max_bytes or Config.CACHE_MEMORY_MAX_BYTES
+        # key -> (value, expires_at, size in bytes)
+        self._entries: "OrderedDict[str, Tuple[Any, Optional[float], int]]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        value, expires_at, _ = entry
+        if expires_at is not None and expires_at <= time.time():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value, expires_at
+    
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self.put(key, value, _expires_at(ttl), len(serialize(value)))
+    
+    def put(self, key: str, value: Any, expires_at: Optional[float], size: int) -> None:
+        """Store a value whose expiry and serialized size are already known"""
+        self._remove(key)
+        if size > self.max_bytes:
+            # One oversized value would flush everything else
+            return
+        self._entries[key] = (value, expires_at, size)
+        self.bytes += size
+        while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+    
+    def delete(self, key: str) -> None:
+        self._remove(key)
+    
+    def _remove(self, key: str) -> None:
+        """Drop a key and its byte accounting"""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[2]
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
+
+class SQLiteCache(CacheBackend):
+    """On-disk store in WAL mode, shared by every worker on the host and kept across restarts
+    
+    Writes are queued to a dedicated writer thread with its own connection,
+    so waiting on another worker's write lock never blocks the event loop.
+    Reads use a separate connection; in WAL mode they do not wait for
+    writers, and a read that still finds the database locked is a miss.
+    """
+    
+    # Expired rows are purged every this many writes
+    PURGE_INTERVAL = 500
+    # Seconds a read may wait on a lock before it counts as a miss
+    READ_TIMEOUT = 0.05
+    
+    def __init__(self, path: str = None, max_pending: int = None):
+        self.path = path or Config.CACHE_SQLITE_PATH
+        self._writer_db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=5)
+        # WAL lets readers in other workers proceed while one worker writes
+        self._writer_db.execute("PRAGMA journal_mode=WAL")
+        self._writer_db.execute("PRAGMA synchronous=NORMAL")
+        self._writer_db.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL, stored_at REAL NOT NULL)"
+        )
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None, timeout=self.READ_TIMEOUT
+        )
+        self._writes: "queue.Queue[Optional[Tuple]]" = queue.Queue(
+            max_pending or Config.CACHE_SQLITE_MAX_PENDING_WRITES
+        )
+        self._writer = threading.Thread(target=self._write_loop, name="sqlite-cache-writer", daemon=True)
+        self._writer.start()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.writes = 0
+        self.dropped_writes = 0
+        self.failed_writes = 0
+    
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is not None and row[1] is not None and row[1] <= time.time():
+            self._enqueue(("delete", key))
+            self.evictions += 1
+            row = None
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0]), row[1]
+    
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self.put(key, serialize(value), _expires_at(ttl))
+    
+    def put(self, key: str, payload: str, expires_at: Optional[float]) -> None:
+        """Queue an already-serialized value for writing"""
+        self._enqueue(("put", key, payload, expires_at))
+    
+    def delete(self, key: str) -> None:
+        self._enqueue(("delete", key))
+    
+    def _enqueue(self, operation: Tuple) -> None:
+        """Hand a write to the writer thread, dropping it when the backlog is full"""
+        try:
+            self._writes.put_nowait(operation)
+        except queue.Full:
+            # Losing a cache write only costs warm state
+            self.dropped_writes += 1
+    
+    def _write_loop(self) -> None:
+        """Apply queued writes until close() sends the stop marker"""
+        while True:
+            operation = self._writes.get()
+            try:
+                if operation is None:
+                    return
+                self._apply(operation)
+            except sqlite3.Error as e:
+                self.failed_writes += 1
+                logger.warning("Cache write to %s failed: %s", self.path, e)
+            finally:
+                self._writes.task_done()
+    
+    def _apply(self, operation: Tuple) -> None:
+        """Run one queued write on the writer connection"""
+        if operation[0] == "delete":
+            self._writer_db.execute("DELETE FROM cache WHERE key = ?", (operation[1],))
+            return
+        _, key, payload, expires_at = operation
+        self._writer_db.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires_at, stored_at) VALUES (?, ?, ?, ?)",
+            (key, payload, expires_at, time.time())
+        )
+        self.writes += 1
+        if self.writes % self.PURGE_INTERVAL == 0:
+            purged = self._writer_db.execute(
+                "DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),)
+            )
+            self.evictions += purged.rowcount
+    
+    def flush(self) -> None:
+        """Block until every queued write has been applied"""
+        self._writes.join()
+    
+    def close(self) -> None:
+        """Apply pending writes, stop the writer thread and close both connections"""
+        self._writes.put(None)
+        self._writer.join()
+        self._writer_db.close()
+        with self._lock:
+            self._db.close()
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        return {
+            "path": self.path,
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "writes": self.writes,
+            "pending_writes": self._writes.qsize(),
+            "dropped_writes": self.dropped_writes,
+            "failed_writes": self.failed_writes
+        }
+
+class TieredCache(CacheBackend):
+    """Memory LRU in front of an optional shared on-disk store, for one key namespace"""
+    
+    def __init__(self, namespace: str, memory: Optional[MemoryCache] = None,
+                 disk: Optional[SQLiteCache] = None):
+        self.namespace = namespace
+        self.memory = memory or MemoryCache()
+        self.disk = disk
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+    
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        entry = self.memory.get_entry(key)
+        if entry is not None:
+            self.memory_hits += 1
+            return entry
+        
+        if self.disk is not None:
+            try:
+                entry = self.disk.get_entry(f"{self.namespace}:{key}")
+            except sqlite3.Error as e:
+                logger.warning("Cache read from %s failed: %s", self.disk.path, e)
+            if entry is not None:
+                # Promote, keeping the expiry the entry was written with
+                value, expires_at = entry
+                self.memory.put(key, value, expires_at, len(serialize(value)))
+                self.disk_hits += 1
+                return entry
+        
+        self.misses += 1
+        return None
+    
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        payload = serialize(value)
+        expires_at = _expires_at(ttl)
+        self.memory.put(key, value, expires_at, len(payload))
+        if self.disk is not None:
+            try:
+                self.disk.put(f"{self.namespace}:{key}", payload, expires_at)
+            except sqlite3.Error as e:
+                # A locked or full disk store only costs warm state, never the request
+                logger.warning("Cache write to %s failed: %s", self.disk.path, e)
+    
+    def delete(self, key: str) -> None:
+        self.memory.delete(key)
+        if self.disk is not None:
+            try:
+                self.disk.delete(f"{self.namespace}:{key}")
+            except sqlite3.Error as e:
+                logger.warning("Cache delete from %s failed: %s", self.disk.path, e)
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "memory": self.memory.stats()
+        }
+
+def create_cache_store() -> Optional[SQLiteCache]:
+    """Open the shared on-disk cache tier, or None when it is disabled"""
+    if not Config.CACHE_SQLITE_PATH:
+        return None
+    try:
+        return SQLiteCache(Config.CACHE_SQLITE_PATH)
+    except sqlite3.Error as e:
+        logger.warning("On-disk cache at %s unavailable, using memory only: %s", Config.CACHE_SQLITE_PATH, e)
+        return None
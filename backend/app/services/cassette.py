@@ -0,0 +1,177 @@
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import os
+import random
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlencode
+
+import httpx
+
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+RECORD = "record"
+REPLAY = "replay"
+
+# Dropped when recording: the stored body is already decoded and its length may differ
+_HOP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "set-cookie"}
+
+# Dropped from recorded requests so every answer is a full body, never a 304
+_CONDITIONAL_HEADERS = ("if-none-match", "if-modified-since")
+
+def interaction_key(request: httpx.Request) -> str:
+    """Identify a request independently of header order, query order and credentials"""
+    url = request.url
+    query = urlencode(sorted(url.params.multi_items()))
+    key = f"{request.method} {url.scheme}://{url.host}{url.path}?{query} accept={request.headers.get('accept', '')}"
+    if request.content:
+        key += f" body={hashlib.sha1(request.content).hexdigest()}"
+    return key
+
+def _encode_body(body: bytes) -> Dict[str, str]:
+    """Store a body as text when it is UTF-8, base64 otherwise"""
+    try:
+        return {"body": body.decode("utf-8"), "encoding": "utf-8"}
+    except UnicodeDecodeError:
+        return {"body": base64.b64encode(body).decode("ascii"), "encoding": "base64"}
+
+def _decode_body(interaction: Dict[str, Any]) -> bytes:
+    """Recover the recorded body bytes"""
+    if interaction["encoding"] == "base64":
+        return base64.b64decode(interaction["body"])
+    return interaction["body"].encode("utf-8")
+
+def load_cassette(path: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Read a gzipped cassette into recorded responses per interaction key"""
+    if not os.path.exists(path):
+        return {}
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return json.load(f)["interactions"]
+
+def save_cassette(path: str, interactions: Dict[str, List[Dict[str, Any]]]) -> None:
+    """Write a gzipped cassette atomically"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary = f"{path}.tmp"
+    with gzip.open(temporary, "wt", encoding="utf-8") as f:
+        json.dump({"version": 1, "interactions": interactions}, f, separators=(",", ":"))
+    os.replace(temporary, path)
+
+class CassetteTransport(httpx.AsyncBaseTransport):
+    """Records real GitHub responses to a cassette, or serves them back offline
+    
+    In record mode requests go through `inner` and each response, with its
+    status and headers, is stored; the cassette is written when the
+    transport closes. In replay mode nothing touches the network: recorded
+    responses are served in order per request, with optional injected
+    latency, jitter and errors. Unrecorded requests get a 404.
+    """
+    
+    def __init__(self, mode: str, path: str, inner: Optional[httpx.AsyncBaseTransport] = None,
+                 latency: float = None, jitter: float = None, error_rate: float = None,
+                 seed: Optional[int] = None):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown cassette mode {mode!r}, expected 'record' or 'replay'")
+        self.mode = mode
+        self.path = path
+        self.inner = inner or httpx.AsyncHTTPTransport()
+        self.latency = latency if latency is not None else Config.REPLAY_LATENCY
+        self.jitter = jitter if jitter is not None else Config.REPLAY_JITTER
+        self.error_rate = error_rate if error_rate is not None else Config.REPLAY_ERROR_RATE
+        # Seeded, so injected latency and errors repeat exactly between benchmark runs
+        self._random = random.Random(seed if seed is not None else Config.REPLAY_SEED)
+        self.interactions = load_cassette(path)
+        self._next: Dict[str, int] = defaultdict(int)
+        self._recorded: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self.hits = 0
+        self.misses = 0
+        self.injected_errors = 0
+    
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        if self.mode == RECORD:
+            return await self._record(request)
+        return await self._replay(request)
+    
+    async def _record(self, request: httpx.Request) -> httpx.Response:
+        """Forward a request and keep its full response"""
+        for header in _CONDITIONAL_HEADERS:
+            request.headers.pop(header, None)
+        response = await self.inner.handle_async_request(request)
+        try:
+            body = await response.aread()
+        finally:
+            await response.aclose()
+        
+        headers = [(name, value) for name, value in response.headers.items() if name.lower() not in _HOP_HEADERS]
+        self._recorded[interaction_key(request)].append({
+            "status": response.status_code,
+            "headers": headers,
+            "recorded_at": time.time(),
+            **_encode_body(body)
+        })
+        return httpx.Response(response.status_code, headers=headers, content=body, request=request)
+    
+    async def _replay(self, request: httpx.Request) -> httpx.Response:
+        """Serve the next recorded response for a request"""
+        delay = self.latency + self._random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.injected_errors += 1
+            return httpx.Response(502, json={"message": "Injected replay failure"}, request=request)
+        
+        key = interaction_key(request)
+        recorded = self.interactions.get(key)
+        if not recorded:
+            self.misses += 1
+            logger.warning("No recorded response for %s", key)
+            return httpx.Response(404, json={"message": "Not Found (not in cassette)"}, request=request)
+        
+        # Repeated requests walk through their recordings, then keep serving the last one
+        index = self._next[key]
+        self._next[key] = index + 1
+        interaction = recorded[min(index, len(recorded) - 1)]
+        self.hits += 1
+        return httpx.Response(
+            interaction["status"],
+            headers=self._shift_rate_limit(interaction),
+            content=_decode_body(interaction),
+            request=request
+        )
+    
+    def _shift_rate_limit(self, interaction: Dict[str, Any]) -> List[List[str]]:
+        """Move the recorded rate-limit reset time to the same distance from now"""
+        headers = []
+        for name, value in interaction["headers"]:
+            if name.lower() == "x-ratelimit-reset":
+                value = str(int(float(value) - interaction["recorded_at"] + time.time()))
+            headers.append([name, value])
+        return headers
+    
+    async def aclose(self) -> None:
+        if self.mode == RECORD:
+            # Merge into the existing cassette; re-recorded requests replace older takes
+            merged = {**self.interactions, **self._recorded}
+            save_cassette(self.path, merged)
+            logger.info("Recorded %d requests to %s", sum(len(v) for v in self._recorded.values()), self.path)
+        await self.inner.aclose()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return replay counters"""
+        return {
+            "mode": self.mode,
+            "path": self.path,
+            "interactions": len(self.interactions),
+            "hits": self.hits,
+            "misses": self.misses,
+            "injected_errors": self.injected_errors
+        }
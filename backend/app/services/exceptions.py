@@ -0,0 +1,52 @@
+from typing import Optional, Tuple
+
+class GitHubAPIError(Exception):
+    """Raised when a GitHub API request fails"""
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+class RateLimitExceeded(GitHubAPIError):
+    """Raised when the GitHub rate limit cannot be waited out within the allowed time"""
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message, status_code=429)
+        self.retry_after = retry_after
+
+class DeadlineExceeded(GitHubAPIError):
+    """Raised when a request's time budget runs out before GitHub could answer"""
+    def __init__(self, message: str):
+        super().__init__(message, status_code=504)
+
+class CircuitOpen(GitHubAPIError):
+    """Raised without calling GitHub while an endpoint's circuit breaker is open"""
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message, status_code=503)
+        self.retry_after = retry_after
+
+# Reported instead of GitHub's wording when GitHub refuses the service's own tokens
+CREDENTIALS_UNAVAILABLE = "GitHub credentials are unavailable, retry later"
+
+def client_error(error: GitHubAPIError, default_status: int = 500) -> Tuple[int, str]:
+    """Status code and detail to show API clients for a GitHub failure
+    
+    An unknown user is a 404. A 401 or 403 means GitHub rejected the
+    service's credentials, which is not the caller's fault: it becomes a 503
+    whose detail never repeats what GitHub said.
+    """
+    if error.status_code == 404:
+        return 404, "GitHub user not found"
+    if error.status_code in (401, 403):
+        return 503, CREDENTIALS_UNAVAILABLE
+    return default_status, str(error)
+
+class JobQueueFull(Exception):
+    """Raised when the analysis job queue cannot take another job"""
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class ServerOverloaded(Exception):
+    """Raised when admission control sheds an analysis under load"""
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
@@ -0,0 +1,95 @@
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+from ..config import Config
+
+class FetchPlan:
+    """Per-repository decision on which GitHub endpoints to call"""
+    
+    ENDPOINTS = ("readme", "languages", "commits")
+    
+    def __init__(self):
+        self.fetch = list(self.ENDPOINTS)
+        self.skipped: Dict[str, str] = {}
+        # Unchanged repositories are answered from stored responses without a request
+        self.reuse_stored = False
+    
+    def skip(self, endpoint: str, reason: str) -> None:
+        """Drop an endpoint whose answer is already known from the listing"""
+        if endpoint in self.fetch:
+            self.fetch.remove(endpoint)
+            self.skipped[endpoint] = reason
+
+class FetchPlanner:
+    """Decides which per-repo endpoints ScoreCalculator's inputs actually need"""
+    
+    def __init__(self, max_entries: int = None):
+        self.max_entries = max_entries or Config.FETCH_PLANNER_MAX_REPOS
+        # pushed_at of each repository as of its last complete fetch
+        self._fetched_at: "OrderedDict[str, str]" = OrderedDict()
+        self.planned = 0
+        self.calls_skipped = 0
+        self.repos_reused = 0
+    
+    def plan(self, repo_data: Dict[str, Any]) -> FetchPlan:
+        """Plan the calls needed for one repository from its listing entry"""
+        plan = FetchPlan()
+        self.planned += 1
+        pushed_at = repo_data.get("pushed_at")
+        
+        # README, languages and commits only change on push
+        if pushed_at and self._fetched_at.get(repo_data.get("full_name")) == pushed_at:
+            plan.reuse_stored = True
+            self.repos_reused += 1
+            return plan
+        
+        if self._is_empty(repo_data):
+            # Nothing was ever pushed: no README, no languages, and /commits answers 409
+            plan.skip("readme", "empty repository")
+            plan.skip("languages", "empty repository")
+            plan.skip("commits", "empty repository")
+        elif repo_data.get("language") is None and not repo_data.get("size"):
+            plan.skip("languages", "no detected language")
+        
+        self.calls_skipped += len(plan.skipped)
+        return plan
+    
+    def record_fetched(self, repo_data: Dict[str, Any]) -> None:
+        """Remember the pushed_at a repository's endpoints were last fetched at"""
+        full_name = repo_data.get("full_name")
+        pushed_at = repo_data.get("pushed_at")
+        if not full_name or not pushed_at:
+            return
+        self._fetched_at[full_name] = pushed_at
+        self._fetched_at.move_to_end(full_name)
+        while len(self._fetched_at) > self.max_entries:
+            self._fetched_at.popitem(last=False)
+    
+    def _is_empty(self, repo_data: Dict[str, Any]) -> bool:
+        """Check whether a repository has never received a push
+        
+        GitHub sets pushed_at to created_at when an empty repository is
+        created, and older listings leave it null. Size 0 alone is not enough:
+        auto-initialized repositories report it despite a README and a commit.
+        """
+        if repo_data.get("size"):
+            return False
+        pushed_at = self._parse(repo_data.get("pushed_at"))
+        created_at = self._parse(repo_data.get("created_at"))
+        return pushed_at is None or (created_at is not None and pushed_at <= created_at)
+    
+    @staticmethod
+    def _parse(timestamp: Optional[str]) -> Optional[datetime]:
+        """Parse a GitHub ISO 8601 timestamp"""
+        if not timestamp:
+            return None
+        return datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    
+    def stats(self) -> Dict[str, int]:
+        """Return planner counters"""
+        return {
+            "repositories_planned": self.planned,
+            "calls_skipped": self.calls_skipped,
+            "repositories_reused": self.repos_reused
+        }
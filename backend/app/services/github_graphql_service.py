@@ -0,0 +1,308 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Callable, Dict, List, Any, Optional
+import httpx
+
+from .github_service import GitHubService
+from .response_cache import ResponseCache
+from .rate_limiter import RateLimitScheduler
+from .token_pool import TokenPool
+from .resilience import ResiliencePolicy
+from .exceptions import GitHubAPIError
+from ..config import Config
+
+# README candidates probed in a single query; the REST /readme endpoint resolves these server-side
+README_EXPRESSIONS = {
+    "readmeUpper": "HEAD:README.md",
+    "readmeLower": "HEAD:readme.md",
+    "readmeTitle": "HEAD:Readme.md",
+    "readmePlain": "HEAD:README",
+    "readmeRst": "HEAD:README.rst",
+}
+
+COMMITS_PER_REPO = 30  # same page size as the REST commits call
+
+PROFILE_QUERY = """
+query($login: String!, $cursor: String, $pageSize: Int!, $commitCount: Int!, $since: DateTime!) {
+  user(login: $login) {
+    login
+    name
+    bio
+    avatarUrl
+    url
+    createdAt
+    updatedAt
+    followers { totalCount }
+    following { totalCount }
+    contributionsCollection(from: $since) {
+      totalCommitContributions
+      totalIssueContributions
+      totalPullRequestContributions
+      totalPullRequestReviewContributions
+      totalRepositoryContributions
+    }
+    publicRepositories: repositories(privacy: PUBLIC, ownerAffiliations: OWNER) { totalCount }
+    repositories(first: $pageSize, after: $cursor, privacy: PUBLIC, ownerAffiliations: OWNER,
+                 orderBy: {field: UPDATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        nameWithOwner
+        description
+        url
+        stargazerCount
+        forkCount
+        diskUsage
+        createdAt
+        updatedAt
+        pushedAt
+        isFork
+        isArchived
+        hasIssuesEnabled
+        hasProjectsEnabled
+        hasWikiEnabled
+        owner { login }
+        primaryLanguage { name }
+        openIssues: issues(states: OPEN) { totalCount }
+        languages(first: 20, orderBy: {field: SIZE, direction: DESC}) {
+          edges { size node { name } }
+        }
+%(readme_fields)s
+        defaultBranchRef {
+          target {
+            ... on Commit {
+              history(first: $commitCount) {
+                nodes {
+                  oid
+                  message
+                  url
+                  author { name email date }
+                  committer { name email date }
+                  committedDate
+                }
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+""" % {
+    "readme_fields": "\n".join(
+        f'        {alias}: object(expression: "{expression}") {{ ... on Blob {{ byteSize text }} }}'
+        for alias, expression in README_EXPRESSIONS.items()
+    )
+}
+
+class GitHubGraphQLService(GitHubService):
+    """GitHubService backed by batched GraphQL v4 queries instead of per-repo REST calls"""
+    
+    def __init__(self, client: Optional[httpx.AsyncClient] = None,
+                 cache: Optional[ResponseCache] = None,
+                 scheduler: Optional[RateLimitScheduler] = None,
+                 token_pool: Optional[TokenPool] = None,
+                 resilience: Optional[ResiliencePolicy] = None):
+        # GraphQL POSTs are not cacheable; the cache only serves REST fallbacks
+        super().__init__(client, cache, scheduler, token_pool, resilience)
+        self.graphql_url = Config.GITHUB_GRAPHQL_URL
+        # Per-instance snapshots, so one analysis never sees another's data
+        self._snapshots: Dict[str, asyncio.Task] = {}
+        self._repo_data: Dict[str, Dict[str, Any]] = {}
+    
+    async def _query(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute a GraphQL query and return its data payload"""
+        try:
+            # Read-only queries are as safe to retry as a GET
+            response = await self._request(
+                "POST", self.graphql_url, resource="graphql", idempotent=True,
+                json={"query": query, "variables": variables}
+            )
+            response.raise_for_status()
+            payload = response.json()
+        except httpx.HTTPStatusError as e:
+            raise GitHubAPIError(f"GitHub API error: {str(e)}", e.response.status_code)
+        except httpx.HTTPError as e:
+            raise GitHubAPIError(f"GitHub API error: {str(e)}")
+        
+        data = payload.get("data") or {}
+        errors = payload.get("errors")
+        if errors:
+            messages = "; ".join(error.get("message", "unknown error") for error in errors)
+            # An unknown login comes back as a NOT_FOUND error next to a null user; REST answers it with 404
+            not_found = any(error.get("type") == "NOT_FOUND" for error in errors) or (
+                "user" in data and data["user"] is None
+            )
+            raise GitHubAPIError(f"GitHub API error: {messages}", 404 if not_found else None)
+        return data
+    
+    async def _fetch_snapshot(self, username: str) -> Dict[str, Any]:
+        """Fetch the user and their repositories, following pagination cursors up to MAX_REPOS_TO_LIST"""
+        since = (datetime.now(timezone.utc) - timedelta(days=90)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        user = None
+        repositories = []
+        cursor = None
+        
+        while True:
+            data = await self._query(PROFILE_QUERY, {
+                "login": username,
+                "cursor": cursor,
+                "pageSize": Config.GRAPHQL_PAGE_SIZE,
+                "commitCount": COMMITS_PER_REPO,
+                "since": since
+            })
+            user = data.get("user")
+            if user is None:
+                raise GitHubAPIError(f"GitHub API error: user '{username}' not found", 404)
+            
+            page = user["repositories"]
+            for node in page["nodes"]:
+                self._drop_oversized_readmes(node)
+            repositories.extend(page["nodes"])
+            # Same ceiling as the REST listing, so both backends see the same repositories
+            if not page["pageInfo"]["hasNextPage"] or len(repositories) >= Config.MAX_REPOS_TO_LIST:
+                break
+            cursor = page["pageInfo"]["endCursor"]
+        
+        repositories = repositories[:Config.MAX_REPOS_TO_LIST]
+        for node in repositories:
+            self._repo_data[node["nameWithOwner"].lower()] = node
+        return {"user": user, "repositories": repositories}
+    
+    @staticmethod
+    def _drop_oversized_readmes(node: Dict[str, Any]) -> None:
+        """Release README text over README_MAX_BYTES; stream_readme reads those over REST instead"""
+        for alias in README_EXPRESSIONS:
+            blob = node.get(alias)
+            if blob and (blob.get("byteSize") or 0) > Config.README_MAX_BYTES:
+                node[alias] = {"byteSize": blob["byteSize"], "text": None}
+    
+    async def _snapshot(self, username: str) -> Dict[str, Any]:
+        """Return the fetched snapshot, sharing one fetch between concurrent callers"""
+        key = username.lower()
+        if key not in self._snapshots:
+            self._snapshots[key] = asyncio.ensure_future(self._fetch_snapshot(username))
+        return await self._snapshots[key]
+    
+    def _cached_repo(self, username: str, repo_name: str) -> Optional[Dict[str, Any]]:
+        """Look up a repository node fetched by a previous snapshot"""
+        return self._repo_data.get(f"{username}/{repo_name}".lower())
+    
+    async def get_user_profile(self, username: str) -> Dict[str, Any]:
+        """Fetch user profile information"""
+        user = (await self._snapshot(username))["user"]
+        contributions = user["contributionsCollection"]
+        total_contributions = (
+            contributions["totalCommitContributions"] +
+            contributions["totalIssueContributions"] +
+            contributions["totalPullRequestContributions"] +
+            contributions["totalPullRequestReviewContributions"] +
+            contributions["totalRepositoryContributions"]
+        )
+        
+        return {
+            "login": user["login"],
+            "name": user["name"],
+            "bio": user["bio"],
+            "public_repos": user["publicRepositories"]["totalCount"],
+            "followers": user["followers"]["totalCount"],
+            "following": user["following"]["totalCount"],
+            "created_at": user["createdAt"],
+            "updated_at": user["updatedAt"],
+            "avatar_url": user["avatarUrl"],
+            "html_url": user["url"],
+            # The REST backend counts one page of 30 recent events
+            "recent_activity": min(total_contributions, 30),
+            # Contribution counts arrive with the profile, so activity is never degraded here
+            "fetch_status": {"events": "complete"}
+        }
+    
+    async def iter_repositories(self, username: str,
+                                limit: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield public repositories in the REST listing shape"""
+        snapshot = await self._snapshot(username)
+        for node in snapshot["repositories"][:limit]:
+            yield self._to_rest_repository(node)
+    
+    async def stream_readme(self, username: str, repo_name: str,
+                            consumer: Callable[[str], None],
+                            revalidate: bool = True) -> Dict[str, Any]:
+        """Feed README text from the batched query, capped at README_MAX_BYTES"""
+        node = self._cached_repo(username, repo_name)
+        if node is None:
+            return await super().stream_readme(username, repo_name, consumer, revalidate)
+        
+        for alias in README_EXPRESSIONS:
+            blob = node.get(alias)
+            if blob and (blob.get("byteSize") or 0) > Config.README_MAX_BYTES:
+                # Oversized blobs were dropped from the snapshot; the REST stream stops at the cap
+                return await super().stream_readme(username, repo_name, consumer, revalidate)
+            if blob and blob.get("text") is not None:
+                data = blob["text"].encode("utf-8")
+                truncated = len(data) > Config.README_MAX_BYTES
+                consumer(data[:Config.README_MAX_BYTES].decode("utf-8", errors="ignore"))
+                return {"found": True, "size": len(data), "truncated": truncated}
+        return {"found": False, "size": 0, "truncated": False}
+    
+    async def get_languages(self, username: str, repo_name: str,
+                            revalidate: bool = True) -> Dict[str, int]:
+        """Return language byte counts from the batched query"""
+        node = self._cached_repo(username, repo_name)
+        if node is None:
+            return await super().get_languages(username, repo_name, revalidate)
+        
+        return {
+            edge["node"]["name"]: edge["size"]
+            for edge in (node.get("languages") or {}).get("edges", [])
+        }
+    
+    async def get_commits(self, username: str, repo_name: str,
+                          revalidate: bool = True) -> List[Dict[str, Any]]:
+        """Return default-branch history from the batched query in the REST shape"""
+        node = self._cached_repo(username, repo_name)
+        if node is None:
+            return await super().get_commits(username, repo_name, revalidate)
+        
+        branch = node.get("defaultBranchRef")
+        if not branch or not branch.get("target"):
+            # Empty repository: REST answers 409 and the service returns no commits
+            return []
+        
+        return [
+            {
+                "sha": commit["oid"],
+                "html_url": commit.get("url"),
+                "commit": {
+                    "message": commit["message"],
+                    "author": commit.get("author") or {},
+                    "committer": {
+                        **(commit.get("committer") or {}),
+                        "date": commit["committedDate"]
+                    }
+                }
+            }
+            for commit in branch["target"]["history"]["nodes"]
+        ]
+    
+    def _to_rest_repository(self, node: Dict[str, Any]) -> Dict[str, Any]:
+        """Map a GraphQL repository node onto the fields of the REST listing"""
+        return {
+            "name": node["name"],
+            "full_name": node["nameWithOwner"],
+            "owner": {"login": node["owner"]["login"]},
+            "description": node["description"],
+            "html_url": node["url"],
+            "stargazers_count": node["stargazerCount"],
+            "forks_count": node["forkCount"],
+            "open_issues_count": node["openIssues"]["totalCount"],
+            "created_at": node["createdAt"],
+            "updated_at": node["updatedAt"],
+            "pushed_at": node["pushedAt"],
+            "language": (node.get("primaryLanguage") or {}).get("name"),
+            "size": node["diskUsage"] or 0,
+            "fork": node["isFork"],
+            "archived": node["isArchived"],
+            "has_issues": node["hasIssuesEnabled"],
+            "has_projects": node["hasProjectsEnabled"],
+            "has_wiki": node["hasWikiEnabled"]
+        }
@@ -1,28 +1,205 @@
+import asyncio
+import codecs
+import weakref
 import httpx
-from typing import Dict, List, Any
+from typing import AsyncIterator, Callable, Dict, List, Any, Optional
 from ..config import Config
+from ..utils.deadline import Deadline, current_deadline
+from .http_client import create_github_client
+from .response_cache import ResponseCache
+from .rate_limiter import RateLimitScheduler, token_key
+from .token_pool import TokenPool
+from .resilience import CircuitBreaker, ResiliencePolicy, TRANSIENT_STATUSES, endpoint_name
+from .exceptions import DeadlineExceeded, GitHubAPIError, RateLimitExceeded
+
+RAW_MEDIA_TYPE = "application/vnd.github.raw"
+
+# One in-flight limiter per event loop, shared by every GitHubService instance
+_in_flight_limits: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+def _global_limit() -> asyncio.Semaphore:
+    """Return the process-wide GitHub in-flight semaphore for the running loop"""
+    loop = asyncio.get_running_loop()
+    semaphore = _in_flight_limits.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max(1, Config.GITHUB_MAX_IN_FLIGHT))
+        _in_flight_limits[loop] = semaphore
+    return semaphore
 
 class GitHubService:
-    def __init__(self):
+    def __init__(self, client: Optional[httpx.AsyncClient] = None,
+                 cache: Optional[ResponseCache] = None,
+                 scheduler: Optional[RateLimitScheduler] = None,
+                 token_pool: Optional[TokenPool] = None,
+                 resilience: Optional[ResiliencePolicy] = None):
         self.base_url = Config.GITHUB_API_BASE_URL
         self.headers = {
-            "Authorization": f"token {Config.GITHUB_TOKEN}",
             "Accept": "application/vnd.github.v3+json"
         }
-        self.client = httpx.AsyncClient(headers=self.headers, timeout=30.0)
+        # The application injects its shared pool; standalone use gets a private client
+        self._owns_client = client is None
+        self.client = client or create_github_client()
+        self.cache = cache
+        self.scheduler = scheduler or RateLimitScheduler()
+        self.token_pool = token_pool or TokenPool(Config.GITHUB_TOKENS, self.scheduler)
+        self.resilience = resilience or ResiliencePolicy()
+    
+    async def _request(self, method: str, url: str,
+                       headers: Optional[Dict[str, str]] = None,
+                       resource: str = "core", stream: bool = False,
+                       idempotent: Optional[bool] = None, **kwargs) -> httpx.Response:
+        """Issue a request under its endpoint's circuit breaker, retrying transient failures
+        
+        Idempotent requests (GETs unless stated otherwise) that fail with a
+        connection error or a 5xx are retried with jittered exponential
+        backoff while the shared retry budget and the deadline allow; the
+        last failure is then returned or raised, and counts once against the
+        endpoint's circuit breaker. With stream=True the body
+        of a successful response is left unread and the caller must close
+        the response.
+        """
+        if idempotent is None:
+            idempotent = method == "GET"
+        breaker = self.resilience.breaker(endpoint_name(url))
+        deadline = current_deadline()
+        self.resilience.budget.deposit()
+        attempt = 0
+        while True:
+            breaker.check()
+            try:
+                response = await self._send(method, url, headers, resource, stream, **kwargs)
+            except httpx.TransportError:
+                delay = self._retry_delay(breaker, attempt, deadline, idempotent)
+                if delay is None:
+                    breaker.record_failure()
+                    raise
+            else:
+                if response.status_code not in TRANSIENT_STATUSES:
+                    breaker.record_success()
+                    return response
+                delay = self._retry_delay(breaker, attempt, deadline, idempotent)
+                if delay is None:
+                    breaker.record_failure()
+                    return response
+                await response.aclose()
+            await asyncio.sleep(delay)
+            attempt += 1
+    
+    def _retry_delay(self, breaker: CircuitBreaker, attempt: int,
+                     deadline: Optional[Deadline], idempotent: bool) -> Optional[float]:
+        """Backoff before retrying a failed attempt, or None to give up"""
+        # A half-open probe reports its outcome at once; its own breaker would reject the retry
+        if not idempotent or breaker.state == CircuitBreaker.HALF_OPEN:
+            return None
+        return self.resilience.retry_delay(attempt, deadline)
+    
+    async def _send(self, method: str, url: str, headers: Optional[Dict[str, str]],
+                    resource: str, stream: bool, **kwargs) -> httpx.Response:
+        """Send one request through the token pool, rate-limit scheduler and in-flight limit"""
+        request_headers = {**self.headers, **(headers or {})}
+        deadline = current_deadline()
+        for attempt in range(Config.RATE_LIMIT_MAX_RETRIES + len(self.token_pool.tokens)):
+            # No single call may outlive the request's time budget
+            if deadline is not None:
+                if deadline.expired:
+                    raise DeadlineExceeded("Request deadline reached before GitHub answered")
+                kwargs["timeout"] = min(Config.GITHUB_TIMEOUT, deadline.remaining())
+            
+            token = self.token_pool.select(resource)
+            key = token_key(token)
+            if token:
+                request_headers["Authorization"] = f"token {token}"
+            
+            await self.scheduler.acquire(key, resource)
+            response = None
+            try:
+                async with _global_limit():
+                    request = self.client.build_request(method, url, headers=request_headers, **kwargs)
+                    response = await self.client.send(request, stream=stream)
+                    # Error bodies are small and needed to classify rate limits
+                    if stream and response.status_code in (401, 403, 429):
+                        await response.aread()
+            except asyncio.CancelledError:
+                self.scheduler.cancelled += 1
+                raise
+            except httpx.TimeoutException:
+                if deadline is not None and deadline.expired:
+                    raise DeadlineExceeded("Request deadline reached before GitHub answered")
+                raise
+            finally:
+                self.scheduler.release(key, response, resource)
+            
+            # A rejected token is sidelined and the request moves to the next one
+            if response.status_code == 401 and token:
+                self.token_pool.revoke(token)
+                continue
+            if token:
+                self.token_pool.restore(token)
+            
+            # Rate-limited requests are retried once the scheduler lets them through again
+            if not self.scheduler.is_rate_limited(response):
+                return response
+        
+        # Bad credentials are a configuration problem, not a quota one
+        if response.status_code == 401:
+            raise GitHubAPIError("GitHub rejected every configured token", 401)
+        raise RateLimitExceeded(
+            "GitHub rate limit exceeded",
+            retry_after=self.scheduler.budget(key, resource).snapshot()["blocked_for"]
+        )
+    
+    async def _get(self, url: str, params: Optional[Dict[str, Any]] = None,
+                   revalidate: bool = True) -> httpx.Response:
+        """Issue a GET request against the REST API, revalidating cached bodies
+        
+        With revalidate=False a stored body is returned without any request,
+        for callers that know the resource has not changed. A 202 raises
+        GitHubAPIError: its empty body is not an answer.
+        """
+        if self.cache is None:
+            return self._ready(await self._request("GET", url, params=params))
+        
+        cache_key = self.cache.make_key(url, params, self.headers["Accept"])
+        entry = self.cache.get(cache_key)
+        if entry is not None and not revalidate:
+            return self.cache.reuse(entry, httpx.Request("GET", url, params=params))
+        
+        response = self._ready(await self._request(
+            "GET", url, params=params, headers=self.cache.conditional_headers(entry)
+        ))
+        
+        # A 304 does not count against the rate limit and reuses the stored body
+        if response.status_code == 304 and entry is not None:
+            return self.cache.replay(entry, response)
+        self.cache.store(cache_key, response)
+        return response
+    
+    def _ready(self, response: httpx.Response) -> httpx.Response:
+        """Reject a 202, which GitHub sends while it is still computing the answer"""
+        if response.status_code == 202:
+            raise GitHubAPIError(f"GitHub is still computing {response.request.url.path}, retry later", 202)
+        return response
     
     async def get_user_profile(self, username: str) -> Dict[str, Any]:
         """Fetch user profile information"""
+        async def fetch_events() -> Optional[List[Dict[str, Any]]]:
+            # Activity is secondary: without it the profile is still scored, marked degraded
+            try:
+                return await self.get_user_events(username)
+            except (RateLimitExceeded, DeadlineExceeded):
+                raise
+            except GitHubAPIError:
+                return None
+        
         try:
-            response = await self.client.get(
-                f"{self.base_url}/users/{username}"
+            # Fetch the profile and contribution data in parallel
+            response, events = await asyncio.gather(
+                self._get(f"{self.base_url}/users/{username}"),
+                fetch_events()
             )
             response.raise_for_status()
             data = response.json()
             
-            # Get additional contribution data
-            events = await self.get_user_events(username)
-            
             return {
                 "login": data["login"],
                 "name": data["name"],
@@ -34,90 +211,202 @@ class GitHubService:
                 "updated_at": data["updated_at"],
                 "avatar_url": data["avatar_url"],
                 "html_url": data["html_url"],
-                "recent_activity": len(events) if events else 0
+                "recent_activity": len(events) if events else 0,
+                "fetch_status": {"events": "complete" if events is not None else "degraded"}
             }
+        except httpx.HTTPStatusError as e:
+            raise GitHubAPIError(f"GitHub API error: {str(e)}", e.response.status_code)
         except httpx.HTTPError as e:
-            raise Exception(f"GitHub API error: {str(e)}")
+            raise GitHubAPIError(f"GitHub API error: {str(e)}")
     
-    async def get_repositories(self, username: str) -> List[Dict[str, Any]]:
+    async def get_repositories(self, username: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """Fetch all public repositories for a user"""
+        return [repo async for repo in self.iter_repositories(username, limit)]
+    
+    async def iter_repositories(self, username: str,
+                                limit: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield public repositories as pages arrive, following Link headers"""
+        limit = min(limit or Config.MAX_REPOS_TO_LIST, Config.MAX_REPOS_TO_LIST)
+        params = {"sort": "updated", "per_page": min(Config.REPOS_PER_PAGE, limit)}
+        page = asyncio.ensure_future(self._get_page(f"{self.base_url}/users/{username}/repos", params))
+        yielded = 0
         try:
-            response = await self.client.get(
-                f"{self.base_url}/users/{username}/repos",
-                params={"sort": "updated", "per_page": 100}
-            )
+            while page is not None:
+                response = await page
+                page = None
+                repos = response.json()
+                
+                # Prefetch the next page while the caller works through this one
+                next_url = response.links.get("next", {}).get("url")
+                if next_url and yielded + len(repos) < limit:
+                    page = asyncio.ensure_future(self._get_page(next_url))
+                
+                for repo in repos:
+                    yield repo
+                    yielded += 1
+                    if yielded >= limit:
+                        return
+        finally:
+            if page is not None:
+                page.cancel()
+    
+    async def _get_page(self, url: str, params: Optional[Dict[str, Any]] = None) -> httpx.Response:
+        """Fetch one page of a paginated listing"""
+        try:
+            response = await self._get(url, params=params)
             response.raise_for_status()
-            return response.json()
+            return response
+        except httpx.HTTPStatusError as e:
+            raise GitHubAPIError(f"GitHub API error: {str(e)}", e.response.status_code)
         except httpx.HTTPError as e:
-            raise Exception(f"GitHub API error: {str(e)}")
+            raise GitHubAPIError(f"GitHub API error: {str(e)}")
     
     async def get_repository_details(self, username: str, repo_name: str) -> Dict[str, Any]:
         """Fetch detailed repository information"""
         try:
-            response = await self.client.get(
+            response = await self._get(
                 f"{self.base_url}/repos/{username}/{repo_name}"
             )
             response.raise_for_status()
             return response.json()
+        except httpx.HTTPStatusError as e:
+            raise GitHubAPIError(f"GitHub API error: {str(e)}", e.response.status_code)
         except httpx.HTTPError as e:
-            raise Exception(f"GitHub API error: {str(e)}")
+            raise GitHubAPIError(f"GitHub API error: {str(e)}")
     
-    async def get_readme_content(self, username: str, repo_name: str) -> str:
-        """Fetch README content for a repository"""
+    async def get_readme_content(self, username: str, repo_name: str,
+                                 revalidate: bool = True) -> str:
+        """Fetch README content for a repository, capped at README_MAX_BYTES"""
+        chunks = []
+        await self.stream_readme(username, repo_name, chunks.append, revalidate)
+        return "".join(chunks)
+    
+    async def stream_readme(self, username: str, repo_name: str,
+                            consumer: Callable[[str], None],
+                            revalidate: bool = True) -> Dict[str, Any]:
+        """Stream the raw README into consumer, stopping at README_MAX_BYTES
+        
+        Returns whether a README was found, its size in bytes and whether it
+        was truncated. Failures other than a missing README raise GitHubAPIError.
+        """
+        url = f"{self.base_url}/repos/{username}/{repo_name}/readme"
+        cache_key = self.cache.make_key(url, None, RAW_MEDIA_TYPE) if self.cache else None
+        entry = self.cache.get(cache_key) if self.cache else None
+        if entry is not None and not revalidate:
+            self.cache.reused += 1
+            consumer(entry["content"])
+            return dict(entry["readme"])
+        
+        headers = {"Accept": RAW_MEDIA_TYPE}
+        if self.cache:
+            headers.update(self.cache.conditional_headers(entry))
         try:
-            response = await self.client.get(
-                f"{self.base_url}/repos/{username}/{repo_name}/readme"
-            )
+            response = await self._request("GET", url, headers=headers, stream=True)
+        except httpx.HTTPError as e:
+            raise GitHubAPIError(f"GitHub API error: {str(e)}")
+        
+        try:
+            if response.status_code == 304 and entry is not None:
+                self.cache.hits += 1
+                consumer(entry["content"])
+                return dict(entry["readme"])
             if response.status_code == 404:
-                return ""
-            
-            response.raise_for_status()
-            data = response.json()
+                return {"found": False, "size": 0, "truncated": False}
+            if response.status_code >= 400:
+                await response.aread()
+                response.raise_for_status()
             
-            # Decode content from base64
-            import base64
-            content = base64.b64decode(data["content"]).decode("utf-8")
-            return content
-        except:
-            return ""
-    
-    async def get_languages(self, username: str, repo_name: str) -> Dict[str, int]:
+            # Decode incrementally so multi-byte characters split across chunks survive
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            limit = Config.README_MAX_BYTES
+            received = 0
+            truncated = False
+            kept = []
+            async for chunk in response.aiter_bytes():
+                if received + len(chunk) > limit:
+                    chunk = chunk[:limit - received]
+                    truncated = True
+                received += len(chunk)
+                text = decoder.decode(chunk)
+                consumer(text)
+                kept.append(text)
+                if truncated:
+                    break
+            text = decoder.decode(b"", final=True)
+            consumer(text)
+            kept.append(text)
+        except httpx.HTTPStatusError as e:
+            raise GitHubAPIError(f"GitHub API error: {str(e)}", e.response.status_code)
+        except httpx.HTTPError as e:
+            raise GitHubAPIError(f"GitHub API error: {str(e)}")
+        finally:
+            await response.aclose()
+        
+        # Size in decoded bytes; Content-Length counts the compressed body when GitHub compresses it
+        size = received
+        if truncated and "content-encoding" not in response.headers and "content-length" in response.headers:
+            size = max(int(response.headers["content-length"]), received)
+        readme = {"found": True, "size": size, "truncated": truncated}
+        if self.cache:
+            self.cache.store_text(cache_key, response, "".join(kept), readme=readme)
+        return readme
+    
+    async def get_languages(self, username: str, repo_name: str,
+                            revalidate: bool = True) -> Dict[str, int]:
         """Fetch languages used in a repository"""
         try:
-            response = await self.client.get(
-                f"{self.base_url}/repos/{username}/{repo_name}/languages"
+            response = await self._get(
+                f"{self.base_url}/repos/{username}/{repo_name}/languages",
+                revalidate=revalidate
             )
+            # A repository that is gone or was never pushed to has no languages
+            if response.status_code in (404, 409):
+                return {}
             response.raise_for_status()
             return response.json()
-        except:
-            return {}
+        except httpx.HTTPStatusError as e:
+            raise GitHubAPIError(f"GitHub API error: {str(e)}", e.response.status_code)
+        except httpx.HTTPError as e:
+            raise GitHubAPIError(f"GitHub API error: {str(e)}")
     
-    async def get_commits(self, username: str, repo_name: str) -> List[Dict[str, Any]]:
+    async def get_commits(self, username: str, repo_name: str,
+                          revalidate: bool = True) -> List[Dict[str, Any]]:
         """Fetch recent commits for a repository"""
         try:
-            response = await self.client.get(
+            response = await self._get(
                 f"{self.base_url}/repos/{username}/{repo_name}/commits",
-                params={"per_page": 30}
+                params={"per_page": 30},
+                revalidate=revalidate
             )
+            # GitHub answers 409 for a repository without commits
+            if response.status_code in (404, 409):
+                return []
             response.raise_for_status()
             return response.json()
-        except:
-            return []
+        except httpx.HTTPStatusError as e:
+            raise GitHubAPIError(f"GitHub API error: {str(e)}", e.response.status_code)
+        except httpx.HTTPError as e:
+            raise GitHubAPIError(f"GitHub API error: {str(e)}")
     
     async def get_user_events(self, username: str) -> List[Dict[str, Any]]:
         """Fetch user events for activity analysis"""
         try:
-            response = await self.client.get(
+            response = await self._get(
                 f"{self.base_url}/users/{username}/events",
                 params={"per_page": 30}
             )
+            if response.status_code == 404:
+                return []
             response.raise_for_status()
             return response.json()
-        except:
-            return []
+        except httpx.HTTPStatusError as e:
+            raise GitHubAPIError(f"GitHub API error: {str(e)}", e.response.status_code)
+        except httpx.HTTPError as e:
+            raise GitHubAPIError(f"GitHub API error: {str(e)}")
     
     async def __aenter__(self):
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.client.aclose()
\ No newline at end of file
+        if self._owns_client:
+            await self.client.aclose()
\ No newline at end of file
@@ -0,0 +1,47 @@
+import logging
+from typing import Optional
+import httpx
+from ..config import Config
+from .cassette import CassetteTransport
+
+logger = logging.getLogger(__name__)
+
+def _http2_available() -> bool:
+    """Check whether the optional h2 package is installed"""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def create_github_client(transport: Optional[httpx.AsyncBaseTransport] = None) -> httpx.AsyncClient:
+    """Create the pooled HTTP client shared by all GitHub requests
+    
+    A given transport replaces the network, e.g. with an in-process GitHub
+    stand-in for benchmarks.
+    """
+    http2 = Config.GITHUB_HTTP2 and _http2_available()
+    if Config.GITHUB_HTTP2 and not http2:
+        logger.warning("HTTP/2 requested but h2 is not installed, using HTTP/1.1")
+    
+    # The client only talks to the GitHub API host, so pool limits are per host
+    limits = httpx.Limits(
+        max_connections=Config.GITHUB_MAX_CONNECTIONS,
+        max_keepalive_connections=Config.GITHUB_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=Config.GITHUB_KEEPALIVE_EXPIRY
+    )
+    if transport is None and Config.GITHUB_CASSETTE_MODE:
+        # Record through the same pooled transport a live client would use
+        transport = CassetteTransport(
+            Config.GITHUB_CASSETTE_MODE,
+            Config.GITHUB_CASSETTE_PATH,
+            httpx.AsyncHTTPTransport(limits=limits, http2=http2)
+        )
+        logger.info("GitHub calls %s cassette %s", Config.GITHUB_CASSETTE_MODE, Config.GITHUB_CASSETTE_PATH)
+    return httpx.AsyncClient(
+        headers={"Accept": "application/vnd.github.v3+json"},
+        timeout=Config.GITHUB_TIMEOUT,
+        limits=limits,
+        http2=http2,
+        transport=transport
+    )
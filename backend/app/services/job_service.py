@@ -0,0 +1,197 @@
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+from .exceptions import (
+    CircuitOpen, GitHubAPIError, JobQueueFull, RateLimitExceeded, ServerOverloaded, client_error
+)
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+class AnalysisJob:
+    """One queued profile analysis and its outcome"""
+    
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    
+    def __init__(self, key: Hashable, username: str,
+                 runner: Callable[["AnalysisJob"], Awaitable[Dict[str, Any]]]):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.username = username
+        self.runner = runner
+        self.status = self.QUEUED
+        self.repos_done = 0
+        self.repos_total = 0
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        # HTTP status the synchronous endpoint would have answered the failure with
+        self.status_code: Optional[int] = None
+        self.retry_after: Optional[float] = None
+        self.created_at = datetime.now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        # Monotonic finish time, for retention
+        self.finished = None
+    
+    @property
+    def done(self) -> bool:
+        """Whether the job has finished, successfully or not"""
+        return self.status in (self.COMPLETED, self.FAILED)
+    
+    def report_progress(self, repos_done: int, repos_total: int) -> None:
+        """Record how many repositories have been analyzed so far"""
+        self.repos_done = repos_done
+        self.repos_total = repos_total
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the job as the polling endpoint reports it"""
+        return {
+            "job_id": self.id,
+            "username": self.username,
+            "status": self.status,
+            "progress": {
+                "repos_done": self.repos_done,
+                "repos_total": self.repos_total
+            },
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+            "status_code": self.status_code,
+            "retry_after": self.retry_after,
+            "result": self.result
+        }
+
+class JobManager:
+    """Runs analysis jobs on a bounded pool of in-process workers"""
+    
+    def __init__(self, workers: int = None, queue_size: int = None,
+                 retention: int = None, max_retained: int = None):
+        self.workers = max(1, workers or Config.JOB_WORKERS)
+        self.queue_size = queue_size or Config.JOB_QUEUE_MAX
+        self.retention = retention if retention is not None else Config.JOB_RETENTION_SECONDS
+        self.max_retained = max_retained or Config.JOB_MAX_RETAINED
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._jobs: "OrderedDict[str, AnalysisJob]" = OrderedDict()
+        # Queued or running job per key, so identical submissions share it
+        self._pending: Dict[Hashable, AnalysisJob] = {}
+        self.submitted = 0
+        self.deduplicated = 0
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+    
+    def start(self) -> None:
+        """Start the worker pool on the running event loop"""
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._workers = [asyncio.ensure_future(self._work()) for _ in range(self.workers)]
+    
+    async def close(self) -> None:
+        """Stop the workers, abandoning queued and running jobs"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+    
+    def submit(self, key: Hashable, username: str,
+               runner: Callable[[AnalysisJob], Awaitable[Dict[str, Any]]]) -> AnalysisJob:
+        """Queue a job, or return the pending job already queued for the same key"""
+        self._prune()
+        job = self._pending.get(key)
+        if job is not None:
+            self.deduplicated += 1
+            return job
+        
+        if self._queue.full():
+            self.rejected += 1
+            raise JobQueueFull("Too many analysis jobs queued, retry later", retry_after=30)
+        
+        job = AnalysisJob(key, username, runner)
+        self._jobs[job.id] = job
+        self._pending[key] = job
+        self._queue.put_nowait(job)
+        self.submitted += 1
+        return job
+    
+    def get(self, job_id: str) -> Optional[AnalysisJob]:
+        """Return a job that is still pending or within its retention period"""
+        self._prune()
+        return self._jobs.get(job_id)
+    
+    async def _work(self) -> None:
+        """Worker loop: run queued jobs one at a time"""
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+    
+    async def _run(self, job: AnalysisJob) -> None:
+        """Run one job and record its outcome"""
+        job.status = AnalysisJob.RUNNING
+        job.started_at = datetime.now()
+        try:
+            job.result = await job.runner(job)
+            job.status = AnalysisJob.COMPLETED
+            # Results served from cache never reported progress
+            repos = len(job.result.get("repositories", []))
+            job.report_progress(repos, max(job.repos_total, repos))
+            self.completed += 1
+        except (RateLimitExceeded, ServerOverloaded, CircuitOpen) as e:
+            job.status = AnalysisJob.FAILED
+            job.error = str(e)
+            job.status_code = 503
+            job.retry_after = max(int(e.retry_after), 1)
+            self.failed += 1
+        except GitHubAPIError as e:
+            job.status = AnalysisJob.FAILED
+            job.status_code, job.error = client_error(e)
+            if e.status_code in (401, 403):
+                logger.error("GitHub rejected the service's credentials: %s", e)
+                # Rejected tokens are probed again after the reprobe interval
+                job.retry_after = max(int(Config.GITHUB_TOKEN_REPROBE_INTERVAL), 1)
+            self.failed += 1
+        except Exception as e:
+            logger.warning("Analysis job %s for %s failed: %s", job.id, job.username, e)
+            job.status = AnalysisJob.FAILED
+            job.error = str(e)
+            job.status_code = 500
+            self.failed += 1
+        finally:
+            job.finished_at = datetime.now()
+            job.finished = time.monotonic()
+            if self._pending.get(job.key) is job:
+                del self._pending[job.key]
+    
+    def _prune(self) -> None:
+        """Forget finished jobs past their retention period or beyond the retained count"""
+        now = time.monotonic()
+        finished = [job for job in self._jobs.values() if job.done]
+        excess = len(self._jobs) - self.max_retained
+        for job in finished:
+            if now - job.finished > self.retention or excess > 0:
+                del self._jobs[job.id]
+                excess -= 1
+    
+    def stats(self) -> Dict[str, int]:
+        """Return job counters"""
+        return {
+            "workers": self.workers,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "retained": len(self._jobs),
+            "submitted": self.submitted,
+            "deduplicated": self.deduplicated,
+            "rejected": self.rejected,
+            "completed": self.completed,
+            "failed": self.failed
+        }
@@ -0,0 +1,270 @@
+import asyncio
+import functools
+import math
+from datetime import datetime
+from typing import AsyncIterator, Callable, Dict, Any, Optional, Tuple
+
+from .github_service import GitHubService
+from .analyzer_service import AnalyzerService, ProgressCallback
+from .score_calculator import ScoreCalculator
+from .recruiter_simulator import RecruiterSimulator
+from .roadmap_generator import RoadmapGenerator
+from .repo_triage import RepoTriage
+from .cache_service import CacheBackend, MemoryCache, TieredCache
+from .admission import AdmissionController
+from ..models.user_profile import UserProfile
+from ..utils.single_flight import SingleFlight
+from ..utils.deadline import Deadline, set_deadline, reset_deadline
+from ..config import Config
+
+# Receives (event name, payload) as each pipeline stage completes
+StageListener = Callable[[str, Any], None]
+
+class PortfolioService:
+    """Runs the full portfolio analysis pipeline for one GitHub user"""
+    
+    def __init__(self, github_service: GitHubService, analyzer: AnalyzerService,
+                 cache: Optional[CacheBackend] = None, flights: Optional[SingleFlight] = None,
+                 admission: Optional[AdmissionController] = None):
+        self.github_service = github_service
+        self.analyzer = analyzer
+        self.cache = cache or TieredCache("profile", MemoryCache(Config.PROFILE_CACHE_MAX_ENTRIES))
+        self.flights = flights or SingleFlight()
+        self.admission = admission
+        # Deadline each bounded run works under, by flight key
+        self._deadlines: Dict[tuple, Deadline] = {}
+    
+    def flight_key(self, username: str, max_repos: int = None) -> tuple:
+        """Identify analyses that produce the same result and can share one run"""
+        # GitHub usernames are case-insensitive
+        return ("analyze", username.lower(), Config.GITHUB_BACKEND, max_repos or Config.MAX_REPOS_TO_ANALYZE)
+    
+    async def analyze(self, username: str, max_repos: int = None, max_age: Optional[int] = None,
+                      force_refresh: bool = False,
+                      progress: Optional[ProgressCallback] = None,
+                      deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        """Return a profile analysis, reusing a cached one while it is recent enough
+        
+        Without max_age, a result past PROFILE_CACHE_TTL but inside
+        PROFILE_STALE_TTL is returned immediately while a background run
+        refreshes it; max_age bounds the accepted age and never serves stale.
+        progress is reported only by the call that starts an analysis run.
+        With a deadline, fetches still outstanding when it nears are abandoned
+        and the profile is scored from what arrived, marked incomplete.
+        """
+        cached = self._lookup(username, max_repos, max_age, force_refresh)
+        if cached is not None:
+            return cached
+        
+        # Concurrent requests for the same profile share one analysis run
+        key = self.flight_key(username, max_repos)
+        run = functools.partial(self._admitted, functools.partial(self._run, username, max_repos, progress))
+        if deadline is not None:
+            # Bounded runs can end partial, so they only coalesce with runs whose deadline falls in the same bucket
+            key += ("deadline", math.floor(deadline.expires_at / Config.DEADLINE_FLIGHT_BUCKET))
+            run = functools.partial(self._run_within, self._shared_deadline(key, deadline), run)
+        profile = await self.flights.do(key, run)
+        return self._with_freshness(profile, 0, stale=False)
+    
+    async def stream(self, username: str, max_repos: int = None, max_age: Optional[int] = None,
+                     force_refresh: bool = False) -> AsyncIterator[Tuple[str, Any]]:
+        """Yield (event, payload) pairs as each stage of an analysis completes
+        
+        Stages are profile, one repository event per analyzed repository,
+        score, recruiter_feedback and roadmap, followed by done. Cached
+        results, and runs already started by another caller, are replayed
+        once complete.
+        """
+        profile = self._lookup(username, max_repos, max_age, force_refresh)
+        if profile is not None:
+            for event in self._replay(profile):
+                yield event
+            return
+        
+        events: asyncio.Queue = asyncio.Queue()
+        finished = object()
+        run = functools.partial(self._admitted, functools.partial(
+            self._run, username, max_repos, None,
+            lambda event, payload: events.put_nowait((event, payload))
+        ))
+        task = asyncio.ensure_future(self.flights.do(self.flight_key(username, max_repos), run))
+        task.add_done_callback(lambda _: events.put_nowait(finished))
+        try:
+            streamed = False
+            while True:
+                event = await events.get()
+                if event is finished:
+                    break
+                streamed = True
+                yield event
+            profile = self._with_freshness(task.result(), 0, stale=False)
+            if streamed:
+                yield "done", self._summary(profile)
+            else:
+                for event in self._replay(profile):
+                    yield event
+        finally:
+            # A consumer that goes away stops waiting; the run itself ends with its last waiter
+            task.cancel()
+    
+    def _lookup(self, username: str, max_repos: Optional[int], max_age: Optional[int],
+                force_refresh: bool) -> Optional[Dict[str, Any]]:
+        """Return a cached profile that is recent enough, refreshing a stale one in the background"""
+        if force_refresh:
+            return None
+        key = self.flight_key(username, max_repos)
+        cached = self.cache.get(self._cache_key(key))
+        if cached is None:
+            return None
+        
+        age = self._age(cached)
+        fresh_for = Config.PROFILE_CACHE_TTL if max_age is None else max_age
+        if age <= fresh_for:
+            return self._with_freshness(cached, age, stale=False)
+        if max_age is None and age <= fresh_for + Config.PROFILE_STALE_TTL:
+            # The refresh outlives this request; concurrent callers join it
+            self.flights.start(key, functools.partial(
+                self._admitted, functools.partial(self._run, username, max_repos)
+            ))
+            return self._with_freshness(cached, age, stale=True)
+        return None
+    
+    def _replay(self, profile: Dict[str, Any]):
+        """Yield the stage events of a finished profile"""
+        yield "profile", profile["user_data"]
+        for repo in profile["repositories"]:
+            yield "repository", repo
+        yield "score", profile["score"]
+        yield "recruiter_feedback", profile["recruiter_feedback"]
+        yield "roadmap", profile["roadmap"]
+        yield "done", self._summary(profile)
+    
+    def _summary(self, profile: Dict[str, Any]) -> Dict[str, Any]:
+        """Closing event payload: when the analysis ran and how fresh it is"""
+        return {
+            "username": profile["username"],
+            "analyzed_at": profile["analyzed_at"],
+            "age_seconds": profile["age_seconds"],
+            "stale": profile["stale"],
+            "status": profile.get("status", "complete")
+        }
+    
+    def _cache_key(self, flight_key: tuple) -> str:
+        """Profile cache key for an analysis"""
+        return "|".join(str(part) for part in flight_key)
+    
+    def _age(self, profile: Dict[str, Any]) -> float:
+        """Seconds since a profile was analyzed"""
+        analyzed_at = profile["analyzed_at"]
+        # Results read back from the disk tier carry the timestamp as a string
+        if isinstance(analyzed_at, str):
+            analyzed_at = datetime.fromisoformat(analyzed_at)
+        return max((datetime.now() - analyzed_at).total_seconds(), 0)
+    
+    def _with_freshness(self, profile: Dict[str, Any], age: float, stale: bool) -> Dict[str, Any]:
+        """Copy a profile with its staleness indicator"""
+        return {**profile, "age_seconds": round(age), "stale": stale}
+    
+    async def _admitted(self, run: Callable) -> Dict[str, Any]:
+        """Run an analysis once admission control lets it start"""
+        if self.admission is None:
+            return await run()
+        async with self.admission.slot():
+            return await run()
+    
+    def _shared_deadline(self, key: tuple, deadline: Deadline) -> Deadline:
+        """Return the deadline of the bounded run for `key`, pulled in to `deadline` if that is earlier
+        
+        A run ends at the earliest deadline among its callers, so a caller
+        joining it is never kept waiting past its own.
+        """
+        for expired in [k for k, shared in self._deadlines.items() if shared.expired]:
+            del self._deadlines[expired]
+        shared = self._deadlines.setdefault(key, Deadline.at(deadline.expires_at))
+        shared.expires_at = min(shared.expires_at, deadline.expires_at)
+        return shared
+    
+    async def _run_within(self, deadline: Deadline, run: Callable) -> Dict[str, Any]:
+        """Run an analysis with `deadline` current for every call it makes"""
+        token = set_deadline(deadline)
+        try:
+            return await run()
+        finally:
+            reset_deadline(token)
+    
+    async def _run(self, username: str, max_repos: int = None,
+                   progress: Optional[ProgressCallback] = None,
+                   listener: Optional[StageListener] = None) -> Dict[str, Any]:
+        """Analyze a profile from GitHub and cache the serialized UserProfile"""
+        emit = listener or (lambda event, payload: None)
+        
+        # Initialize services
+        score_calculator = ScoreCalculator()
+        recruiter_sim = RecruiterSimulator()
+        roadmap_gen = RoadmapGenerator()
+        
+        async def fetch_profile() -> Dict[str, Any]:
+            user_data = await self.github_service.get_user_profile(username)
+            emit("profile", user_data)
+            return user_data
+        
+        # Fetch the profile while triage ranks the listing from metadata as its pages arrive
+        user_data, repositories = await asyncio.gather(
+            fetch_profile(),
+            RepoTriage().select_streaming(
+                self.github_service.iter_repositories(username),
+                max_repos or Config.MAX_REPOS_TO_ANALYZE
+            )
+        )
+        
+        # Deep-analyze only the best
+        analyzed_repos = await self.analyzer.analyze_repositories(
+            repositories,
+            progress=progress,
+            on_result=lambda repo: emit("repository", repo)
+        )
+        
+        # Calculate scores
+        portfolio_score = score_calculator.calculate_portfolio_score(
+            user_data, analyzed_repos
+        )
+        emit("score", portfolio_score)
+        
+        # Generate recruiter feedback
+        recruiter_feedback = recruiter_sim.simulate_review(
+            user_data, analyzed_repos, portfolio_score
+        )
+        emit("recruiter_feedback", recruiter_feedback)
+        
+        # Generate improvement roadmap
+        roadmap = roadmap_gen.generate_roadmap(
+            portfolio_score, analyzed_repos
+        )
+        emit("roadmap", roadmap)
+        
+        # Create user profile
+        incomplete = [repo["full_name"] for repo in analyzed_repos if not repo.get("complete", True)]
+        degraded = bool(incomplete) or "degraded" in user_data.get("fetch_status", {}).values()
+        profile = UserProfile(
+            username=username,
+            user_data=user_data,
+            repositories=analyzed_repos,
+            score=portfolio_score,
+            recruiter_feedback=recruiter_feedback,
+            roadmap=roadmap,
+            complete=not degraded,
+            status="degraded" if degraded else "complete",
+            incomplete_repositories=incomplete
+        )
+        
+        result = profile.dict()
+        if degraded:
+            # A partial or degraded result is served once and never cached
+            return result
+        # Kept past freshness so it can still be served stale while refreshing
+        self.cache.set(
+            self._cache_key(self.flight_key(username, max_repos)),
+            result,
+            ttl=Config.PROFILE_CACHE_TTL + Config.PROFILE_STALE_TTL
+        )
+        return result
@@ -0,0 +1,172 @@
+import asyncio
+import hashlib
+import time
+from typing import Dict, Any, Optional, Tuple
+import httpx
+
+from ..config import Config
+from .exceptions import DeadlineExceeded, RateLimitExceeded
+from ..utils.deadline import current_deadline
+
+def token_key(token: Optional[str]) -> str:
+    """Identify a token in metrics without exposing it"""
+    if not token:
+        return "anonymous"
+    return "token-" + hashlib.sha256(token.encode("utf-8")).hexdigest()[:8]
+
+class TokenBudget:
+    """Rate-limit state and pacing bucket for one token and API resource"""
+    
+    def __init__(self, burst: int):
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at = 0.0
+        self.blocked_until = 0.0
+        self.in_flight = 0
+        self.tokens = float(burst)
+        self.refilled_at = time.monotonic()
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the budget as plain data"""
+        now = time.time()
+        return {
+            "limit": self.limit,
+            "remaining": self.remaining,
+            "reset_in": max(0, round(self.reset_at - now)) if self.reset_at else None,
+            "blocked_for": max(0, round(self.blocked_until - now)),
+            "in_flight": self.in_flight
+        }
+
+class RateLimitScheduler:
+    """Paces GitHub requests per token from the X-RateLimit headers GitHub returns"""
+    
+    def __init__(self):
+        self.rate = Config.RATE_LIMIT_REQUESTS_PER_SECOND
+        self.burst = Config.RATE_LIMIT_BURST
+        self.reserve = Config.RATE_LIMIT_RESERVE
+        self.max_wait = Config.RATE_LIMIT_MAX_WAIT
+        self._budgets: Dict[Tuple[str, str], TokenBudget] = {}
+        self.queued = 0
+        self.throttled = 0
+        # Requests dropped while queued or in flight: work saved for disconnected or out-of-time callers
+        self.cancelled = 0
+    
+    def budget(self, key: str, resource: str = "core") -> TokenBudget:
+        """Return the budget for a token and resource, creating it on first use"""
+        budget = self._budgets.get((key, resource))
+        if budget is None:
+            budget = TokenBudget(self.burst)
+            self._budgets[(key, resource)] = budget
+        return budget
+    
+    def _refill_rate(self, budget: TokenBudget, now: float) -> float:
+        """Requests per second the bucket refills at"""
+        if budget.remaining is None or not budget.limit or budget.reset_at <= now:
+            return self.rate
+        
+        # Near exhaustion, spread what is left evenly until the window resets
+        if budget.remaining < budget.limit * Config.RATE_LIMIT_PACING_THRESHOLD:
+            spare = max(budget.remaining - self.reserve, 0)
+            return max(min(self.rate, spare / (budget.reset_at - now)), 0.001)
+        return self.rate
+    
+    def _wait_time(self, budget: TokenBudget) -> float:
+        """Seconds until a request may be sent, or 0 after taking a bucket token"""
+        now = time.time()
+        if budget.blocked_until > now:
+            return budget.blocked_until - now
+        
+        if (budget.remaining is not None and budget.reset_at > now and
+                budget.remaining - budget.in_flight <= self.reserve):
+            return budget.reset_at - now + 1
+        
+        monotonic = time.monotonic()
+        rate = self._refill_rate(budget, now)
+        budget.tokens = min(self.burst, budget.tokens + (monotonic - budget.refilled_at) * rate)
+        budget.refilled_at = monotonic
+        if budget.tokens >= 1:
+            budget.tokens -= 1
+            return 0
+        return (1 - budget.tokens) / rate
+    
+    async def acquire(self, key: str, resource: str = "core") -> None:
+        """Wait for permission to send a request, queueing while the budget recovers"""
+        budget = self.budget(key, resource)
+        deadline = current_deadline()
+        waited = 0.0
+        queued = False
+        try:
+            while True:
+                wait = self._wait_time(budget)
+                if wait <= 0:
+                    budget.in_flight += 1
+                    return
+                if waited + wait > self.max_wait:
+                    self.throttled += 1
+                    raise RateLimitExceeded(
+                        "GitHub rate limit exhausted, retry later", retry_after=round(wait)
+                    )
+                if deadline is not None and wait > deadline.remaining():
+                    raise DeadlineExceeded("Request deadline reached while waiting for the GitHub rate limit")
+                if not queued:
+                    queued = True
+                    self.queued += 1
+                await asyncio.sleep(wait)
+                waited += wait
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            if queued:
+                self.queued -= 1
+    
+    def release(self, key: str, response: Optional[httpx.Response], resource: str = "core") -> None:
+        """Record the outcome of a request acquired with `acquire`"""
+        budget = self.budget(key, resource)
+        budget.in_flight = max(budget.in_flight - 1, 0)
+        if response is not None:
+            self.update(budget, response)
+    
+    def update(self, budget: TokenBudget, response: httpx.Response) -> None:
+        """Update a budget from the rate-limit headers of a response"""
+        headers = response.headers
+        now = time.time()
+        if "x-ratelimit-remaining" in headers:
+            budget.remaining = int(headers["x-ratelimit-remaining"])
+        if "x-ratelimit-limit" in headers:
+            budget.limit = int(headers["x-ratelimit-limit"])
+        if "x-ratelimit-reset" in headers:
+            budget.reset_at = float(headers["x-ratelimit-reset"])
+        
+        if not self.is_rate_limited(response):
+            return
+        if "retry-after" in headers:
+            budget.blocked_until = max(budget.blocked_until, now + float(headers["retry-after"]))
+        elif budget.remaining == 0 and budget.reset_at > now:
+            budget.blocked_until = max(budget.blocked_until, budget.reset_at + 1)
+        else:
+            # Secondary limit without guidance: GitHub asks clients to wait at least a minute
+            budget.blocked_until = max(budget.blocked_until, now + Config.SECONDARY_RATE_LIMIT_BACKOFF)
+    
+    @staticmethod
+    def is_rate_limited(response: Optional[httpx.Response]) -> bool:
+        """Check whether a response is a primary or secondary rate-limit rejection"""
+        if response is None or response.status_code not in (403, 429):
+            return False
+        if response.status_code == 429 or "retry-after" in response.headers:
+            return True
+        if response.headers.get("x-ratelimit-remaining") == "0":
+            return True
+        return "rate limit" in response.text.lower()
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the current budget state for health checks"""
+        return {
+            "queued_requests": self.queued,
+            "throttled_requests": self.throttled,
+            "cancelled_requests": self.cancelled,
+            "budgets": {
+                f"{key}:{resource}": budget.snapshot()
+                for (key, resource), budget in self._budgets.items()
+            }
+        }
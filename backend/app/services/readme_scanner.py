@@ -0,0 +1,56 @@
+import re
+from typing import Dict
+
+# Documentation signals; none of the patterns can match across a line break
+DETECTORS = {
+    "has_setup_instructions": re.compile(r"(install|setup|getting started)", re.I),
+    "has_examples": re.compile(r"(example|usage|demo)", re.I),
+    "has_badges": re.compile(r"!\[.*\]\(.*\)"),
+    "has_api_documentation": re.compile(r"(api|endpoint|route)", re.I),
+}
+
+# A line longer than this is scanned in pieces; detector flags are booleans, so
+# re-scanning the kept overlap can never double count
+MAX_PENDING_CHARS = 64 * 1024
+OVERLAP_CHARS = 1024
+
+class ReadmeScanner:
+    """Runs the README detectors incrementally over text fed in chunks"""
+    
+    def __init__(self):
+        self.length = 0
+        self.flags: Dict[str, bool] = {name: False for name in DETECTORS}
+        self._pending = ""
+    
+    def feed(self, text: str) -> None:
+        """Scan a chunk of README text"""
+        if not text:
+            return
+        self.length += len(text)
+        if all(self.flags.values()):
+            return
+        
+        # Only complete lines are scanned; the unfinished tail waits for the next chunk
+        data = self._pending + text
+        cut = data.rfind("\n")
+        if cut == -1:
+            self._pending = data
+            if len(self._pending) > MAX_PENDING_CHARS:
+                self._scan(self._pending)
+                self._pending = self._pending[-OVERLAP_CHARS:]
+            return
+        self._scan(data[:cut])
+        self._pending = data[cut + 1:]
+    
+    def close(self) -> Dict[str, bool]:
+        """Scan whatever is left and return the detector flags"""
+        if self._pending:
+            self._scan(self._pending)
+            self._pending = ""
+        return dict(self.flags)
+    
+    def _scan(self, text: str) -> None:
+        """Run the detectors that have not matched yet"""
+        for name, pattern in DETECTORS.items():
+            if not self.flags[name] and pattern.search(text):
+                self.flags[name] = True
@@ -0,0 +1,77 @@
+import heapq
+import math
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, List, Any, Tuple
+
+from ..config import Config
+
+class RepoTriage:
+    """Rank repositories from listing metadata alone, before any per-repo API calls"""
+    
+    def __init__(self):
+        self.weights = Config.TRIAGE_WEIGHTS
+        self.now = datetime.now(timezone.utc)
+    
+    def score_repository(self, repo_data: Dict[str, Any]) -> float:
+        """Score a repository's portfolio relevance from its listing entry"""
+        stars = repo_data.get("stargazers_count", 0) or 0
+        forks = repo_data.get("forks_count", 0) or 0
+        size_kb = repo_data.get("size", 0) or 0
+        
+        # Log scales, so one viral repo does not drown out everything else
+        score = (
+            self.weights['stars'] * min(math.log1p(stars) / math.log1p(100), 1) +
+            self.weights['forks'] * min(math.log1p(forks) / math.log1p(25), 1) +
+            self.weights['size'] * min(math.log1p(size_kb) / math.log1p(10000), 1) +
+            self.weights['recency'] * self._recency(repo_data.get("pushed_at") or repo_data.get("updated_at"))
+        )
+        if repo_data.get("description"):
+            score += self.weights['description']
+        
+        # Forks, archived and empty repositories say little about the owner's work
+        if repo_data.get("fork"):
+            score -= Config.TRIAGE_FORK_PENALTY
+        if repo_data.get("archived"):
+            score -= Config.TRIAGE_ARCHIVED_PENALTY
+        if size_kb == 0:
+            score -= Config.TRIAGE_EMPTY_PENALTY
+        
+        return round(score, 2)
+    
+    def _recency(self, timestamp: str) -> float:
+        """Decay from 1 (pushed today) towards 0 over roughly half a year"""
+        if not timestamp:
+            return 0
+        pushed_at = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+        days = max((self.now - pushed_at).days, 0)
+        return math.exp(-days / Config.TRIAGE_RECENCY_DAYS)
+    
+    def select(self, repositories: List[Dict[str, Any]], k: int) -> List[Dict[str, Any]]:
+        """Return the top-k repositories by triage score, best first"""
+        # Ties keep listing order, i.e. the most recently updated first
+        ranked = heapq.nlargest(
+            k,
+            enumerate(repositories),
+            key=lambda item: (self.score_repository(item[1]), -item[0])
+        )
+        return [repo for _, repo in ranked]
+    
+    async def select_streaming(self, repositories: AsyncIterator[Dict[str, Any]],
+                               k: int) -> List[Dict[str, Any]]:
+        """Return the top-k of a listing scored as its pages arrive, best first
+        
+        Only k candidates are held at a time. The result is final only once
+        the listing ends: a repository on the last page can still outrank
+        everything before it, so analysis cannot start earlier.
+        """
+        # Min-heap of (score, -listing index, repo); the index breaks ties like select()
+        heap: List[Tuple[float, int, Dict[str, Any]]] = []
+        index = 0
+        async for repo in repositories:
+            item = (self.score_repository(repo), -index, repo)
+            index += 1
+            if len(heap) < k:
+                heapq.heappush(heap, item)
+            elif heap and item[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, item)
+        return [repo for _, _, repo in sorted(heap, key=lambda item: item[:2], reverse=True)]
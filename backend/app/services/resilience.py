@@ -0,0 +1,140 @@
+import random
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+from .exceptions import CircuitOpen
+from ..config import Config
+from ..utils.deadline import Deadline
+
+# Responses worth retrying: GitHub's own outages and overloaded proxies
+TRANSIENT_STATUSES = {500, 502, 503, 504}
+
+def endpoint_name(url: str) -> str:
+    """Name the GitHub endpoint a URL belongs to, ignoring the user and repository in it"""
+    parts = [part for part in urlparse(url).path.split("/") if part]
+    if not parts:
+        return "root"
+    if parts[0] == "users":
+        return "user" if len(parts) <= 2 else parts[2]
+    if parts[0] == "repos":
+        return "repository" if len(parts) <= 3 else parts[3]
+    return parts[0]
+
+class RetryBudget:
+    """Caps retries at a fraction of requests, so retries cannot multiply load on a struggling GitHub"""
+    
+    def __init__(self, ratio: float = None, reserve: int = None):
+        self.ratio = ratio if ratio is not None else Config.GITHUB_RETRY_BUDGET_RATIO
+        self.reserve = reserve if reserve is not None else Config.GITHUB_RETRY_BUDGET_RESERVE
+        self.tokens = float(self.reserve)
+        self.exhausted = 0
+    
+    def deposit(self) -> None:
+        """Credit the budget for one new request"""
+        self.tokens = min(self.tokens + self.ratio, self.reserve)
+    
+    def withdraw(self) -> bool:
+        """Spend one retry, or refuse when the budget is empty"""
+        if self.tokens < 1:
+            self.exhausted += 1
+            return False
+        self.tokens -= 1
+        return True
+
+class CircuitBreaker:
+    """Fails calls to one endpoint fast after repeated failures, probing it again after a pause"""
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, endpoint: str, threshold: int = None, reset_timeout: float = None):
+        self.endpoint = endpoint
+        self.threshold = threshold or Config.CIRCUIT_FAILURE_THRESHOLD
+        self.reset_timeout = reset_timeout or Config.CIRCUIT_RESET_TIMEOUT
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self.trips = 0
+    
+    def check(self) -> None:
+        """Let a call through, or raise CircuitOpen while the endpoint is considered down"""
+        if self.state == self.CLOSED:
+            return
+        waited = time.monotonic() - self.opened_at
+        if waited >= self.reset_timeout:
+            # One probe at a time; a probe that never reports back is replaced after another pause
+            self.state = self.HALF_OPEN
+            self.opened_at = time.monotonic()
+            return
+        self.rejected += 1
+        raise CircuitOpen(
+            f"GitHub {self.endpoint} endpoint is failing, retry later",
+            retry_after=self.reset_timeout - waited
+        )
+    
+    def record_success(self) -> None:
+        """Close the circuit after a call succeeds"""
+        self.state = self.CLOSED
+        self.failures = 0
+    
+    def record_failure(self) -> None:
+        """Count a failed call, opening the circuit at the threshold or when a probe fails"""
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.threshold:
+            if self.state != self.OPEN:
+                self.trips += 1
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the breaker state for health checks"""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "trips": self.trips,
+            "rejected": self.rejected
+        }
+
+class ResiliencePolicy:
+    """Backoff, retry budget and per-endpoint circuit breakers shared by every GitHub call"""
+    
+    def __init__(self, max_retries: int = None, base_delay: float = None, max_delay: float = None,
+                 budget: Optional[RetryBudget] = None):
+        self.max_retries = max_retries if max_retries is not None else Config.GITHUB_RETRY_MAX_RETRIES
+        self.base_delay = base_delay or Config.GITHUB_RETRY_BASE_DELAY
+        self.max_delay = max_delay or Config.GITHUB_RETRY_MAX_DELAY
+        self.budget = budget or RetryBudget()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self.retries = 0
+    
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        """Return the circuit breaker for an endpoint, creating it on first use"""
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            breaker = self._breakers[endpoint] = CircuitBreaker(endpoint)
+        return breaker
+    
+    def retry_delay(self, attempt: int, deadline: Optional[Deadline] = None) -> Optional[float]:
+        """Seconds to wait before retrying after failed attempt `attempt`, or None to give up"""
+        if attempt >= self.max_retries:
+            return None
+        # Full jitter keeps clients that failed together from retrying together
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if deadline is not None and delay >= deadline.remaining():
+            return None
+        if not self.budget.withdraw():
+            return None
+        self.retries += 1
+        return delay
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Return retry and breaker state for health checks"""
+        return {
+            "retries": self.retries,
+            "retry_budget": round(self.budget.tokens, 2),
+            "retry_budget_exhausted": self.budget.exhausted,
+            "circuits": {endpoint: breaker.snapshot() for endpoint, breaker in self._breakers.items()}
+        }
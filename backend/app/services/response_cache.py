@@ -0,0 +1,99 @@
+from typing import Dict, Any, Optional
+import httpx
+
+from .cache_service import CacheBackend, MemoryCache, TieredCache
+from ..config import Config
+
+class ResponseCache:
+    """GitHub response bodies with their ETag / Last-Modified validators"""
+    
+    # Response headers replayed when a 304 reuses a stored body
+    STORED_HEADERS = ("content-type", "link", "etag", "last-modified")
+    
+    def __init__(self, cache: Optional[CacheBackend] = None):
+        self.cache = cache or TieredCache("response", MemoryCache(Config.RESPONSE_CACHE_MAX_ENTRIES))
+        self.hits = 0
+        self.reused = 0
+        self.misses = 0
+        self.stores = 0
+    
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict[str, Any]] = None, accept: str = "") -> str:
+        """Build a cache key from the request URL, query parameters and media type"""
+        query = "&".join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+        return f"{accept}|{url}?{query}"
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the stored entry for a key"""
+        entry = self.cache.get(key)
+        if entry is None:
+            self.misses += 1
+        return entry
+    
+    def conditional_headers(self, entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for revalidation"""
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+    
+    def store(self, key: str, response: httpx.Response) -> None:
+        """Store a successful response if it carries a validator"""
+        self.store_text(key, response, response.text)
+    
+    def store_text(self, key: str, response: httpx.Response, content: str, **extra) -> None:
+        """Store already-consumed body text under a response's validators"""
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        if response.status_code != 200 or not (etag or last_modified):
+            return
+        
+        self.cache.set(key, {
+            "etag": etag,
+            "last_modified": last_modified,
+            "headers": {
+                name: response.headers[name]
+                for name in self.STORED_HEADERS if name in response.headers
+            },
+            "content": content,
+            **extra
+        }, ttl=Config.RESPONSE_CACHE_TTL)
+        self.stores += 1
+    
+    def replay(self, entry: Dict[str, Any], not_modified: httpx.Response) -> httpx.Response:
+        """Rebuild a 200 response from a stored entry after a 304"""
+        self.hits += 1
+        headers = dict(entry["headers"])
+        # Rate-limit headers of the 304 are current; the stored ones are not
+        for name, value in not_modified.headers.items():
+            if name.lower().startswith("x-ratelimit-"):
+                headers[name] = value
+        return httpx.Response(
+            200,
+            headers=headers,
+            content=entry["content"].encode("utf-8"),
+            request=not_modified.request
+        )
+    
+    def reuse(self, entry: Dict[str, Any], request: httpx.Request) -> httpx.Response:
+        """Rebuild a 200 response from a stored entry without revalidating it"""
+        self.reused += 1
+        return httpx.Response(
+            200,
+            headers=entry["headers"],
+            content=entry["content"].encode("utf-8"),
+            request=request
+        )
+    
+    def stats(self) -> Dict[str, int]:
+        """Return cache counters"""
+        return {
+            "not_modified_hits": self.hits,
+            "reused_without_request": self.reused,
+            "misses": self.misses,
+            "stores": self.stores,
+            "storage": self.cache.stats()
+        }
@@ -0,0 +1,86 @@
+import logging
+import time
+from typing import Dict, List, Any, Optional
+
+from ..config import Config
+from .rate_limiter import RateLimitScheduler, token_key
+from .exceptions import GitHubAPIError
+
+logger = logging.getLogger(__name__)
+
+class TokenPool:
+    """Routes each GitHub request to the token with the most rate-limit headroom"""
+    
+    def __init__(self, tokens: List[str], scheduler: RateLimitScheduler):
+        # Without tokens the pool holds a single anonymous slot
+        self.tokens: List[Optional[str]] = list(dict.fromkeys(tokens)) or [None]
+        self.scheduler = scheduler
+        self.reprobe_interval = Config.GITHUB_TOKEN_REPROBE_INTERVAL
+        # Rejected token key -> when it was rejected or last probed
+        self._revoked: Dict[str, float] = {}
+    
+    def _headroom(self, token: Optional[str], resource: str) -> float:
+        """Requests the token can still send in its current window"""
+        budget = self.scheduler.budget(token_key(token), resource)
+        now = time.time()
+        if budget.blocked_until > now:
+            return -1
+        if budget.remaining is None or budget.reset_at <= now:
+            # Unknown or already reset: assume a full window
+            remaining = budget.limit or Config.GITHUB_DEFAULT_RATE_LIMIT
+        else:
+            remaining = budget.remaining
+        return remaining - budget.in_flight
+    
+    def _available_at(self, token: Optional[str], resource: str) -> float:
+        """Epoch time at which an exhausted token can be used again"""
+        budget = self.scheduler.budget(token_key(token), resource)
+        return max(budget.blocked_until, budget.reset_at)
+    
+    def select(self, resource: str = "core") -> Optional[str]:
+        """Pick the usable token with the most headroom"""
+        candidates = [token for token in self.tokens if self._usable(token)]
+        if not candidates:
+            raise GitHubAPIError("No usable GitHub tokens: every configured token was rejected", 401)
+        
+        # Exhausted tokens sort last; among them the one that recovers first wins
+        token = max(
+            candidates,
+            key=lambda token: (self._headroom(token, resource), -self._available_at(token, resource))
+        )
+        key = token_key(token)
+        if key in self._revoked:
+            # One probe per interval: a token fixed in the meantime rejoins the pool
+            self._revoked[key] = time.monotonic()
+        return token
+    
+    def _usable(self, token: Optional[str]) -> bool:
+        """Whether a token is in the pool, or was rejected long enough ago to be probed again"""
+        rejected_at = self._revoked.get(token_key(token))
+        return rejected_at is None or time.monotonic() - rejected_at >= self.reprobe_interval
+    
+    def revoke(self, token: Optional[str]) -> None:
+        """Sideline a token GitHub rejected as invalid or revoked"""
+        if token is None:
+            return
+        key = token_key(token)
+        if key not in self._revoked:
+            logger.warning("GitHub token %s was rejected and has been removed from the pool", key)
+        self._revoked[key] = time.monotonic()
+    
+    def restore(self, token: Optional[str]) -> None:
+        """Return a sidelined token to the pool once GitHub accepts it again"""
+        key = token_key(token)
+        if self._revoked.pop(key, None) is not None:
+            logger.info("GitHub token %s was accepted again and has rejoined the pool", key)
+    
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Return per-token state for health checks"""
+        return [
+            {
+                "token": token_key(token),
+                "revoked": token_key(token) in self._revoked,
+                "headroom": self._headroom(token, "core")
+            }
+            for token in self.tokens
+        ]
@@ -0,0 +1,43 @@
+import contextvars
+import time
+from typing import Optional
+
+class Deadline:
+    """The point in time by which a request has to be answered"""
+    
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+    
+    @classmethod
+    def at(cls, expires_at: float) -> "Deadline":
+        """Build a deadline expiring at a time.monotonic() instant"""
+        deadline = cls(expires_at - time.monotonic())
+        deadline.expires_at = expires_at
+        return deadline
+    
+    def remaining(self, reserve: float = 0) -> float:
+        """Seconds left, keeping `reserve` seconds back for work after the fetches"""
+        return max(self.expires_at - time.monotonic() - reserve, 0)
+    
+    @property
+    def expired(self) -> bool:
+        """Whether the deadline has passed"""
+        return self.remaining() <= 0
+
+# Deadline of the analysis running in the current task; tasks it spawns inherit it
+_current_deadline: contextvars.ContextVar[Optional[Deadline]] = contextvars.ContextVar(
+    "deadline", default=None
+)
+
+def current_deadline() -> Optional[Deadline]:
+    """Return the deadline the current task works under, if any"""
+    return _current_deadline.get()
+
+def set_deadline(deadline: Optional[Deadline]) -> contextvars.Token:
+    """Make `deadline` current; pass the returned token to reset_deadline"""
+    return _current_deadline.set(deadline)
+
+def reset_deadline(token: contextvars.Token) -> None:
+    """Restore the deadline that was current before set_deadline"""
+    _current_deadline.reset(token)
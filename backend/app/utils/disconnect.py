@@ -0,0 +1,30 @@
+import asyncio
+from typing import Any, Awaitable
+
+from starlette.requests import Request
+
+class ClientDisconnected(Exception):
+    """The client closed the connection before its response was ready"""
+
+async def _disconnected(request: Request) -> None:
+    """Return once the client has closed the connection"""
+    while True:
+        message = await request.receive()
+        if message["type"] == "http.disconnect":
+            return
+
+async def cancel_on_disconnect(request: Request, awaitable: Awaitable[Any]) -> Any:
+    """Await `awaitable`, cancelling it and raising ClientDisconnected if the client goes away first"""
+    task = asyncio.ensure_future(awaitable)
+    watcher = asyncio.ensure_future(_disconnected(request))
+    try:
+        await asyncio.wait({task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        watcher.cancel()
+        task.cancel()
+    
+    if task.done() and not task.cancelled():
+        return task.result()
+    # Let the cancelled work unwind before the request finishes
+    await asyncio.gather(task, return_exceptions=True)
+    raise ClientDisconnected()
@@ -1,5 +1,15 @@
 import re
-from typing import Optional
+from typing import List, Optional, Tuple
+from urllib.parse import urlparse
+
+# First path segments of github.com pages that are not user profiles
+RESERVED_PATHS = {
+    "about", "account", "apps", "collections", "codespaces", "contact", "customer-stories",
+    "dashboard", "enterprise", "events", "explore", "features", "issues", "join", "login",
+    "logout", "marketplace", "new", "notifications", "organizations", "orgs", "pricing",
+    "pulls", "search", "security", "sessions", "settings", "site", "sponsors", "stars",
+    "team", "topics", "trending", "users", "watching"
+}
 
 def validate_github_username(username: str) -> bool:
     """
@@ -14,17 +24,17 @@ def validate_github_username(username: str) -> bool:
 
 def extract_username_from_url(url: str) -> Optional[str]:
     """Extract GitHub username from profile URL"""
-    patterns = [
-        r'github\.com/([^/]+)/?$',
-        r'github\.com/([^/]+)/?',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
+    # Scheme-less entries like github.com/user would otherwise parse as a bare path
+    parsed = urlparse(url if "://" in url else f"https://{url}")
+    host = (parsed.hostname or "").lower()
+    if host not in ("github.com", "www.github.com"):
+        return None
     
-    return None
+    # Query and fragment are already split off, e.g. ?tab=repositories
+    segments = [segment for segment in parsed.path.split("/") if segment]
+    if not segments or segments[0].lower() in RESERVED_PATHS:
+        return None
+    return segments[0]
 
 def format_number(num: int) -> str:
     """Format large numbers with K/M suffix"""
@@ -39,4 +49,31 @@ def calculate_percentage(part: float, whole: float) -> float:
     """Calculate percentage safely"""
     if whole == 0:
         return 0
-    return (part / whole) * 100
\ No newline at end of file
+    return (part / whole) * 100
+
+def normalize_usernames(entries: List[str]) -> Tuple[List[str], List[str], int]:
+    """
+    Turn raw usernames and profile URLs into unique valid usernames
+    Returns (usernames in first-seen order, invalid entries, duplicates dropped)
+    """
+    usernames, invalid, seen = [], [], set()
+    duplicates = 0
+    for entry in entries:
+        entry = entry.strip()
+        if not entry:
+            continue
+        candidate = entry
+        if "github.com" in entry.lower():
+            candidate = extract_username_from_url(entry) or ""
+        candidate = candidate.lstrip("@")
+        
+        if not validate_github_username(candidate):
+            invalid.append(entry)
+            continue
+        # GitHub usernames are case-insensitive
+        if candidate.lower() in seen:
+            duplicates += 1
+            continue
+        seen.add(candidate.lower())
+        usernames.append(candidate)
+    return usernames, invalid, duplicates
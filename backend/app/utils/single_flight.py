@@ -0,0 +1,77 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+class _Call:
+    """One shared in-flight computation and the callers waiting on it"""
+    
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+        # Pinned calls run to completion even when every waiter goes away
+        self.pinned = False
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one shared task"""
+    
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self.started = 0
+        self.coalesced = 0
+        self.cancelled = 0
+    
+    def _join(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> _Call:
+        """Return the in-flight call for `key`, starting it with `factory` if there is none"""
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(factory()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+            call.task.add_done_callback(lambda task: self._log_failure(call, task))
+            self.started += 1
+        else:
+            self.coalesced += 1
+        return call
+    
+    def start(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> None:
+        """Run the call for `key` in the background, unless it is already in flight"""
+        call = self._join(key, factory)
+        call.pinned = True
+    
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Await the in-flight call for `key`, starting it with `factory` if there is none"""
+        call = self._join(key, factory)
+        call.waiters += 1
+        try:
+            # Shielded, so one caller going away does not cancel the others' result
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if call.waiters == 1 and not call.pinned and not call.task.done():
+                # Nobody else is waiting: stop the work and let the next caller start afresh
+                self._forget(key, call)
+                call.task.cancel()
+                self.cancelled += 1
+            raise
+        finally:
+            call.waiters -= 1
+    
+    def _log_failure(self, call: _Call, task: asyncio.Task) -> None:
+        """Report, once, a background call that failed"""
+        if call.pinned and not task.cancelled() and task.exception() is not None:
+            logger.warning("Background call failed: %s", task.exception())
+    
+    def _forget(self, key: Hashable, call: _Call) -> None:
+        """Drop a finished or abandoned call so later callers start a new one"""
+        if self._calls.get(key) is call:
+            del self._calls[key]
+    
+    def stats(self) -> Dict[str, int]:
+        """Return coalescing counters"""
+        return {
+            "in_flight": len(self._calls),
+            "started": self.started,
+            "coalesced": self.coalesced,
+            "cancelled": self.cancelled
+        }
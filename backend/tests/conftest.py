@@ -0,0 +1,57 @@
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, Type
+
+import httpx
+import pytest
+
+from app.config import Config
+from app.services.github_service import GitHubService
+from app.services.http_client import create_github_client
+from app.services.rate_limiter import RateLimitScheduler
+from app.services.response_cache import ResponseCache
+from app.services.resilience import ResiliencePolicy, RetryBudget
+from app.services.token_pool import TokenPool
+
+Handler = Callable[[httpx.Request], httpx.Response]
+
+@pytest.fixture(autouse=True)
+def memory_only_cache(monkeypatch):
+    """Keep tests away from the on-disk cache tier"""
+    monkeypatch.setattr(Config, "CACHE_SQLITE_PATH", "")
+
+@pytest.fixture
+def make_service():
+    """Build a GitHub service whose requests are answered by `handler`"""
+    def make(handler: Handler, tokens: Optional[List[str]] = None,
+             service_class: Type[GitHubService] = GitHubService,
+             resilience: Optional[ResiliencePolicy] = None,
+             cache: Optional[ResponseCache] = None) -> GitHubService:
+        scheduler = RateLimitScheduler()
+        return service_class(
+            client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            cache=cache,
+            scheduler=scheduler,
+            token_pool=TokenPool(tokens or [], scheduler),
+            # No sleeping between retries unless a test asks for it
+            resilience=resilience or ResiliencePolicy(max_retries=0, budget=RetryBudget(0, 0))
+        )
+    return make
+
+@pytest.fixture
+def run_api(monkeypatch):
+    """Run `scenario(client, app)` against the API while GitHub is answered by `handler`"""
+    def run(handler: Handler, scenario: Callable[[httpx.AsyncClient, Any], Awaitable[Any]],
+            tokens: Optional[List[str]] = None) -> Any:
+        from app.main import app, lifespan
+        monkeypatch.setattr(Config, "GITHUB_TOKENS", tokens or [])
+        
+        async def main():
+            async with lifespan(app):
+                await app.state.github_client.aclose()
+                app.state.github_client = create_github_client(transport=httpx.MockTransport(handler))
+                app.state.resilience = ResiliencePolicy(max_retries=0, budget=RetryBudget(0, 0))
+                transport = httpx.ASGITransport(app=app)
+                async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+                    return await scenario(client, app)
+        return asyncio.run(main())
+    return run
@@ -0,0 +1,75 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.admission import AdmissionController
+from app.services.exceptions import ServerOverloaded
+
+def test_full_queue_sheds_with_a_retry_estimate():
+    async def main():
+        admission = AdmissionController(max_active=1, queue_size=0)
+        async with admission.slot():
+            with pytest.raises(ServerOverloaded) as error:
+                async with admission.slot():
+                    pass
+        return admission, error.value
+    
+    admission, error = asyncio.run(main())
+    assert error.retry_after >= 1
+    assert admission.stats()["shed"] == 1
+    assert admission.stats()["active"] == 0
+
+def test_queued_request_gets_the_next_free_slot():
+    async def main():
+        admission = AdmissionController(max_active=1, queue_size=1, queue_timeout=5)
+        order = []
+        
+        async def analysis(name, hold):
+            async with admission.slot():
+                order.append(name)
+                await asyncio.sleep(hold)
+        
+        first = asyncio.ensure_future(analysis("first", 0.02))
+        await asyncio.sleep(0)
+        await asyncio.gather(first, analysis("second", 0))
+        return admission, order
+    
+    admission, order = asyncio.run(main())
+    assert order == ["first", "second"]
+    assert admission.stats()["admitted"] == 2
+
+def test_queue_wait_is_bounded():
+    async def main():
+        admission = AdmissionController(max_active=1, queue_size=1, queue_timeout=0.01)
+        async with admission.slot():
+            with pytest.raises(ServerOverloaded):
+                async with admission.slot():
+                    pass
+        return admission
+    
+    assert asyncio.run(main()).stats()["timed_out"] == 1
+
+def test_overloaded_api_answers_503_with_retry_after(run_api):
+    gate = {}
+    
+    async def github(request):
+        # Hold every GitHub request until the overloaded request has been answered
+        await gate["open"].wait()
+        return httpx.Response(404, json={"message": "Not Found"})
+    
+    async def scenario(client, app):
+        gate["open"] = asyncio.Event()
+        app.state.admission = AdmissionController(max_active=1, queue_size=0)
+        first = asyncio.ensure_future(client.get("/api/v1/analyze/octo"))
+        while not app.state.admission.active:
+            await asyncio.sleep(0.001)
+        
+        shed = await client.get("/api/v1/analyze/hubot")
+        gate["open"].set()
+        return shed, await first
+    
+    shed, first = run_api(github, scenario)
+    assert shed.status_code == 503
+    assert int(shed.headers["Retry-After"]) >= 1
+    assert first.status_code == 404
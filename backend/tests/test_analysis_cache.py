@@ -0,0 +1,82 @@
+import asyncio
+import time
+
+import httpx
+
+from app.services.analysis_cache import RepoAnalysisCache
+from app.services.analyzer_service import AnalyzerService
+from app.services.fetch_planner import FetchPlanner
+
+REPO = {
+    "name": "project",
+    "full_name": "octo/project",
+    "owner": {"login": "octo"},
+    "description": "A project",
+    "html_url": "https://github.com/octo/project",
+    "stargazers_count": 1,
+    "forks_count": 0,
+    "open_issues_count": 0,
+    "created_at": "2024-01-01T00:00:00Z",
+    "updated_at": "2024-03-01T00:00:00Z",
+    "pushed_at": "2024-03-01T00:00:00Z",
+    "language": "Python",
+    "size": 120
+}
+
+def github(requests):
+    """Answer README, languages and commits, recording each path"""
+    def handler(request):
+        requests.append(request.url.path)
+        if request.url.path.endswith("/readme"):
+            return httpx.Response(200, text="# Project\n\n## Installation\n")
+        if request.url.path.endswith("/languages"):
+            return httpx.Response(200, json={"Python": 1000})
+        return httpx.Response(200, json=[])
+    return handler
+
+def test_key_follows_pushes_and_listing_updates():
+    key = RepoAnalysisCache.make_key(REPO)
+    assert RepoAnalysisCache.make_key(dict(REPO)) == key
+    assert RepoAnalysisCache.make_key({**REPO, "pushed_at": "2024-04-01T00:00:00Z"}) != key
+    assert RepoAnalysisCache.make_key({**REPO, "updated_at": "2024-04-01T00:00:00Z"}) != key
+    assert RepoAnalysisCache.make_key({**REPO, "pushed_at": None, "updated_at": None}) is None
+
+def test_unchanged_repository_costs_no_requests(make_service):
+    requests = []
+    analyzer = AnalyzerService(make_service(github(requests)), planner=FetchPlanner(), cache=RepoAnalysisCache())
+    
+    async def main():
+        first = await analyzer.analyze_repository(REPO)
+        second = await analyzer.analyze_repository(dict(REPO))
+        return first, second
+    
+    first, second = asyncio.run(main())
+    assert first == second
+    assert len(requests) == 3
+    assert analyzer.cache.stats()["hits"] == 1
+
+def test_pushed_repository_is_analyzed_again(make_service):
+    requests = []
+    analyzer = AnalyzerService(make_service(github(requests)), planner=FetchPlanner(), cache=RepoAnalysisCache())
+    
+    async def main():
+        await analyzer.analyze_repository(REPO)
+        await analyzer.analyze_repository({**REPO, "pushed_at": "2024-04-01T00:00:00Z",
+                                           "updated_at": "2024-04-01T00:00:00Z"})
+    
+    asyncio.run(main())
+    assert len(requests) == 6
+
+def test_cached_analysis_is_a_copy():
+    cache = RepoAnalysisCache()
+    cache.store(REPO, {"languages": {"Python": 1}})
+    cache.get(REPO)["languages"]["Go"] = 2
+    assert cache.get(REPO) == {"languages": {"Python": 1}}
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    cache = RepoAnalysisCache(ttl=60)
+    cache.store(REPO, {"score": 1})
+    
+    later = time.time() + 61
+    monkeypatch.setattr("app.services.cache_service.time.time", lambda: later)
+    assert cache.get(REPO) is None
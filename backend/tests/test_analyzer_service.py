@@ -0,0 +1,145 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.analysis_cache import RepoAnalysisCache
+from app.services.analyzer_service import AnalyzerService
+from app.services.exceptions import GitHubAPIError, RateLimitExceeded
+from app.services.fetch_planner import FetchPlanner
+from app.services.response_cache import ResponseCache
+
+REPO = {
+    "name": "project",
+    "full_name": "octo/project",
+    "owner": {"login": "octo"},
+    "description": "A project",
+    "html_url": "https://github.com/octo/project",
+    "stargazers_count": 1,
+    "forks_count": 0,
+    "open_issues_count": 0,
+    "created_at": "2024-01-01T00:00:00Z",
+    "updated_at": "2024-03-01T00:00:00Z",
+    "pushed_at": "2024-03-01T00:00:00Z",
+    "language": "Python",
+    "size": 120
+}
+
+def github(requests):
+    """Answer README, languages and commits with cacheable responses, recording each path"""
+    def handler(request):
+        requests.append(request.url.path)
+        headers = {"etag": '"v1"'}
+        if request.url.path.endswith("/readme"):
+            return httpx.Response(200, text="# Project\n\n## Installation\n", headers=headers)
+        if request.url.path.endswith("/languages"):
+            return httpx.Response(200, json={"Python": 1000}, headers=headers)
+        return httpx.Response(200, json=[], headers=headers)
+    return handler
+
+def analyze(service, planner):
+    # A fresh analysis cache, so the repository is analyzed from its endpoints again
+    analyzer = AnalyzerService(service, planner=planner, cache=RepoAnalysisCache())
+    return asyncio.run(analyzer.analyze_repository(REPO))
+
+def test_unchanged_repository_is_served_from_stored_responses(make_service):
+    requests = []
+    service = make_service(github(requests))
+    service.cache = ResponseCache()
+    planner = FetchPlanner()
+    
+    assert analyze(service, planner)["complete"]
+    assert len(requests) == 3
+    
+    analysis = analyze(service, planner)
+    assert analysis["complete"]
+    assert analysis["languages"] == {"Python": 1000}
+    assert len(requests) == 3
+    assert service.cache.reused == 3
+
+def test_reuse_without_stored_responses_fetches(make_service):
+    requests = []
+    service = make_service(github(requests))
+    service.cache = ResponseCache()
+    planner = FetchPlanner()
+    planner.record_fetched(REPO)
+    
+    # The planner expects stored responses, but nothing was stored: nothing counts as saved
+    assert analyze(service, planner)["complete"]
+    assert len(requests) == 3
+    assert service.cache.reused == 0
+
+def test_accepted_but_not_computed_is_degraded_not_empty(make_service):
+    def handler(request):
+        if request.url.path.endswith("/readme"):
+            return httpx.Response(404)
+        # 202: GitHub accepted the request but has no answer yet
+        return httpx.Response(202, json={})
+    service = make_service(handler)
+    service.cache = ResponseCache()
+    analyzer = AnalyzerService(service, planner=FetchPlanner(), cache=RepoAnalysisCache())
+    
+    analysis = asyncio.run(analyzer.analyze_repository(REPO))
+    assert analysis["fetch_status"]["languages"] == "degraded"
+    assert analysis["fetch_status"]["commits"] == "degraded"
+    assert analysis["status"] == "degraded"
+    assert analyzer.cache.get(REPO) is None
+    assert service.cache.stores == 0
+
+def test_built_analysis_matches_fetched_analysis(make_service):
+    service = make_service(github([]))
+    fetched = analyze(service, FetchPlanner())
+    
+    analyzer = AnalyzerService(github_service=None)
+    built = analyzer.build_analysis(
+        REPO, fetched["documentation_analysis"], {"Python": 1000}, [], fetched["fetch_status"]
+    )
+    assert built == fetched
+    assert not analyzer.build_analysis(
+        REPO, fetched["documentation_analysis"], {}, [], {"languages": "timed_out"}
+    )["complete"]
+
+class TimedAnalyzer(AnalyzerService):
+    """Analyzes repositories by sleeping, recording how many run at once"""
+    
+    def __init__(self, failures=None):
+        super().__init__(github_service=None, planner=FetchPlanner(), cache=RepoAnalysisCache())
+        self.failures = failures or {}
+        self.running = 0
+        self.peak = 0
+    
+    async def analyze_repository(self, repo_data):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            # Later repositories finish first
+            await asyncio.sleep(0.01 * (10 - repo_data["index"]))
+            if repo_data["index"] in self.failures:
+                raise self.failures[repo_data["index"]]
+            return {"full_name": repo_data["full_name"]}
+        finally:
+            self.running -= 1
+
+def repositories(count):
+    return [{"full_name": f"octo/project-{index}", "index": index} for index in range(count)]
+
+def test_repositories_are_analyzed_concurrently_in_input_order(monkeypatch):
+    monkeypatch.setattr("app.config.Config.ANALYSIS_CONCURRENCY", 3)
+    analyzer = TimedAnalyzer()
+    progress = []
+    
+    results = asyncio.run(analyzer.analyze_repositories(
+        repositories(8), progress=lambda done, total: progress.append((done, total))
+    ))
+    assert [result["full_name"] for result in results] == [f"octo/project-{index}" for index in range(8)]
+    assert analyzer.peak == 3
+    assert progress[0] == (0, 8) and progress[-1] == (8, 8)
+
+def test_failing_repository_is_dropped_but_rate_limit_fails_all():
+    analyzer = TimedAnalyzer(failures={2: GitHubAPIError("boom", 500)})
+    results = asyncio.run(analyzer.analyze_repositories(repositories(4)))
+    assert len(results) == 3
+    
+    analyzer = TimedAnalyzer(failures={2: RateLimitExceeded("exhausted", retry_after=60)})
+    with pytest.raises(RateLimitExceeded):
+        asyncio.run(analyzer.analyze_repositories(repositories(4)))
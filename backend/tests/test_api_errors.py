@@ -0,0 +1,60 @@
+import json
+
+import httpx
+
+from app.services.exceptions import CREDENTIALS_UNAVAILABLE
+
+def bad_credentials(request):
+    return httpx.Response(401, json={"message": "Bad credentials"})
+
+def test_revoked_tokens_are_unavailable_not_echoed(run_api):
+    async def scenario(client, app):
+        return await client.get("/api/v1/analyze/octo")
+    
+    response = run_api(bad_credentials, scenario, tokens=["revoked"])
+    assert response.status_code == 503
+    assert response.json()["detail"] == CREDENTIALS_UNAVAILABLE
+    assert "Bad credentials" not in response.text
+    assert int(response.headers["Retry-After"]) > 0
+
+def test_forbidden_profile_is_unavailable_not_echoed(run_api):
+    async def scenario(client, app):
+        return await client.get("/api/v1/user/octo/basic")
+    
+    response = run_api(lambda request: httpx.Response(403, json={"message": "Resource protected"}), scenario)
+    assert response.status_code == 503
+    assert "protected" not in response.text
+
+def test_batch_lines_do_not_echo_credential_errors(run_api):
+    async def scenario(client, app):
+        return await client.post("/api/v1/analyze/batch", json={"usernames": ["octo"]})
+    
+    first = run_api(bad_credentials, scenario, tokens=["revoked"]).text.splitlines()[0]
+    assert '"status_code": 503' in first
+    assert CREDENTIALS_UNAVAILABLE in first
+    assert "Bad credentials" not in first
+
+def sse_events(text):
+    events = []
+    for block in text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+def test_stream_for_unknown_user_ends_with_404(run_api):
+    async def scenario(client, app):
+        return await client.get("/api/v1/analyze/ghost/stream")
+    
+    response = run_api(lambda request: httpx.Response(404, json={"message": "Not Found"}), scenario)
+    assert response.status_code == 200
+    assert sse_events(response.text) == [("error", {"detail": "GitHub user not found", "status_code": 404})]
+
+def test_stream_does_not_echo_credential_errors(run_api):
+    async def scenario(client, app):
+        return await client.get("/api/v1/analyze/octo/stream")
+    
+    event, payload = sse_events(run_api(bad_credentials, scenario, tokens=["revoked"]).text)[-1]
+    assert event == "error"
+    assert payload["status_code"] == 503
+    assert payload["detail"] == CREDENTIALS_UNAVAILABLE
+    assert payload["retry_after"] > 0
@@ -0,0 +1,58 @@
+import json
+from collections import Counter
+
+import httpx
+
+from app.github_simulator import SimulatorSettings, create_simulator
+
+def simulated_github(calls: Counter):
+    """Answer requests from the synthetic GitHub, where logins starting with "ghost" do not exist"""
+    transport = httpx.ASGITransport(app=create_simulator(SimulatorSettings(repos_median=2, repos_max=4)))
+    
+    async def handler(request):
+        calls[request.url.path] += 1
+        return await transport.handle_async_request(request)
+    return handler
+
+def post_batch(run_api, calls, **body):
+    async def scenario(client, app):
+        response = await client.post("/api/v1/analyze/batch", **body)
+        return response.status_code, response.headers, response.text
+    
+    status, headers, text = run_api(simulated_github(calls), scenario)
+    return status, headers, [json.loads(line) for line in text.splitlines()]
+
+def test_batch_dedupes_and_reports_invalid_entries_inline(run_api):
+    calls = Counter()
+    status, headers, lines = post_batch(run_api, calls, json={"usernames": [
+        "octo", "https://github.com/Octo", "@OCTO", "not a user!", "https://github.com/settings", "ghost-one"
+    ]})
+    
+    assert status == 200
+    assert headers["content-type"] == "application/x-ndjson"
+    invalid = [line for line in lines if line["status"] == "invalid"]
+    assert [line["input"] for line in invalid] == ["not a user!", "https://github.com/settings"]
+    results = {line["username"]: line for line in lines if line["status"] in ("ok", "error")}
+    assert set(results) == {"octo", "ghost-one"}
+    assert results["octo"]["status"] == "ok"
+    assert (results["ghost-one"]["status_code"], results["ghost-one"]["error"]) == (404, "GitHub user not found")
+    assert lines[-1] == {
+        "status": "summary", "requested": 2, "succeeded": 1, "failed": 1, "invalid": 2, "duplicates": 2
+    }
+    # Duplicates were analyzed once
+    assert calls["/users/octo"] == 1
+
+def test_uploaded_file_skips_its_header_row(run_api):
+    calls = Counter()
+    _, _, lines = post_batch(run_api, calls, files={
+        "file": ("cohort.csv", b"github\r\nocto\r\nhttps://github.com/hubot\r\n", "text/csv")
+    })
+    assert sorted(line["username"] for line in lines[:-1]) == ["hubot", "octo"]
+    assert lines[-1]["invalid"] == 0
+
+def test_batch_without_usernames_is_rejected(run_api):
+    calls = Counter()
+    status, _, lines = post_batch(run_api, calls, content=b"   ")
+    assert status == 400
+    assert lines == [{"detail": "No usernames provided"}]
+    assert not calls
@@ -0,0 +1,80 @@
+import sqlite3
+import time
+
+import pytest
+
+from app.services.cache_service import MemoryCache, SQLiteCache, TieredCache
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteCache(str(tmp_path / "cache.sqlite3"))
+    yield store
+    store.close()
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+def test_sqlite_round_trip_and_expiry(store):
+    store.set("live", {"value": 1})
+    store.set("expired", {"value": 2}, ttl=-1)
+    store.flush()
+    
+    assert store.get("live") == {"value": 1}
+    assert store.get("expired") is None
+
+def test_disk_entries_are_promoted_to_memory(store):
+    TieredCache("profile", MemoryCache(), store).set("octo", {"score": 80})
+    store.flush()
+    
+    # A second worker starts with an empty memory tier
+    other = TieredCache("profile", MemoryCache(), store)
+    assert other.get("octo") == {"score": 80}
+    assert other.get("octo") == {"score": 80}
+    assert (other.disk_hits, other.memory_hits) == (1, 1)
+
+def test_locked_database_does_not_block_callers(store):
+    # Another worker holds the write lock
+    blocker = sqlite3.connect(store.path, isolation_level=None)
+    blocker.execute("BEGIN IMMEDIATE")
+    try:
+        cache = TieredCache("repo", MemoryCache(), store)
+        started = time.monotonic()
+        cache.set("octo/project", {"score": 1})
+        cache.delete("octo/project")
+        cache.get("octo/other")
+        assert time.monotonic() - started < 0.5
+    finally:
+        blocker.execute("ROLLBACK")
+        blocker.close()
+    store.flush()
+    assert store.stats()["pending_writes"] == 0
+
+def test_failing_disk_delete_only_logs(store, monkeypatch):
+    def locked(key):
+        raise sqlite3.OperationalError("database is locked")
+    monkeypatch.setattr(store, "delete", locked)
+    cache = TieredCache("profile", MemoryCache(), store)
+    cache.set("octo", {"score": 1})
+    
+    cache.delete("octo")
+    assert cache.memory.get("octo") is None
+
+def test_full_write_queue_drops_writes(tmp_path):
+    store = SQLiteCache(str(tmp_path / "cache.sqlite3"), max_pending=1)
+    blocker = sqlite3.connect(store.path, isolation_level=None)
+    blocker.execute("BEGIN IMMEDIATE")
+    try:
+        for index in range(5):
+            store.set(f"key-{index}", index)
+        assert store.dropped_writes > 0
+    finally:
+        blocker.execute("ROLLBACK")
+        blocker.close()
+        store.close()
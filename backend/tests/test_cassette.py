@@ -0,0 +1,93 @@
+import asyncio
+import gzip
+import time
+
+import httpx
+
+from app.services.cassette import RECORD, REPLAY, CassetteTransport
+
+BASE = "https://api.github.com"
+
+def live_github(sent):
+    """Stand-in for GitHub: a compressed JSON body, a binary body and a changing counter"""
+    def handler(request):
+        sent.append(request)
+        if request.url.path == "/octo.png":
+            return httpx.Response(200, content=b"\x89PNG\x00\xff")
+        if request.url.path == "/counter":
+            return httpx.Response(200, json={"count": len(sent)})
+        return httpx.Response(
+            200,
+            content=gzip.compress(b'{"Python": 1000}'),
+            headers={"content-encoding": "gzip", "etag": '"v1"', "x-ratelimit-reset": str(int(time.time()) + 600)}
+        )
+    return handler
+
+async def exchange(transport, requests):
+    async with httpx.AsyncClient(transport=transport, base_url=BASE) as client:
+        return [await client.get(path, **options) for path, options in requests]
+
+REQUESTS = [
+    ("/repos/octo/demo/languages", {"params": {"b": 2, "a": 1}, "headers": {"Authorization": "token one"}}),
+    ("/octo.png", {}),
+    ("/counter", {}),
+    ("/counter", {}),
+]
+
+def test_recorded_responses_replay_offline(tmp_path):
+    path = str(tmp_path / "github.json.gz")
+    sent = []
+    recorded = asyncio.run(exchange(CassetteTransport(RECORD, path, inner=httpx.MockTransport(live_github(sent))), [
+        (route, {**options, "headers": {**options.get("headers", {}), "If-None-Match": '"v0"'}})
+        for route, options in REQUESTS
+    ]))
+    assert all("if-none-match" not in request.headers for request in sent)
+    
+    offline = CassetteTransport(REPLAY, path, inner=httpx.MockTransport(live_github(sent)), latency=0, jitter=0)
+    replayed = asyncio.run(exchange(offline, [
+        # Different credentials and query order still match the recording
+        ("/repos/octo/demo/languages", {"params": {"a": 1, "b": 2}, "headers": {"Authorization": "token two"}}),
+        ("/octo.png", {}),
+        ("/counter", {}),
+        ("/counter", {}),
+        ("/counter", {}),
+    ]))
+    
+    assert len(sent) == 4
+    assert [response.content for response in replayed[:4]] == [response.content for response in recorded]
+    assert replayed[0].json() == {"Python": 1000}
+    assert replayed[0].headers["etag"] == '"v1"'
+    assert replayed[1].content == b"\x89PNG\x00\xff"
+    # Repeated requests walk through their recordings, then repeat the last one
+    assert [response.json()["count"] for response in replayed[2:]] == [3, 4, 4]
+    assert offline.stats()["hits"] == 5
+
+def test_rate_limit_reset_moves_with_the_replay(tmp_path):
+    path = str(tmp_path / "github.json.gz")
+    asyncio.run(exchange(CassetteTransport(RECORD, path, inner=httpx.MockTransport(live_github([]))), REQUESTS[:1]))
+    
+    offline = CassetteTransport(REPLAY, path, latency=0, jitter=0)
+    offline.interactions = {
+        key: [{**interaction, "recorded_at": interaction["recorded_at"] - 3600} for interaction in recorded]
+        for key, recorded in offline.interactions.items()
+    }
+    response = asyncio.run(exchange(offline, REQUESTS[:1]))[0]
+    assert 3500 < int(response.headers["x-ratelimit-reset"]) - time.time() <= 4200
+
+def test_unrecorded_requests_miss(tmp_path):
+    offline = CassetteTransport(REPLAY, str(tmp_path / "empty.json.gz"), latency=0, jitter=0)
+    response = asyncio.run(exchange(offline, [("/users/octo", {})]))[0]
+    assert response.status_code == 404
+    assert offline.stats()["misses"] == 1
+
+def test_replay_injects_seeded_errors(tmp_path):
+    path = str(tmp_path / "github.json.gz")
+    asyncio.run(exchange(CassetteTransport(RECORD, path, inner=httpx.MockTransport(live_github([]))), REQUESTS[:1]))
+    
+    def statuses():
+        offline = CassetteTransport(REPLAY, path, latency=0, jitter=0, error_rate=0.5, seed=1)
+        return [response.status_code for response in asyncio.run(exchange(offline, REQUESTS[:1] * 20))]
+    
+    first = statuses()
+    assert first == statuses()
+    assert {200, 502} == set(first)
@@ -0,0 +1,94 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.services.analysis_cache import RepoAnalysisCache
+from app.services.analyzer_service import AnalyzerService
+from app.services.exceptions import DeadlineExceeded
+from app.services.fetch_planner import FetchPlanner
+from app.services.rate_limiter import RateLimitScheduler
+from app.utils.deadline import Deadline, current_deadline, reset_deadline, set_deadline
+
+REPO = {
+    "name": "project",
+    "full_name": "octo/project",
+    "owner": {"login": "octo"},
+    "description": None,
+    "html_url": "https://github.com/octo/project",
+    "stargazers_count": 0,
+    "forks_count": 0,
+    "open_issues_count": 0,
+    "created_at": "2024-01-01T00:00:00Z",
+    "updated_at": "2024-03-01T00:00:00Z",
+    "pushed_at": "2024-03-01T00:00:00Z",
+    "language": "Python",
+    "size": 120
+}
+
+def within(deadline, coroutine):
+    """Run a coroutine with `deadline` current, as PortfolioService does"""
+    async def run():
+        token = set_deadline(deadline)
+        try:
+            return await coroutine
+        finally:
+            reset_deadline(token)
+    return asyncio.run(run())
+
+def test_deadline_counts_down_and_keeps_a_reserve():
+    deadline = Deadline(10)
+    assert 9 < deadline.remaining() <= 10
+    assert deadline.remaining(reserve=20) == 0
+    assert not deadline.expired
+    assert Deadline(0).expired
+
+def test_spawned_tasks_inherit_the_deadline():
+    deadline = Deadline(5)
+    
+    async def child():
+        return current_deadline()
+    
+    async def spawn():
+        return await asyncio.ensure_future(child())
+    
+    assert within(deadline, spawn()) is deadline
+    assert current_deadline() is None
+
+def test_expired_deadline_fails_before_calling_github(make_service):
+    requests = []
+    service = make_service(lambda request: requests.append(request) or httpx.Response(200, json={}))
+    
+    with pytest.raises(DeadlineExceeded):
+        within(Deadline(0), service.get_languages("octo", "project"))
+    assert requests == []
+
+def test_rate_limit_wait_beyond_the_deadline_fails_fast():
+    scheduler = RateLimitScheduler()
+    scheduler.budget("anonymous").blocked_until = time.time() + 30
+    
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        within(Deadline(1), scheduler.acquire("anonymous"))
+    assert time.monotonic() - started < 0.5
+
+def test_slow_fetches_are_abandoned_and_marked_timed_out(make_service, monkeypatch):
+    monkeypatch.setattr("app.config.Config.DEADLINE_SCORING_RESERVE", 0.05)
+    
+    async def github(request):
+        if request.url.path.endswith("/commits"):
+            await asyncio.sleep(5)
+        if request.url.path.endswith("/readme"):
+            return httpx.Response(404)
+        return httpx.Response(200, json={"Python": 100})
+    analyzer = AnalyzerService(make_service(github), planner=FetchPlanner(), cache=RepoAnalysisCache())
+    
+    started = time.monotonic()
+    analysis = within(Deadline(0.3), analyzer.analyze_repository(REPO))
+    assert time.monotonic() - started < 1
+    assert analysis["fetch_status"] == {"readme": "complete", "languages": "complete", "commits": "timed_out"}
+    assert analysis["status"] == "degraded"
+    assert analysis["languages"] == {"Python": 100}
+    # Partial analyses are not remembered
+    assert analyzer.cache.get(REPO) is None
@@ -0,0 +1,94 @@
+import asyncio
+import time
+
+import pytest
+from starlette.requests import Request
+
+from app.api.routes import analyze_github_profile
+from app.services.rate_limiter import RateLimitScheduler
+from app.utils.disconnect import ClientDisconnected, cancel_on_disconnect
+from app.utils.single_flight import SingleFlight
+
+def client_request(disconnect_after=None):
+    """An ASGI request whose client goes away after `disconnect_after` seconds, or never"""
+    async def receive():
+        if disconnect_after is None:
+            await asyncio.Event().wait()
+        await asyncio.sleep(disconnect_after)
+        return {"type": "http.disconnect"}
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": []}, receive)
+
+class SlowPortfolio:
+    """Stands in for PortfolioService, recording whether its analysis was cancelled"""
+    
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.cancelled = False
+    
+    async def analyze(self, username, **kwargs):
+        try:
+            await asyncio.sleep(self.seconds)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return {"username": username}
+
+def analyze(portfolio, request):
+    return asyncio.run(analyze_github_profile(
+        request, "octo", max_age=None, force_refresh=False, deadline=None, portfolio=portfolio
+    ))
+
+def test_result_is_returned_while_client_is_connected():
+    portfolio = SlowPortfolio(0.01)
+    assert analyze(portfolio, client_request()) == {"username": "octo"}
+
+def test_disconnect_cancels_the_analysis_and_answers_499():
+    portfolio = SlowPortfolio(10)
+    response = analyze(portfolio, client_request(disconnect_after=0.01))
+    assert response.status_code == 499
+    assert portfolio.cancelled
+
+def test_cancelled_work_unwinds_before_client_disconnected_is_raised():
+    unwound = []
+    
+    async def work():
+        try:
+            await asyncio.sleep(10)
+        finally:
+            await asyncio.sleep(0)
+            unwound.append(True)
+    
+    async def main():
+        await cancel_on_disconnect(client_request(disconnect_after=0.01), work())
+    
+    with pytest.raises(ClientDisconnected):
+        asyncio.run(main())
+    assert unwound == [True]
+
+def test_disconnect_leaves_shared_analysis_running_for_other_waiters():
+    flights = SingleFlight()
+    
+    async def work():
+        await asyncio.sleep(0.05)
+        return "profile"
+    
+    async def main():
+        staying = asyncio.ensure_future(flights.do("octo", work))
+        with pytest.raises(ClientDisconnected):
+            await cancel_on_disconnect(client_request(disconnect_after=0.01), flights.do("octo", work))
+        return await staying
+    
+    assert asyncio.run(main()) == "profile"
+    assert flights.stats()["cancelled"] == 0
+
+def test_queued_github_request_is_dropped_on_cancellation():
+    scheduler = RateLimitScheduler()
+    scheduler.budget("anonymous").blocked_until = time.time() + 5
+    
+    async def main():
+        with pytest.raises(ClientDisconnected):
+            await cancel_on_disconnect(client_request(disconnect_after=0.01), scheduler.acquire("anonymous"))
+    
+    asyncio.run(main())
+    assert scheduler.cancelled == 1
+    assert scheduler.snapshot()["queued_requests"] == 0
@@ -0,0 +1,60 @@
+from app.services.fetch_planner import FetchPlanner
+
+def listing(**fields):
+    repo = {
+        "full_name": "octo/project",
+        "created_at": "2024-01-01T00:00:00Z",
+        "pushed_at": "2024-03-01T00:00:00Z",
+        "language": "Python",
+        "size": 120
+    }
+    repo.update(fields)
+    return repo
+
+def test_regular_repository_fetches_everything():
+    plan = FetchPlanner().plan(listing())
+    assert plan.fetch == ["readme", "languages", "commits"]
+    assert plan.skipped == {}
+
+def test_never_pushed_repository_skips_everything():
+    planner = FetchPlanner()
+    plan = planner.plan(listing(pushed_at=None, language=None, size=0))
+    assert plan.fetch == []
+    assert set(plan.skipped) == {"readme", "languages", "commits"}
+    assert planner.stats()["calls_skipped"] == 3
+
+def test_repository_pushed_at_creation_skips_everything():
+    # GitHub stamps pushed_at with the creation time of an empty repository
+    plan = FetchPlanner().plan(listing(
+        created_at="2024-01-01T00:00:00Z", pushed_at="2024-01-01T00:00:00Z", language=None, size=0
+    ))
+    assert plan.fetch == []
+
+def test_auto_initialized_repository_keeps_readme_and_commits():
+    # GitHub reports size 0 for a repository created with a README and an initial commit
+    plan = FetchPlanner().plan(listing(
+        created_at="2024-01-01T00:00:00Z", pushed_at="2024-01-01T00:00:05Z", language=None, size=0
+    ))
+    assert plan.fetch == ["readme", "commits"]
+    assert plan.skipped == {"languages": "no detected language"}
+
+def test_language_without_size_still_fetches_languages():
+    plan = FetchPlanner().plan(listing(size=0))
+    assert "languages" in plan.fetch
+
+def test_unchanged_repository_reuses_stored_responses():
+    planner = FetchPlanner()
+    repo = listing()
+    assert not planner.plan(repo).reuse_stored
+    planner.record_fetched(repo)
+    
+    assert planner.plan(repo).reuse_stored
+    assert not planner.plan(listing(pushed_at="2024-04-01T00:00:00Z")).reuse_stored
+
+def test_remembered_repositories_are_bounded():
+    planner = FetchPlanner(max_entries=2)
+    for index in range(3):
+        planner.record_fetched(listing(full_name=f"octo/project-{index}"))
+    
+    assert not planner.plan(listing(full_name="octo/project-0")).reuse_stored
+    assert planner.plan(listing(full_name="octo/project-2")).reuse_stored
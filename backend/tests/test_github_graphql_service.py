@@ -0,0 +1,144 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.config import Config
+from app.services.exceptions import GitHubAPIError
+from app.services.github_graphql_service import GitHubGraphQLService
+
+USER = {
+    "login": "octo",
+    "name": "Octo",
+    "bio": None,
+    "avatarUrl": "https://avatars.example.com/octo",
+    "url": "https://github.com/octo",
+    "createdAt": "2020-01-01T00:00:00Z",
+    "updatedAt": "2024-01-01T00:00:00Z",
+    "followers": {"totalCount": 3},
+    "following": {"totalCount": 1},
+    "contributionsCollection": {
+        "totalCommitContributions": 10,
+        "totalIssueContributions": 1,
+        "totalPullRequestContributions": 2,
+        "totalPullRequestReviewContributions": 0,
+        "totalRepositoryContributions": 1
+    },
+    "publicRepositories": {"totalCount": 0},
+    "repositories": {"pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": []}
+}
+
+def graphql_answer(payload):
+    return lambda request: httpx.Response(200, json=payload)
+
+def test_unknown_user_is_not_found(make_service):
+    service = make_service(graphql_answer({
+        "data": {"user": None},
+        "errors": [{"type": "NOT_FOUND", "path": ["user"], "message": "Could not resolve to a User"}]
+    }), service_class=GitHubGraphQLService)
+    
+    with pytest.raises(GitHubAPIError) as error:
+        asyncio.run(service.get_user_profile("ghost"))
+    assert error.value.status_code == 404
+
+def test_null_user_without_error_type_is_not_found(make_service):
+    service = make_service(graphql_answer({
+        "data": {"user": None},
+        "errors": [{"message": "Could not resolve to a User"}]
+    }), service_class=GitHubGraphQLService)
+    
+    with pytest.raises(GitHubAPIError) as error:
+        asyncio.run(service.get_user_profile("ghost"))
+    assert error.value.status_code == 404
+
+def test_other_errors_carry_no_status(make_service):
+    service = make_service(graphql_answer({
+        "data": None,
+        "errors": [{"type": "MAX_NODE_LIMIT_EXCEEDED", "message": "Too many nodes"}]
+    }), service_class=GitHubGraphQLService)
+    
+    with pytest.raises(GitHubAPIError) as error:
+        asyncio.run(service.get_user_profile("octo"))
+    assert error.value.status_code is None
+
+def test_profile_matches_rest_shape(make_service):
+    service = make_service(graphql_answer({"data": {"user": USER}}), service_class=GitHubGraphQLService)
+    
+    profile = asyncio.run(service.get_user_profile("octo"))
+    assert profile["fetch_status"] == {"events": "complete"}
+    assert profile["recent_activity"] == 14
+
+def node(index, readme=None):
+    return {
+        "name": f"repo-{index}", "nameWithOwner": f"octo/repo-{index}", "description": None,
+        "url": f"https://github.com/octo/repo-{index}", "stargazerCount": 0, "forkCount": 0,
+        "diskUsage": 10, "createdAt": "2020-01-01T00:00:00Z", "updatedAt": "2024-01-01T00:00:00Z",
+        "pushedAt": "2024-01-01T00:00:00Z", "isFork": False, "isArchived": False,
+        "hasIssuesEnabled": True, "hasProjectsEnabled": True, "hasWikiEnabled": True,
+        "owner": {"login": "octo"}, "primaryLanguage": None, "openIssues": {"totalCount": 0},
+        "languages": {"edges": []}, "readmeUpper": readme, "defaultBranchRef": None
+    }
+
+def paged_listing(total, page_size):
+    cursors = []
+    
+    def handler(request):
+        cursor = json.loads(request.content)["variables"]["cursor"]
+        cursors.append(cursor)
+        start = int(cursor or 0)
+        end = min(start + page_size, total)
+        return httpx.Response(200, json={"data": {"user": {**USER, "repositories": {
+            "pageInfo": {"hasNextPage": end < total, "endCursor": str(end)},
+            "nodes": [node(index) for index in range(start, end)]
+        }}}})
+    return handler, cursors
+
+def test_listing_follows_cursors_past_one_hundred_repositories(make_service, monkeypatch):
+    monkeypatch.setattr(Config, "GRAPHQL_PAGE_SIZE", 50)
+    handler, cursors = paged_listing(230, 50)
+    service = make_service(handler, service_class=GitHubGraphQLService)
+    
+    repositories = asyncio.run(service.get_repositories("octo"))
+    assert len(repositories) == 230
+    assert cursors == [None, "50", "100", "150", "200"]
+
+def test_listing_stops_at_the_rest_listing_ceiling(make_service, monkeypatch):
+    monkeypatch.setattr(Config, "GRAPHQL_PAGE_SIZE", 50)
+    monkeypatch.setattr(Config, "MAX_REPOS_TO_LIST", 120)
+    handler, cursors = paged_listing(230, 50)
+    service = make_service(handler, service_class=GitHubGraphQLService)
+    
+    assert len(asyncio.run(service.get_repositories("octo"))) == 120
+    assert len(cursors) == 3
+
+def test_oversized_readme_is_streamed_over_rest(make_service, monkeypatch):
+    monkeypatch.setattr(Config, "README_MAX_BYTES", 1024)
+    small, large = "# small", "x" * 4096
+    
+    def handler(request):
+        if request.url.path == "/graphql":
+            return httpx.Response(200, json={"data": {"user": {**USER, "repositories": {
+                "pageInfo": {"hasNextPage": False, "endCursor": None},
+                "nodes": [
+                    node(0, {"byteSize": len(small), "text": small}),
+                    node(1, {"byteSize": len(large), "text": large})
+                ]
+            }}}})
+        assert request.url.path == "/repos/octo/repo-1/readme"
+        return httpx.Response(200, content=large.encode())
+    
+    service = make_service(handler, service_class=GitHubGraphQLService)
+    
+    async def main():
+        await service.get_repositories("octo")
+        assert service._cached_repo("octo", "repo-1")["readmeUpper"]["text"] is None
+        chunks = {0: [], 1: []}
+        results = [await service.stream_readme("octo", f"repo-{i}", chunks[i].append) for i in (0, 1)]
+        return results, chunks
+    
+    (first, second), chunks = asyncio.run(main())
+    assert first == {"found": True, "size": len(small), "truncated": False}
+    assert "".join(chunks[0]) == small
+    assert second["found"] and second["truncated"]
+    assert len("".join(chunks[1])) == 1024
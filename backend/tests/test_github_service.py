@@ -0,0 +1,47 @@
+import asyncio
+import gzip
+import random
+import string
+
+import httpx
+
+from app.config import Config
+
+# Random words compress poorly, so the gzip body is still far larger than the cap
+rng = random.Random(3)
+README = ("# Demo\n\n" + " ".join(
+    "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9))) for _ in range(1000)
+)).encode("utf-8")
+
+def readme_answer(compressed):
+    def handler(request):
+        if compressed:
+            return httpx.Response(200, content=gzip.compress(README), headers={"content-encoding": "gzip"})
+        return httpx.Response(200, content=README)
+    return handler
+
+def stream(service):
+    chunks = []
+    readme = asyncio.run(service.stream_readme("octo", "demo", chunks.append))
+    return readme, "".join(chunks)
+
+def test_compressed_readme_size_counts_decoded_bytes(make_service):
+    readme, text = stream(make_service(readme_answer(compressed=True)))
+    assert readme == {"found": True, "size": len(README), "truncated": False}
+    assert text.encode("utf-8") == README
+
+def test_truncated_compressed_readme_reports_bytes_read(make_service, monkeypatch):
+    monkeypatch.setattr(Config, "README_MAX_BYTES", 1000)
+    readme, text = stream(make_service(readme_answer(compressed=True)))
+    assert readme == {"found": True, "size": 1000, "truncated": True}
+    assert len(text) == 1000
+
+def test_truncated_uncompressed_readme_reports_full_size(make_service, monkeypatch):
+    monkeypatch.setattr(Config, "README_MAX_BYTES", 1000)
+    readme, _ = stream(make_service(readme_answer(compressed=False)))
+    assert readme == {"found": True, "size": len(README), "truncated": True}
+
+def test_missing_readme_is_not_found(make_service):
+    readme, text = stream(make_service(lambda request: httpx.Response(404)))
+    assert readme == {"found": False, "size": 0, "truncated": False}
+    assert text == ""
@@ -0,0 +1,43 @@
+import pytest
+
+from app.utils.helpers import extract_username_from_url, normalize_usernames
+
+@pytest.mark.parametrize("url, username", [
+    ("https://github.com/octocat", "octocat"),
+    ("https://github.com/octocat/", "octocat"),
+    ("https://GitHub.com/Foo", "Foo"),
+    ("https://github.com/bar?tab=repositories", "bar"),
+    ("https://github.com/bar#readme", "bar"),
+    ("https://www.github.com/octocat/hello-world", "octocat"),
+    ("github.com/octocat", "octocat"),
+    ("http://github.com:443/octocat", "octocat"),
+])
+def test_extracts_first_path_segment(url, username):
+    assert extract_username_from_url(url) == username
+
+@pytest.mark.parametrize("url", [
+    "https://github.com/orgs/x",
+    "https://github.com/settings/profile",
+    "https://github.com/topics/python",
+    "https://github.com/",
+    "https://gist.github.com/octocat",
+    "https://notgithub.com/octocat",
+    "https://example.com/github.com/octocat",
+])
+def test_rejects_urls_that_are_not_profiles(url):
+    assert extract_username_from_url(url) is None
+
+def test_normalize_mixes_usernames_and_urls():
+    usernames, invalid, duplicates = normalize_usernames([
+        "octocat",
+        " https://GitHub.com/Foo ",
+        "https://github.com/bar?tab=repositories",
+        "@baz",
+        "https://github.com/OCTOCAT",
+        "https://github.com/orgs/x",
+        "not a user!",
+        ""
+    ])
+    assert usernames == ["octocat", "Foo", "bar", "baz"]
+    assert invalid == ["https://github.com/orgs/x", "not a user!"]
+    assert duplicates == 1
@@ -0,0 +1,43 @@
+import asyncio
+
+import httpx
+from starlette.requests import Request
+
+from app.api.dependencies import get_github_service
+from app.services.github_service import GitHubService
+from app.services.http_client import create_github_client
+
+def test_client_pool_is_configured_for_github():
+    client = create_github_client(transport=httpx.MockTransport(lambda request: httpx.Response(200)))
+    assert client.headers["accept"] == "application/vnd.github.v3+json"
+    asyncio.run(client.aclose())
+
+def test_injected_client_is_shared_and_left_open():
+    async def main():
+        shared = create_github_client(transport=httpx.MockTransport(lambda request: httpx.Response(200)))
+        for _ in range(2):
+            async with GitHubService(client=shared) as service:
+                assert service.client is shared
+        assert not shared.is_closed
+        await shared.aclose()
+    asyncio.run(main())
+
+def test_standalone_service_closes_its_own_client():
+    async def main():
+        async with GitHubService() as service:
+            client = service.client
+        return client
+    assert asyncio.run(main()).is_closed
+
+def test_requests_share_the_application_client():
+    from app.main import app, lifespan
+    
+    async def main():
+        async with lifespan(app):
+            request = Request({"type": "http", "app": app, "headers": []})
+            first, second = get_github_service(request), get_github_service(request)
+            assert first.client is second.client is app.state.github_client
+            client = app.state.github_client
+        return client
+    
+    assert asyncio.run(main()).is_closed
@@ -0,0 +1,65 @@
+import asyncio
+
+import httpx
+
+from app.services.exceptions import GitHubAPIError, RateLimitExceeded
+from app.services.job_service import AnalysisJob, JobManager
+
+def run_job(runner):
+    async def main():
+        jobs = JobManager(workers=1)
+        jobs.start()
+        try:
+            job = jobs.submit(("analyze", "octo"), "octo", runner)
+            while not job.done:
+                await asyncio.sleep(0.001)
+            return job.to_dict()
+        finally:
+            await jobs.close()
+    return asyncio.run(main())
+
+def failing(error):
+    async def runner(job):
+        raise error
+    return runner
+
+def test_completed_job_reports_its_result():
+    async def runner(job):
+        job.report_progress(1, 2)
+        return {"username": "octo", "repositories": [{}, {}]}
+    
+    job = run_job(runner)
+    assert job["status"] == AnalysisJob.COMPLETED
+    assert job["progress"] == {"repos_done": 2, "repos_total": 2}
+    assert job["status_code"] is None
+
+def test_unknown_user_fails_with_404():
+    job = run_job(failing(GitHubAPIError("GitHub API error: Client error '404 Not Found'", 404)))
+    assert job["status"] == AnalysisJob.FAILED
+    assert job["status_code"] == 404
+    assert job["error"] == "GitHub user not found"
+
+def test_rejected_credentials_fail_as_unavailable():
+    job = run_job(failing(GitHubAPIError("Bad credentials", 401)))
+    assert job["status_code"] == 503
+    assert "Bad credentials" not in job["error"]
+    assert job["retry_after"] > 0
+
+def test_exhausted_rate_limit_is_retryable():
+    job = run_job(failing(RateLimitExceeded("GitHub rate limit exhausted", retry_after=42)))
+    assert (job["status_code"], job["retry_after"]) == (503, 42)
+
+def test_unexpected_failure_is_500():
+    assert run_job(failing(ValueError("boom")))["status_code"] == 500
+
+def test_job_for_unknown_user_reports_404_over_the_api(run_api):
+    async def scenario(client, app):
+        submitted = (await client.post("/api/v1/jobs/analyze", json={"username": "ghost"})).json()
+        while True:
+            job = (await client.get(f"/api/v1/jobs/{submitted['job_id']}")).json()
+            if job["status"] == AnalysisJob.FAILED:
+                return job
+            await asyncio.sleep(0.001)
+    
+    job = run_api(lambda request: httpx.Response(404, json={"message": "Not Found"}), scenario)
+    assert (job["status_code"], job["error"]) == (404, "GitHub user not found")
@@ -0,0 +1,182 @@
+import asyncio
+import math
+import time
+from collections import Counter
+
+import httpx
+
+from app.config import Config
+from app.github_simulator import SimulatorSettings, create_simulator
+from app.services.analyzer_service import AnalyzerService
+from app.services.portfolio_service import PortfolioService
+from app.utils.deadline import Deadline, current_deadline
+
+def simulated_github(calls: Counter, gate: asyncio.Event = None):
+    """Answer requests from the synthetic GitHub, counting them by path"""
+    transport = httpx.ASGITransport(app=create_simulator(SimulatorSettings(repos_median=3, repos_max=6)))
+    
+    async def handler(request):
+        calls[request.url.path] += 1
+        if gate is not None:
+            await gate.wait()
+        return await transport.handle_async_request(request)
+    return handler
+
+def make_portfolio(make_service, calls: Counter, gate: asyncio.Event = None, **options) -> PortfolioService:
+    github = make_service(simulated_github(calls, gate))
+    return PortfolioService(github, AnalyzerService(github), **options)
+
+def test_concurrent_requests_share_one_analysis(make_service):
+    calls = Counter()
+    
+    async def main():
+        gate = asyncio.Event()
+        portfolio = make_portfolio(make_service, calls, gate)
+        callers = [asyncio.ensure_future(portfolio.analyze(name)) for name in ("octo", "Octo", "OCTO", "octo")]
+        await asyncio.sleep(0.01)
+        # Every caller joined before GitHub answered anything
+        assert portfolio.flights.stats()["in_flight"] == 1
+        gate.set()
+        return await asyncio.gather(*callers)
+    
+    profiles = asyncio.run(main())
+    assert calls["/users/octo"] == 1
+    assert calls["/users/octo/repos"] == 1
+    assert len({profile["analyzed_at"] for profile in profiles}) == 1
+
+def test_different_repository_limits_run_separately(make_service):
+    calls = Counter()
+    
+    async def main():
+        portfolio = make_portfolio(make_service, calls)
+        return await asyncio.gather(portfolio.analyze("octo", max_repos=1), portfolio.analyze("octo", max_repos=2))
+    
+    one, two = asyncio.run(main())
+    assert calls["/users/octo"] == 2
+    assert len(one["repositories"]) == 1
+    assert len(two["repositories"]) == 2
+
+def test_failed_run_is_not_shared_with_later_callers(make_service):
+    calls = Counter()
+    
+    async def main():
+        portfolio = make_portfolio(make_service, calls)
+        first = await asyncio.gather(portfolio.analyze("ghost-user"), portfolio.analyze("ghost-user"),
+                                     return_exceptions=True)
+        second = await asyncio.gather(portfolio.analyze("ghost-user"), return_exceptions=True)
+        return first + second
+    
+    errors = asyncio.run(main())
+    assert all(getattr(error, "status_code", None) == 404 for error in errors)
+    assert calls["/users/ghost-user"] == 2
+
+async def settle(portfolio):
+    while portfolio.flights.stats()["in_flight"]:
+        await asyncio.sleep(0.01)
+
+def test_stale_profile_is_served_while_it_refreshes(make_service, monkeypatch):
+    monkeypatch.setattr(Config, "PROFILE_CACHE_TTL", 0)
+    monkeypatch.setattr(Config, "PROFILE_STALE_TTL", 3600)
+    calls = Counter()
+    
+    async def main():
+        portfolio = make_portfolio(make_service, calls)
+        first = await portfolio.analyze("octo")
+        await asyncio.sleep(0.01)
+        
+        second = await portfolio.analyze("octo")
+        # Answered from the cache, with the refresh still running in the background
+        assert calls["/users/octo"] == 1
+        assert portfolio.flights.stats()["in_flight"] == 1
+        await settle(portfolio)
+        third = await portfolio.analyze("octo")
+        return first, second, third
+    
+    first, second, third = asyncio.run(main())
+    assert not first["stale"]
+    assert second["stale"] and second["analyzed_at"] == first["analyzed_at"]
+    assert third["analyzed_at"] > first["analyzed_at"]
+    assert calls["/users/octo"] == 2
+
+def test_max_age_never_serves_stale(make_service, monkeypatch):
+    monkeypatch.setattr(Config, "PROFILE_CACHE_TTL", 0)
+    monkeypatch.setattr(Config, "PROFILE_STALE_TTL", 3600)
+    calls = Counter()
+    
+    async def main():
+        portfolio = make_portfolio(make_service, calls)
+        first = await portfolio.analyze("octo")
+        await asyncio.sleep(0.01)
+        return first, await portfolio.analyze("octo", max_age=0)
+    
+    first, second = asyncio.run(main())
+    assert not second["stale"]
+    assert second["analyzed_at"] > first["analyzed_at"]
+    assert calls["/users/octo"] == 2
+
+def test_profile_past_the_stale_window_is_analyzed_again(make_service, monkeypatch):
+    monkeypatch.setattr(Config, "PROFILE_CACHE_TTL", 0)
+    monkeypatch.setattr(Config, "PROFILE_STALE_TTL", 0)
+    calls = Counter()
+    
+    async def main():
+        portfolio = make_portfolio(make_service, calls)
+        await portfolio.analyze("octo")
+        await asyncio.sleep(0.01)
+        return await portfolio.analyze("octo")
+    
+    assert not asyncio.run(main())["stale"]
+    assert calls["/users/octo"] == 2
+
+def deadline_recording(make_service, calls, seen):
+    """A portfolio whose GitHub records the deadline each profile request ran under"""
+    inner = simulated_github(calls)
+    
+    async def handler(request):
+        if request.url.path == "/users/octo":
+            seen.append(current_deadline().expires_at)
+        return await inner(request)
+    github = make_service(handler)
+    return PortfolioService(github, AnalyzerService(github))
+
+def test_callers_with_different_deadlines_run_separately(make_service):
+    calls, seen = Counter(), []
+    
+    async def main():
+        portfolio = deadline_recording(make_service, calls, seen)
+        short, long = Deadline(5), Deadline(30)
+        await asyncio.gather(portfolio.analyze("octo", deadline=short), portfolio.analyze("octo", deadline=long))
+        return short, long
+    
+    short, long = asyncio.run(main())
+    assert calls["/users/octo"] == 2
+    # Each run works under its own caller's deadline
+    assert sorted(seen) == [short.expires_at, long.expires_at]
+
+def test_callers_with_deadlines_in_one_bucket_share_a_run(make_service):
+    calls, seen = Counter(), []
+    bucket = Config.DEADLINE_FLIGHT_BUCKET
+    start = (math.floor(time.monotonic() / bucket) + 30) * bucket
+    
+    async def main():
+        portfolio = deadline_recording(make_service, calls, seen)
+        deadlines = [Deadline.at(start + 0.7 * bucket), Deadline.at(start + 0.2 * bucket)]
+        await asyncio.gather(*(portfolio.analyze("octo", deadline=deadline) for deadline in deadlines))
+    
+    asyncio.run(main())
+    assert calls["/users/octo"] == 1
+    # The caller that joined with the earlier deadline pulled the shared run's deadline in
+    assert seen == [start + 0.2 * bucket]
+
+def test_short_deadline_still_gets_its_full_budget(make_service):
+    calls, seen = Counter(), []
+    
+    async def main():
+        portfolio = deadline_recording(make_service, calls, seen)
+        deadline = Deadline(0.2 * Config.DEADLINE_FLIGHT_BUCKET)
+        profile = await portfolio.analyze("octo", deadline=deadline)
+        return deadline, profile
+    
+    deadline, profile = asyncio.run(main())
+    assert seen == [deadline.expires_at]
+    assert profile["user_data"]["login"] == "octo"
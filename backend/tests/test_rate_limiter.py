@@ -0,0 +1,85 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.services.exceptions import RateLimitExceeded
+from app.services.rate_limiter import RateLimitScheduler
+
+def github_response(status=200, **headers):
+    return httpx.Response(status, headers={name.replace("_", "-"): str(value) for name, value in headers.items()})
+
+def test_budget_follows_rate_limit_headers():
+    scheduler = RateLimitScheduler()
+    budget = scheduler.budget("a")
+    reset = time.time() + 600
+    scheduler.update(budget, github_response(
+        x_ratelimit_limit=5000, x_ratelimit_remaining=4321, x_ratelimit_reset=reset
+    ))
+    
+    assert (budget.limit, budget.remaining, budget.reset_at) == (5000, 4321, reset)
+    assert budget.blocked_until == 0
+
+def test_retry_after_blocks_the_token():
+    scheduler = RateLimitScheduler()
+    budget = scheduler.budget("a")
+    scheduler.update(budget, github_response(429, retry_after=30))
+    
+    assert 29 < budget.blocked_until - time.time() <= 30
+    assert 29 < scheduler._wait_time(budget) <= 30
+
+def test_exhausted_primary_limit_blocks_until_reset():
+    scheduler = RateLimitScheduler()
+    budget = scheduler.budget("a")
+    reset = time.time() + 120
+    scheduler.update(budget, github_response(403, x_ratelimit_remaining=0, x_ratelimit_reset=reset))
+    
+    assert budget.blocked_until == reset + 1
+
+def test_forbidden_without_rate_limit_signal_is_not_a_rate_limit():
+    assert not RateLimitScheduler.is_rate_limited(github_response(403, x_ratelimit_remaining=10))
+    assert RateLimitScheduler.is_rate_limited(
+        httpx.Response(403, text="You have exceeded a secondary rate limit")
+    )
+
+def test_reserve_is_kept_for_in_flight_requests():
+    scheduler = RateLimitScheduler()
+    scheduler.reserve = 5
+    budget = scheduler.budget("a")
+    budget.limit, budget.remaining, budget.reset_at = 5000, 7, time.time() + 60
+    
+    assert scheduler._wait_time(budget) == 0
+    budget.in_flight = 2
+    assert scheduler._wait_time(budget) > 60
+
+def test_pacing_spreads_the_remaining_budget_until_reset():
+    scheduler = RateLimitScheduler()
+    scheduler.rate, scheduler.reserve = 100, 0
+    budget = scheduler.budget("a")
+    now = time.time()
+    budget.limit, budget.remaining, budget.reset_at = 5000, 10, now + 100
+    
+    assert scheduler._refill_rate(budget, now) == pytest.approx(0.1)
+    budget.remaining = 5000
+    assert scheduler._refill_rate(budget, now) == 100
+
+def test_acquire_fails_fast_past_the_maximum_wait():
+    scheduler = RateLimitScheduler()
+    scheduler.max_wait = 1
+    scheduler.budget("a").blocked_until = time.time() + 600
+    
+    with pytest.raises(RateLimitExceeded) as error:
+        asyncio.run(scheduler.acquire("a"))
+    assert 590 < error.value.retry_after <= 600
+    assert scheduler.throttled == 1
+    assert scheduler.queued == 0
+
+def test_acquire_counts_in_flight_until_release():
+    scheduler = RateLimitScheduler()
+    
+    asyncio.run(scheduler.acquire("a"))
+    assert scheduler.budget("a").in_flight == 1
+    scheduler.release("a", github_response(x_ratelimit_remaining=99))
+    assert scheduler.budget("a").in_flight == 0
+    assert scheduler.budget("a").remaining == 99
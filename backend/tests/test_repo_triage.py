@@ -0,0 +1,67 @@
+import asyncio
+import random
+from datetime import datetime, timedelta, timezone
+
+from app.services.repo_triage import RepoTriage
+
+def listing(count, seed=7):
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "name": f"repo-{index}",
+            "stargazers_count": rng.choice([0, 0, 1, 5, 40]),
+            "forks_count": rng.choice([0, 0, 2]),
+            "size": rng.choice([0, 120, 4000]),
+            "description": rng.choice([None, "A project"]),
+            "fork": rng.random() < 0.2,
+            "pushed_at": (now - timedelta(days=index)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        }
+        for index in range(count)
+    ]
+
+async def pages(repositories, page_size, arrived=None):
+    for start in range(0, len(repositories), page_size):
+        if arrived is not None:
+            arrived.append(start)
+        await asyncio.sleep(0)
+        for repo in repositories[start:start + page_size]:
+            yield repo
+
+def test_streaming_selection_matches_select():
+    repositories = listing(250)
+    triage = RepoTriage()
+    
+    streamed = asyncio.run(triage.select_streaming(pages(repositories, 100), 10))
+    assert [repo["name"] for repo in streamed] == [repo["name"] for repo in triage.select(repositories, 10)]
+
+def test_listing_is_scored_as_pages_arrive():
+    scored = []
+    
+    class RecordingTriage(RepoTriage):
+        def score_repository(self, repo_data):
+            scored.append(repo_data["name"])
+            return super().score_repository(repo_data)
+    
+    arrived = []
+    
+    async def recording_pages(repositories):
+        async for repo in pages(repositories, 100, arrived):
+            # Everything before this page was ranked before this page arrived
+            assert len(scored) == int(repo["name"].split("-")[1])
+            yield repo
+    
+    asyncio.run(RecordingTriage().select_streaming(recording_pages(listing(250)), 5))
+    assert arrived == [0, 100, 200]
+
+def test_selection_waits_for_the_last_page():
+    # Deliberate: the top-k is final only once the listing ends, so a standout
+    # repository on the last page still makes the cut
+    repositories = listing(250)
+    repositories[-1].update(stargazers_count=5000, forks_count=500, size=9000, description="Flagship", fork=False)
+    
+    selected = asyncio.run(RepoTriage().select_streaming(pages(repositories, 100), 3))
+    assert selected[0]["name"] == "repo-249"
+
+def test_empty_selection():
+    assert asyncio.run(RepoTriage().select_streaming(pages(listing(5), 100), 0)) == []
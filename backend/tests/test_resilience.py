@@ -0,0 +1,155 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.exceptions import CircuitOpen
+from app.services.resilience import CircuitBreaker, ResiliencePolicy, RetryBudget, endpoint_name
+
+URL = "https://api.github.com/repos/octo/project/languages"
+
+def retrying(budget=None, max_retries=3):
+    """A policy that retries almost immediately"""
+    return ResiliencePolicy(max_retries=max_retries, base_delay=0.001, max_delay=0.001,
+                            budget=budget or RetryBudget(ratio=0.1, reserve=20))
+
+def answers(*statuses):
+    """Answer with each status in turn, repeating the last one"""
+    sent = []
+    def handler(request):
+        sent.append(request)
+        return httpx.Response(statuses[min(len(sent), len(statuses)) - 1], json={})
+    return handler, sent
+
+def test_endpoint_names_ignore_user_and_repository():
+    assert endpoint_name("https://api.github.com/users/octo") == "user"
+    assert endpoint_name("https://api.github.com/users/octo/repos") == "repos"
+    assert endpoint_name(URL) == "languages"
+    assert endpoint_name("https://api.github.com/graphql") == "graphql"
+
+def test_retry_budget_refills_per_request_and_caps_retries():
+    budget = RetryBudget(ratio=0.5, reserve=1)
+    assert budget.withdraw()
+    assert not budget.withdraw()
+    budget.deposit()
+    assert not budget.withdraw()
+    budget.deposit()
+    assert budget.withdraw()
+    assert budget.exhausted == 2
+
+def test_breaker_opens_at_threshold_and_probes_after_timeout(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr("app.services.resilience.time.monotonic", lambda: clock[0])
+    breaker = CircuitBreaker("languages", threshold=2, reset_timeout=30)
+    
+    breaker.record_failure()
+    breaker.check()
+    breaker.record_failure()
+    with pytest.raises(CircuitOpen) as error:
+        breaker.check()
+    assert error.value.retry_after == 30
+    
+    clock[0] += 30
+    breaker.check()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # A failed probe reopens the circuit at once
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    
+    clock[0] += 30
+    breaker.check()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.trips == 2
+
+def test_transient_failures_are_retried(make_service):
+    handler, sent = answers(502, 503, 200)
+    service = make_service(handler, resilience=retrying())
+    
+    response = asyncio.run(service._request("GET", URL))
+    assert response.status_code == 200
+    assert len(sent) == 3
+    assert service.resilience.retries == 2
+
+def test_client_errors_are_not_retried(make_service):
+    handler, sent = answers(404)
+    service = make_service(handler, resilience=retrying())
+    
+    assert asyncio.run(service._request("GET", URL)).status_code == 404
+    assert len(sent) == 1
+
+def test_non_idempotent_requests_are_not_retried(make_service):
+    handler, sent = answers(502, 200)
+    service = make_service(handler, resilience=retrying())
+    
+    assert asyncio.run(service._request("POST", URL)).status_code == 502
+    assert len(sent) == 1
+
+def test_connection_errors_are_retried_then_raised(make_service):
+    attempts = []
+    def handler(request):
+        attempts.append(request)
+        raise httpx.ConnectError("connection refused", request=request)
+    service = make_service(handler, resilience=retrying(max_retries=2))
+    
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(service._request("GET", URL))
+    assert len(attempts) == 3
+
+def test_empty_retry_budget_stops_retries(make_service):
+    handler, sent = answers(503)
+    service = make_service(handler, resilience=retrying(budget=RetryBudget(ratio=0, reserve=1)))
+    
+    assert asyncio.run(service._request("GET", URL)).status_code == 503
+    # One retry from the reserve, then the budget refuses
+    assert len(sent) == 2
+    assert service.resilience.budget.exhausted == 1
+
+def test_open_circuit_fails_fast_without_calling_github(make_service):
+    handler, sent = answers(503)
+    service = make_service(handler)
+    breaker = service.resilience.breaker("languages")
+    breaker.threshold = 2
+    
+    for _ in range(2):
+        assert asyncio.run(service._request("GET", URL)).status_code == 503
+    with pytest.raises(CircuitOpen):
+        asyncio.run(service._request("GET", URL))
+    assert len(sent) == 2
+    # Other endpoints have their own breakers and still reach GitHub
+    asyncio.run(service._request("GET", "https://api.github.com/users/octo"))
+    assert len(sent) == 3
+
+def test_retried_request_counts_as_one_breaker_failure(make_service):
+    handler, sent = answers(503)
+    service = make_service(handler, resilience=retrying(max_retries=3))
+    breaker = service.resilience.breaker("languages")
+    breaker.threshold = 2
+    
+    assert asyncio.run(service._request("GET", URL)).status_code == 503
+    assert len(sent) == 4
+    assert breaker.failures == 1
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_request_recovering_on_retry_leaves_no_failure(make_service):
+    handler, sent = answers(502, 200)
+    service = make_service(handler, resilience=retrying())
+    breaker = service.resilience.breaker("languages")
+    
+    assert asyncio.run(service._request("GET", URL)).status_code == 200
+    assert breaker.failures == 0
+
+def test_half_open_probe_is_not_retried(make_service):
+    handler, sent = answers(503)
+    service = make_service(handler, resilience=retrying())
+    breaker = service.resilience.breaker("languages")
+    breaker.threshold = 1
+    
+    assert asyncio.run(service._request("GET", URL)).status_code == 503
+    assert breaker.state == CircuitBreaker.OPEN
+    # The reset timeout has passed: the next request is the probe
+    breaker.opened_at -= breaker.reset_timeout
+    
+    assert asyncio.run(service._request("GET", URL)).status_code == 503
+    assert len(sent) == 4 + 1
+    assert breaker.state == CircuitBreaker.OPEN
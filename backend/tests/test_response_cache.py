@@ -0,0 +1,80 @@
+import asyncio
+
+import httpx
+
+from app.services.response_cache import ResponseCache
+
+URL = "https://api.github.com/repos/octo/demo/languages"
+
+def revalidating_github(changed_after=None):
+    """Answer with an ETag, then 304 for a matching If-None-Match until `changed_after` calls"""
+    seen = []
+    
+    def handler(request):
+        seen.append(dict(request.headers))
+        etag = '"v2"' if changed_after is not None and len(seen) > changed_after else '"v1"'
+        headers = {"etag": etag, "x-ratelimit-remaining": str(5000 - len(seen))}
+        if request.headers.get("if-none-match") == etag:
+            return httpx.Response(304, headers=headers)
+        return httpx.Response(200, json={"Python": 100 * len(seen)}, headers=headers)
+    return handler, seen
+
+def test_not_modified_replays_the_stored_body(make_service):
+    cache = ResponseCache()
+    handler, seen = revalidating_github()
+    service = make_service(handler, cache=cache)
+    
+    async def main():
+        first = await service.get_languages("octo", "demo")
+        second = await service.get_languages("octo", "demo")
+        return first, second
+    
+    first, second = asyncio.run(main())
+    assert first == second == {"Python": 100}
+    assert "if-none-match" not in seen[0]
+    assert seen[1]["if-none-match"] == '"v1"'
+    assert cache.stats()["not_modified_hits"] == 1
+
+def test_changed_resource_replaces_the_stored_body(make_service):
+    cache = ResponseCache()
+    handler, seen = revalidating_github(changed_after=1)
+    service = make_service(handler, cache=cache)
+    
+    async def main():
+        return [await service.get_languages("octo", "demo") for _ in range(3)]
+    
+    assert asyncio.run(main()) == [{"Python": 100}, {"Python": 200}, {"Python": 200}]
+    assert seen[2]["if-none-match"] == '"v2"'
+    assert cache.stats()["stores"] == 2
+
+def test_replay_keeps_current_rate_limit_headers():
+    cache = ResponseCache()
+    request = httpx.Request("GET", URL)
+    cache.store("key", httpx.Response(
+        200, json={"Go": 1}, headers={"etag": '"v1"', "x-ratelimit-remaining": "4999"}, request=request
+    ))
+    
+    replayed = cache.replay(cache.get("key"), httpx.Response(
+        304, headers={"x-ratelimit-remaining": "4990"}, request=request
+    ))
+    assert replayed.status_code == 200
+    assert replayed.json() == {"Go": 1}
+    assert replayed.headers["etag"] == '"v1"'
+    assert replayed.headers["x-ratelimit-remaining"] == "4990"
+
+def test_responses_without_validators_are_not_stored():
+    cache = ResponseCache()
+    cache.store("key", httpx.Response(200, json={}, request=httpx.Request("GET", URL)))
+    assert cache.get("key") is None
+
+def test_stored_body_is_reused_without_a_request_when_asked(make_service):
+    cache = ResponseCache()
+    handler, seen = revalidating_github()
+    service = make_service(handler, cache=cache)
+    
+    async def main():
+        await service.get_languages("octo", "demo")
+        return await service.get_languages("octo", "demo", revalidate=False)
+    
+    assert asyncio.run(main()) == {"Python": 100}
+    assert len(seen) == 1
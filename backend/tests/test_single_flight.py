@@ -0,0 +1,49 @@
+import asyncio
+import logging
+
+from app.utils.single_flight import SingleFlight
+
+def test_concurrent_calls_share_one_run():
+    flights = SingleFlight()
+    runs = []
+    
+    async def work():
+        runs.append(1)
+        await asyncio.sleep(0.01)
+        return "result"
+    
+    async def main():
+        return await asyncio.gather(*(flights.do("key", work) for _ in range(5)))
+    
+    assert asyncio.run(main()) == ["result"] * 5
+    assert len(runs) == 1
+    assert flights.stats()["coalesced"] == 4
+
+def test_last_waiter_leaving_cancels_the_run():
+    flights = SingleFlight()
+    
+    async def main():
+        waiter = asyncio.ensure_future(flights.do("key", lambda: asyncio.sleep(10)))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+    
+    asyncio.run(main())
+    assert flights.stats()["cancelled"] == 1
+    assert flights.stats()["in_flight"] == 0
+
+def test_background_failure_is_logged_once(caplog):
+    flights = SingleFlight()
+    
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("GitHub is down")
+    
+    async def main():
+        for _ in range(3):
+            flights.start("key", fail)
+        await asyncio.sleep(0.05)
+    
+    with caplog.at_level(logging.WARNING, logger="app.utils.single_flight"):
+        asyncio.run(main())
+    assert [record.getMessage() for record in caplog.records] == ["Background call failed: GitHub is down"]
@@ -0,0 +1,85 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.services.exceptions import GitHubAPIError, RateLimitExceeded
+from app.services.rate_limiter import RateLimitScheduler, token_key
+from app.services.token_pool import TokenPool
+
+URL = "https://api.github.com/users/octo"
+
+def authorized_as(request: httpx.Request) -> str:
+    return request.headers.get("authorization", "").replace("token ", "")
+
+def test_selects_token_with_most_headroom():
+    scheduler = RateLimitScheduler()
+    pool = TokenPool(["a", "b", "c"], scheduler)
+    for token, remaining in (("a", 100), ("b", 4000), ("c", 50)):
+        budget = scheduler.budget(token_key(token))
+        budget.limit, budget.remaining, budget.reset_at = 5000, remaining, time.time() + 600
+    
+    assert pool.select() == "b"
+    scheduler.budget(token_key("b")).in_flight = 3990
+    assert pool.select() == "a"
+
+def test_exhausted_tokens_sort_by_recovery():
+    scheduler = RateLimitScheduler()
+    pool = TokenPool(["a", "b"], scheduler)
+    scheduler.budget(token_key("a")).blocked_until = time.time() + 600
+    scheduler.budget(token_key("b")).blocked_until = time.time() + 60
+    
+    assert pool.select() == "b"
+
+def test_rejected_token_is_skipped(make_service):
+    seen = []
+    def handler(request):
+        seen.append(authorized_as(request))
+        status = 401 if authorized_as(request) == "bad" else 200
+        return httpx.Response(status, json={})
+    service = make_service(handler, tokens=["bad", "good"])
+    
+    for _ in range(3):
+        assert asyncio.run(service._request("GET", URL)).status_code == 200
+    assert seen.count("bad") == 1
+    assert service.token_pool.snapshot()[0]["revoked"]
+
+def test_all_tokens_rejected_is_unauthorized_not_rate_limited(make_service):
+    service = make_service(lambda request: httpx.Response(401, json={"message": "Bad credentials"}),
+                           tokens=["a", "b"])
+    
+    with pytest.raises(GitHubAPIError) as error:
+        asyncio.run(service._request("GET", URL))
+    assert error.value.status_code == 401
+    assert not isinstance(error.value, RateLimitExceeded)
+
+def test_rejection_after_rate_limit_retries_is_unauthorized(make_service):
+    answers = iter([
+        httpx.Response(429, headers={"retry-after": "0"}),
+        httpx.Response(429, headers={"retry-after": "0"}),
+        httpx.Response(401, json={"message": "Bad credentials"}),
+    ])
+    service = make_service(lambda request: next(answers), tokens=["a"])
+    
+    with pytest.raises(GitHubAPIError) as error:
+        asyncio.run(service._request("GET", URL))
+    assert error.value.status_code == 401
+    assert not isinstance(error.value, RateLimitExceeded)
+
+def test_revoked_token_is_probed_again_after_interval(monkeypatch):
+    scheduler = RateLimitScheduler()
+    pool = TokenPool(["a"], scheduler)
+    pool.revoke("a")
+    with pytest.raises(GitHubAPIError):
+        pool.select()
+    
+    pool._revoked[token_key("a")] -= pool.reprobe_interval
+    assert pool.select() == "a"
+    # Only one probe per interval
+    with pytest.raises(GitHubAPIError):
+        pool.select()
+    
+    pool.restore("a")
+    assert pool.select() == "a"
+    assert not pool.snapshot()[0]["revoked"]
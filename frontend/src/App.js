@@ -11,6 +11,7 @@ function App() {
   const [profileData, setProfileData] = useState(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
+  const [progress, setProgress] = useState(null);
 
   const handleAnalyze = async (e) => {
     e.preventDefault();
@@ -18,9 +19,10 @@ function App() {
 
     setLoading(true);
     setError(null);
+    setProgress(null);
 
     try {
-      const data = await analyzeProfile(username);
+      const data = await analyzeProfile(username, setProgress);
       setProfileData(data);
     } catch (err) {
       console.error('Analysis error:', err);
@@ -82,7 +84,7 @@ function App() {
           </div>
         </section>
 
-        {loading && <Loader />}
+        {loading && <Loader progress={progress} />}
 
         {profileData && !loading && (
           <section className="results-section">
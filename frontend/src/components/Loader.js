@@ -1,7 +1,7 @@
 import React from 'react';
 import { ThreeDots } from 'react-loader-spinner';
 
-const Loader = () => {
+const Loader = ({ progress }) => {
   return (
     <div className="loader-container">
       <ThreeDots
@@ -13,7 +13,13 @@ const Loader = () => {
         visible={true}
       />
       <p>Analyzing GitHub profile...</p>
-      <p className="loader-sub">This may take up to 2 minutes</p>
+      {progress && progress.repos_total > 0 ? (
+        <p className="loader-sub">
+          Analyzed {progress.repos_done} of {progress.repos_total} repositories
+        </p>
+      ) : (
+        <p className="loader-sub">This may take up to 2 minutes</p>
+      )}
     </div>
   );
 };
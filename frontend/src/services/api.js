@@ -4,13 +4,37 @@ const API_BASE_URL = 'http://localhost:8000/api/v1';
 
 const api = axios.create({
   baseURL: API_BASE_URL,
-  timeout: 120000, // 2 minutes timeout for analysis
+  timeout: 30000, // analyses run as jobs, so no single request waits on one
 });
 
-export const analyzeProfile = async (username) => {
+const JOB_POLL_INTERVAL = 1000;
+const JOB_MAX_WAIT = 5 * 60 * 1000;
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+// Queue an analysis job and poll it until the UserProfile is ready
+export const analyzeProfile = async (username, onProgress) => {
   try {
-    const response = await api.get(`/analyze/${username}`);
-    return response.data;
+    const submitted = await api.post('/jobs/analyze', { username });
+    let job = submitted.data;
+    const deadline = Date.now() + JOB_MAX_WAIT;
+
+    while (job.status === 'queued' || job.status === 'running') {
+      if (Date.now() > deadline) {
+        throw new Error('Analysis is taking too long, please try again later');
+      }
+      await sleep(JOB_POLL_INTERVAL);
+      const response = await api.get(`/jobs/${job.job_id}`);
+      job = response.data;
+      if (onProgress) {
+        onProgress(job.progress);
+      }
+    }
+
+    if (job.status === 'failed') {
+      throw new Error(job.error || 'Analysis failed');
+    }
+    return job.result;
   } catch (error) {
     if (error.response) {
       // Server responded with error status
@@ -20,6 +44,9 @@ export const analyzeProfile = async (username) => {
       // Request was made but no response received
       console.error('Network Error:', error.request);
       throw new Error('Network error: Could not reach the server');
+    } else if (!error.isAxiosError) {
+      // The job itself failed or timed out
+      throw error;
     } else {
       // Something else happened
       console.error('Request Error:', error.message);